@@ -48,13 +48,8 @@ def refresh_artist_data(artist_id: str, force: bool = False) -> None:
     if not force and not data_cache.needs_refresh(artist_id):
         return
     try:
-        streaming = snowflake_client.get_streaming_time_series([artist_id], lookback_months=24)
-        data_cache.set_streaming_data(
-            artist_id,
-            streaming.get("us_streams", []),
-            streaming.get("global_streams", []),
-            streaming.get("us_video_streams", [])
-        )
+        streaming = snowflake_client.get_streaming_time_series_arrays([artist_id], lookback_months=24)
+        data_cache.set_streaming_arrays(artist_id, streaming)
     except:
         pass
     try:
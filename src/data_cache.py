@@ -1,12 +1,33 @@
-"""Local data cache for artist metrics - stores historical data to avoid repeated API calls."""
+"""Local data cache for artist metrics - stores historical data to avoid repeated API calls.
+
+The cache file is append-only JSON Lines: each update appends one record
+holding a single artist's streaming or social series, and clearing an artist
+appends a tombstone. Loading replays the records in order. Once superseded
+records outnumber live ones the file is compacted (rewritten with one record
+per live series), so a refresh costs one small append instead of rewriting
+every artist's history.
+"""
 
 from __future__ import annotations
 
 import json
 import logging
+import os
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows - appends go unlocked there
+    fcntl = None
 
 from .models import TimeSeriesPoint
 
@@ -14,7 +35,13 @@ logger = logging.getLogger(__name__)
 
 # Cache file path
 DATA_DIR = Path(__file__).parent.parent / "data"
-CACHE_FILE = DATA_DIR / "metrics_cache.json"
+CACHE_FILE = DATA_DIR / "metrics_cache.jsonl"
+# Pre-JSONL cache (one JSON document), migrated on first load
+LEGACY_CACHE_FILE = DATA_DIR / "metrics_cache.json"
+# Don't bother compacting files with fewer records than this
+_COMPACT_MIN_RECORDS = 64
+# Cached series per artist, each stored as its own record
+_SERIES_FIELDS = ("streaming", "social")
 
 
 def _ensure_data_dir() -> None:
@@ -29,6 +56,20 @@ def _serialize_date(d: date) -> str:
     return d.isoformat()
 
 
+def _dumps_line(record: Dict[str, Any]) -> bytes:
+    """Encode one cache record as a JSON line (orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(record, default=str) + b"\n"
+    return (json.dumps(record, default=str) + "\n").encode()
+
+
+def _loads(data: bytes) -> Any:
+    """Decode JSON (orjson when installed)."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def _deserialize_date(s: str) -> date:
     """Convert ISO string to date."""
     return datetime.strptime(s, "%Y-%m-%d").date()
@@ -39,29 +80,118 @@ class DataCache:
 
     def __init__(self):
         self._cache: Dict[str, Any] = {}
+        # Records in the cache file, live or superseded
+        self._record_count = 0
         self._load()
 
     def _load(self) -> None:
-        """Load cache from disk."""
+        """Load cache from disk by replaying its records."""
         _ensure_data_dir()
-        if CACHE_FILE.exists():
-            try:
-                with CACHE_FILE.open("r") as f:
-                    self._cache = json.load(f)
-            except Exception as e:
-                logger.error("Failed to load cache: %s", e)
-                self._cache = {}
-        else:
+        self._cache = {}
+        self._record_count = 0
+
+        if not CACHE_FILE.exists():
+            if LEGACY_CACHE_FILE.exists():
+                self._load_legacy()
+            return
+
+        torn = False
+        try:
+            with CACHE_FILE.open("rb") as f:
+                for line in f:
+                    try:
+                        record = _loads(line)
+                    except ValueError:
+                        # Torn final line from an interrupted append
+                        logger.warning("Skipping unreadable cache record")
+                        torn = True
+                        continue
+                    self._apply(record)
+                    self._record_count += 1
+        except Exception as e:
+            logger.error("Failed to load cache: %s", e)
+            self._cache = {}
+            return
+
+        if torn:
+            # Rewrite cleanly so the next append doesn't land on the torn line
+            self._save()
+
+    def _load_legacy(self) -> None:
+        """Import the old single-document cache and rewrite it as records."""
+        try:
+            with LEGACY_CACHE_FILE.open("rb") as f:
+                self._cache = _loads(f.read())
+        except Exception as e:
+            logger.error("Failed to load cache: %s", e)
             self._cache = {}
+            return
+        self._save()
+
+    def _apply(self, record: Dict[str, Any]) -> None:
+        """Apply one cache record (series update or tombstone) to the in-memory cache."""
+        artist_id = record["artist_id"]
+        if record.get("deleted"):
+            self._cache.pop(artist_id, None)
+            return
+        artist_data = self._cache.setdefault(artist_id, {})
+        artist_data[record["field"]] = record["value"]
+        artist_data["last_refresh"] = record["last_refresh"]
+
+    def _live_records(self) -> List[Dict[str, Any]]:
+        """One record per cached series - the compacted form of the cache file."""
+        records = []
+        for artist_id, artist_data in self._cache.items():
+            for field in _SERIES_FIELDS:
+                if field in artist_data:
+                    records.append({
+                        "artist_id": artist_id,
+                        "field": field,
+                        "value": artist_data[field],
+                        "last_refresh": artist_data.get("last_refresh"),
+                    })
+        return records
 
     def _save(self) -> None:
-        """Save cache to disk."""
+        """Rewrite the cache file compacted (atomically, via a temp file)."""
+        _ensure_data_dir()
+        records = self._live_records()
+        tmp_file = CACHE_FILE.with_suffix(".tmp")
+        try:
+            with tmp_file.open("wb") as f:
+                f.writelines(_dumps_line(record) for record in records)
+            os.replace(tmp_file, CACHE_FILE)
+            self._record_count = len(records)
+        except Exception as e:
+            logger.error("Failed to save cache: %s", e)
+
+    def _append(self, record: Dict[str, Any]) -> None:
+        """Append one record to the cache file, compacting when it is mostly stale."""
         _ensure_data_dir()
         try:
-            with CACHE_FILE.open("w") as f:
-                json.dump(self._cache, f, indent=2, default=str)
+            with CACHE_FILE.open("ab") as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                f.write(_dumps_line(record))
+            self._record_count += 1
         except Exception as e:
             logger.error("Failed to save cache: %s", e)
+            return
+
+        live = sum(1 for data in self._cache.values() for field in _SERIES_FIELDS if field in data)
+        if self._record_count > max(_COMPACT_MIN_RECORDS, 2 * live):
+            self._save()
+
+    def _set_series(self, artist_id: str, field: str, value: Dict[str, Any]) -> None:
+        """Store one artist's streaming or social series and persist it as a record."""
+        record = {
+            "artist_id": artist_id,
+            "field": field,
+            "value": value,
+            "last_refresh": datetime.now().isoformat(),
+        }
+        self._apply(record)
+        self._append(record)
 
     def get_last_refresh(self, artist_id: str) -> Optional[datetime]:
         """Get the last refresh time for an artist."""
@@ -83,16 +213,21 @@ class DataCache:
                            global_streams: List[TimeSeriesPoint],
                            us_video_streams: Optional[List[TimeSeriesPoint]] = None) -> None:
         """Store streaming time series data."""
-        if artist_id not in self._cache:
-            self._cache[artist_id] = {}
-
-        self._cache[artist_id]["streaming"] = {
+        self._set_series(artist_id, "streaming", {
             "us_streams": [{"date": _serialize_date(p.date), "value": p.value} for p in us_streams],
             "global_streams": [{"date": _serialize_date(p.date), "value": p.value} for p in global_streams],
             "us_video_streams": [{"date": _serialize_date(p.date), "value": p.value} for p in (us_video_streams or [])],
-        }
-        self._cache[artist_id]["last_refresh"] = datetime.now().isoformat()
-        self._save()
+        })
+
+    def set_streaming_arrays(self, artist_id: str, streams: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> None:
+        """Store streaming time series given as (datetime64[D] dates, values) arrays per series."""
+        streaming = {}
+        for name in ("us_streams", "global_streams", "us_video_streams"):
+            dates, values = streams.get(name, (np.array([], dtype="datetime64[D]"), np.array([])))
+            iso_dates = np.datetime_as_string(dates, unit="D").tolist()
+            streaming[name] = [{"date": d, "value": v} for d, v in zip(iso_dates, values.tolist())]
+
+        self._set_series(artist_id, "streaming", streaming)
 
     def get_streaming_data(self, artist_id: str, period: str = "1Y") -> Dict[str, List[TimeSeriesPoint]]:
         """Get streaming time series data, filtered by period."""
@@ -129,16 +264,11 @@ class DataCache:
     def set_social_data(self, artist_id: str, spotify: List[TimeSeriesPoint],
                         instagram: List[TimeSeriesPoint], tiktok: List[TimeSeriesPoint]) -> None:
         """Store social time series data."""
-        if artist_id not in self._cache:
-            self._cache[artist_id] = {}
-
-        self._cache[artist_id]["social"] = {
+        self._set_series(artist_id, "social", {
             "spotify": [{"date": _serialize_date(p.date), "value": p.value} for p in spotify],
             "instagram": [{"date": _serialize_date(p.date), "value": p.value} for p in instagram],
             "tiktok": [{"date": _serialize_date(p.date), "value": p.value} for p in tiktok],
-        }
-        self._cache[artist_id]["last_refresh"] = datetime.now().isoformat()
-        self._save()
+        })
 
     def get_social_data(self, artist_id: str, period: str = "1Y") -> Dict[str, List[TimeSeriesPoint]]:
         """Get social time series data, filtered by period."""
@@ -192,8 +322,9 @@ class DataCache:
     def clear_artist(self, artist_id: str) -> None:
         """Clear cached data for an artist."""
         if artist_id in self._cache:
-            del self._cache[artist_id]
-            self._save()
+            record = {"artist_id": artist_id, "deleted": True}
+            self._apply(record)
+            self._append(record)
 
     def clear_all(self) -> None:
         """Clear all cached data."""
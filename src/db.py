@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 import os
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from .models import TrackedArtist, TrackedSound
 
@@ -15,6 +15,11 @@ logger = logging.getLogger(__name__)
 DATABASE_URL = os.environ.get("DATABASE_URL", "")
 
 
+def is_configured() -> bool:
+    """Whether a database is configured (DATABASE_URL is set)."""
+    return bool(DATABASE_URL)
+
+
 def get_connection():
     """Get a database connection."""
     if not DATABASE_URL:
@@ -217,6 +222,42 @@ def add_tracked_sound_db(
         return False
 
 
+def add_tracked_sounds_db(
+    sounds: List[Tuple[str, str, Optional[str], Optional[str]]],
+) -> bool:
+    """Add several tracked sounds to database in one statement and transaction.
+
+    Args:
+        sounds: (sound_id, name, artist_name, tiktok_url) rows with distinct sound_ids
+    """
+    if not DATABASE_URL:
+        return False
+    if not sounds:
+        return True
+
+    try:
+        from psycopg2.extras import execute_values
+
+        added_at = datetime.now()
+        conn = get_connection()
+        cur = conn.cursor()
+        execute_values(cur, """
+            INSERT INTO tracked_sounds (sound_id, name, artist_name, tiktok_url, added_at)
+            VALUES %s
+            ON CONFLICT (sound_id) DO UPDATE SET
+                name = EXCLUDED.name,
+                artist_name = EXCLUDED.artist_name,
+                tiktok_url = EXCLUDED.tiktok_url
+        """, [(*sound, added_at) for sound in sounds])
+        conn.commit()
+        cur.close()
+        conn.close()
+        return True
+    except Exception as e:
+        logger.error("Failed to add tracked sounds: %s", e)
+        return False
+
+
 def remove_tracked_sound_db(sound_id: str) -> bool:
     """Remove a tracked sound from database."""
     if not DATABASE_URL:
@@ -14,6 +14,15 @@ class TimeSeriesPoint:
     value: float
 
 
+def as_points(dates, values) -> List[TimeSeriesPoint]:
+    """Build TimeSeriesPoints from a datetime64[D] date array and a value array.
+
+    For code paths that still want point lists from the array-based
+    time series (see SnowflakeClient.get_streaming_time_series_arrays).
+    """
+    return [TimeSeriesPoint(date=d, value=v) for d, v in zip(dates.tolist(), values.tolist())]
+
+
 @dataclass
 class ArtistSummary:
     """Basic artist information from Spotify."""
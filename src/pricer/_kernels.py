@@ -0,0 +1,191 @@
+"""
+Recoupment waterfall kernels for CashFlowEngine and the weekly payback model.
+
+Each annual kernel takes the 10-year gross revenue array and returns two
+rows, [label_cash_in, artist_pay] (a (2, N) array when compiled, nested lists
+otherwise). recoup_waterfall walks a weekly recoup stream. The loops mirror
+the mechanics documented on CashFlowEngine exactly, so results are identical
+with or without Numba.
+
+When Numba is installed the kernels are compiled eagerly against fixed
+signatures with cache=True: the machine code is written next to the module's
+bytecode on first import, so later processes (CLI runs, scenario scripts)
+load it instead of paying JIT warmup on their first analyze_deal call. The
+signatures take C-contiguous float64 arrays (every caller passes freshly
+computed arrays) and bounds checking is pinned off, so the loops compile to
+unit-stride code. fastmath is deliberately not used: reassociating the
+running totals would move recoup weeks at exact ties.
+
+Without Numba (including under PyPy, which Numba does not support) they run
+as plain Python over lists of floats rather than NumPy arrays. Arithmetic on
+Python floats is several times cheaper than on NumPy scalars under CPython,
+and PyPy's JIT can trace list loops but not element access on NumPy arrays.
+"""
+
+from functools import wraps
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+_WATERFALL_SIGNATURE = "f8[:, ::1](f8[::1], f8, f8)"
+
+
+def _compiled(signature: str):
+    """Compile eagerly with Numba when available, otherwise run over Python floats."""
+
+    def decorate(func):
+        if njit is not None:
+            return njit(signature, cache=True, nogil=True, boundscheck=False)(func)
+
+        @wraps(func)
+        def run_python(values, *args):
+            return func(np.asarray(values, dtype=float).tolist(), *args)
+
+        return run_python
+
+    return decorate
+
+
+HAS_NUMBA = njit is not None
+
+if HAS_NUMBA:
+
+    @njit("f8[:, ::1](i8)", cache=True)
+    def _empty_rows(n):
+        return np.empty((2, n))
+
+    @njit("f8[::1](i8)", cache=True)
+    def _zeros(n):
+        return np.zeros(n)
+
+else:
+
+    def _empty_rows(n):
+        return [[0.0] * n, [0.0] * n]
+
+    def _zeros(n):
+        return [0.0] * n
+
+
+@_compiled(_WATERFALL_SIGNATURE)
+def royalty_waterfall(gross, label_share, total_cost):
+    """Funded royalty: artist's royalty is withheld until total_cost is recouped."""
+    n = len(gross)
+    out = _empty_rows(n)
+    artist_share = 1.0 - label_share
+    unrecouped = total_cost
+
+    for i in range(n):
+        label_base = gross[i] * label_share
+        artist_royalty = gross[i] * artist_share
+
+        if unrecouped <= 0:
+            out[0][i] = label_base
+            out[1][i] = artist_royalty
+        elif artist_royalty <= unrecouped:
+            unrecouped -= artist_royalty
+            out[0][i] = label_base + artist_royalty
+            out[1][i] = 0.0
+        else:
+            out[0][i] = label_base + unrecouped
+            out[1][i] = artist_royalty - unrecouped
+            unrecouped = 0.0
+
+    return out
+
+
+@_compiled(_WATERFALL_SIGNATURE)
+def funded_distribution_waterfall(gross, label_share, total_cost):
+    """Funded distribution: label takes 100% of gross until recouped, then splits."""
+    n = len(gross)
+    out = _empty_rows(n)
+    artist_share = 1.0 - label_share
+    unrecouped = total_cost
+
+    for i in range(n):
+        gross_rev = gross[i]
+
+        if unrecouped <= 0:
+            out[0][i] = gross_rev * label_share
+            out[1][i] = gross_rev * artist_share
+        elif gross_rev <= unrecouped:
+            unrecouped -= gross_rev
+            out[0][i] = gross_rev
+            out[1][i] = 0.0
+        else:
+            remainder = gross_rev - unrecouped
+            out[0][i] = unrecouped + (remainder * label_share)
+            out[1][i] = remainder * artist_share
+            unrecouped = 0.0
+
+    return out
+
+
+@_compiled(_WATERFALL_SIGNATURE)
+def profit_split_waterfall(gross, label_share, total_cost):
+    """Profit split: expenses come off gross pro rata, label recoups from net, then splits."""
+    n = len(gross)
+    out = _empty_rows(n)
+    artist_share = 1.0 - label_share
+    unrecouped = total_cost
+
+    total_revenue = 0.0
+    for i in range(n):
+        total_revenue += gross[i]
+
+    for i in range(n):
+        if total_revenue > 0:
+            year_expense = (gross[i] / total_revenue) * total_cost
+        else:
+            year_expense = total_cost / 10.0
+
+        net_revenue = gross[i] - year_expense
+        if net_revenue < 0:
+            net_revenue = 0.0
+
+        if unrecouped <= 0:
+            out[0][i] = net_revenue * label_share
+            out[1][i] = net_revenue * artist_share
+        elif net_revenue <= unrecouped:
+            unrecouped -= net_revenue
+            out[0][i] = net_revenue
+            out[1][i] = 0.0
+        else:
+            remainder = net_revenue - unrecouped
+            out[0][i] = unrecouped + (remainder * label_share)
+            out[1][i] = remainder * artist_share
+            unrecouped = 0.0
+
+    return out
+
+
+@_compiled("Tuple((f8[::1], i8))(f8[::1], f8)")
+def recoup_waterfall(recoup_base, recoupable_amount):
+    """
+    Withhold from a weekly stream until recoupable_amount is paid off.
+
+    Returns (weekly amounts withheld, 1-indexed recoup week or 0 if never).
+    """
+    n = len(recoup_base)
+    withheld = _zeros(n)
+    recoup_week = 0
+
+    if recoupable_amount <= 0:
+        return withheld, recoup_week
+
+    # Compare running totals (not a decremented balance) so the recoup week
+    # matches a cumsum/searchsorted on the same stream
+    cum_base = 0.0
+    for i in range(n):
+        outstanding = recoupable_amount - cum_base
+        cum_base += recoup_base[i]
+        withheld[i] = min(recoup_base[i], outstanding)
+        if cum_base >= recoupable_amount:
+            recoup_week = i + 1
+            break
+
+    return withheld, recoup_week
@@ -4,9 +4,34 @@ Financial model for music catalog deal pricing.
 Implements cash flow projections, recoupment waterfall, and IRR/NPV calculations.
 """
 
+import math
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache, partial
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from ._kernels import (
+    funded_distribution_waterfall,
+    profit_split_waterfall,
+    royalty_waterfall,
+)
+from .decay_curve import build_shifted_curve
+from .decay_weekly import build_weekly_curve, build_weekly_curve_with_rates
+from .payback import (
+    PaybackRecommendation,
+    IRRRecommendation,
+    generate_weekly_gross_series,
+    compute_payback_recommendation,
+    compute_irr_recommendation,
+    DealType as PaybackDealType,
+)
+
+
+# Cumulative decay multipliers for years 1..10: either {year: multiplier}
+# (as loaded from Excel) or a dense array where index 0 is Year 1
+DecayMultipliers = Union[Dict[int, float], np.ndarray]
 
 
 class DealType(Enum):
@@ -17,7 +42,7 @@ class DealType(Enum):
     ROYALTY = "royalty"
 
 
-@dataclass
+@dataclass(slots=True)
 class DealInputs:
     """User inputs for deal analysis."""
 
@@ -54,17 +79,17 @@ class DealInputs:
     year1_revenue_override: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class RateInputs:
     """Calculated rate inputs."""
 
     blended_audio_rate: float
     video_rate: float
-    decay_multipliers: Dict[int, float]
+    decay_multipliers: DecayMultipliers
     weekly_rates: Optional[List[float]] = None  # 52 week-over-week rates for Year 1
 
 
-@dataclass
+@dataclass(slots=True)
 class YearlyProjection:
     """Projection data for a single year."""
 
@@ -76,31 +101,7 @@ class YearlyProjection:
     discounted_cash_in_7_5: float  # Discounted at 7.5%
 
 
-@dataclass
-class PaybackRecommendation:
-    """Payback-based (18-month) recommendation."""
-
-    payback_horizon_weeks: int
-    max_total_cost: float
-    suggested_advance: float
-    suggested_marketing: float
-    implied_irr: Optional[float]  # Annual IRR at this cost
-    recoup_week: Optional[int]  # Should be <= horizon if achievable
-
-
-@dataclass
-class IRRRecommendation:
-    """IRR-based recommendation (no payback constraint)."""
-
-    target_irr: float
-    max_total_cost: float
-    suggested_advance: float
-    suggested_marketing: float
-    recoup_week: Optional[int]  # Informational - when payback occurs
-    npv_at_10_percent: float
-
-
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Complete analysis result."""
 
@@ -129,6 +130,26 @@ class AnalysisResult:
     irr_recommendations: List[IRRRecommendation]  # 10% and 15% IRR based
 
 
+def _coerce_multipliers(decay_multipliers: DecayMultipliers, num_years: int = 10) -> np.ndarray:
+    """
+    Convert decay multipliers to a dense float array for years 1..num_years.
+
+    Dicts are looked up once (missing years are 0.0); arrays pass through.
+    """
+    if isinstance(decay_multipliers, np.ndarray):
+        return np.asarray(decay_multipliers, dtype=float)
+    return np.array(
+        [decay_multipliers.get(year, 0.0) for year in range(1, num_years + 1)], dtype=float
+    )
+
+
+def _multipliers_as_dict(decay_multipliers: DecayMultipliers) -> Dict[int, float]:
+    """{year: multiplier} view of decay multipliers for the curve builders."""
+    if isinstance(decay_multipliers, np.ndarray):
+        return {year: float(m) for year, m in enumerate(decay_multipliers, start=1)}
+    return decay_multipliers
+
+
 def compute_label_share(deal_type: DealType, deal_percent: float) -> float:
     """
     Compute the label's base share of gross revenue.
@@ -153,6 +174,19 @@ def compute_label_share(deal_type: DealType, deal_percent: float) -> float:
         raise ValueError(f"Unknown deal type: {deal_type}")
 
 
+@lru_cache(maxsize=64)
+def _discount_factors(discount_rate: float, num_years: int = 10) -> np.ndarray:
+    """
+    Discount factors 1 / (1 + r)^year for years 1..num_years.
+
+    Cached per (rate, length); the returned array is read-only.
+    """
+    years = np.arange(1, num_years + 1, dtype=float)
+    factors = np.exp(-years * math.log1p(discount_rate))
+    factors.flags.writeable = False
+    return factors
+
+
 def compute_pv(cash_flows: List[float], discount_rate: float) -> float:
     """
     Compute present value of cash flows.
@@ -164,10 +198,8 @@ def compute_pv(cash_flows: List[float], discount_rate: float) -> float:
     Returns:
         Present value
     """
-    pv = 0.0
-    for year, cf in enumerate(cash_flows, start=1):
-        pv += cf / ((1 + discount_rate) ** year)
-    return pv
+    cfs = np.asarray(cash_flows, dtype=float)
+    return float(np.dot(cfs, _discount_factors(discount_rate, len(cfs))))
 
 
 def compute_npv(
@@ -235,7 +267,7 @@ class CashFlowEngine:
     def __init__(
         self,
         year1_total_rev: float,
-        decay_multipliers: Dict[int, float],
+        decay_multipliers: DecayMultipliers,
         label_share: float,
         marketing_recoupable: bool = False,
         total_deal_cost: Optional[float] = None,
@@ -246,7 +278,7 @@ class CashFlowEngine:
 
         Args:
             year1_total_rev: Year 1 gross revenue
-            decay_multipliers: {year: multiplier} for years 1-10
+            decay_multipliers: {year: multiplier} or array for years 1-10
             label_share: Meaning depends on deal type:
                 - ROYALTY: Label's royalty rate (e.g., 0.20 for 20%)
                 - DISTRIBUTION: Label's POST-RECOUP share (e.g., 0.30 for 30%)
@@ -262,6 +294,7 @@ class CashFlowEngine:
         self.marketing_recoupable = marketing_recoupable
         self.total_deal_cost = total_deal_cost or 0.0
         self.deal_type = deal_type or DealType.DISTRIBUTION
+        self._mult_arr = _coerce_multipliers(decay_multipliers)
 
     def compute_yearly_revenues(self) -> List[Tuple[int, float, float]]:
         """
@@ -270,12 +303,24 @@ class CashFlowEngine:
         Returns:
             List of (year, multiplier, gross_revenue) tuples
         """
-        results = []
-        for year in range(1, 11):
-            multiplier = self.decay_multipliers.get(year, 0.0)
-            gross_rev = self.year1_total_rev * multiplier
-            results.append((year, multiplier, gross_rev))
-        return results
+        gross = self.year1_total_rev * self._mult_arr
+        return [
+            (year, float(multiplier), float(gross_rev))
+            for year, multiplier, gross_rev in zip(range(1, 11), self._mult_arr, gross)
+        ]
+
+    def compute_base_arrays(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute annual gross and base label inflows (no recoupment) as arrays.
+
+        Same values as the gross_rev and label_cash_in columns of
+        compute_cash_flows_no_recoup(), without building the tuples.
+
+        Returns:
+            (annual_gross, label_inflows_base) arrays for years 1-10
+        """
+        annual_gross = self.year1_total_rev * self._mult_arr
+        return annual_gross, annual_gross * self.label_share
 
     def compute_cash_flows_no_recoup(
         self,
@@ -334,35 +379,7 @@ class CashFlowEngine:
         Key insight: Recoupment happens at the ARTIST'S royalty rate, not 100%.
         The advance is paid down by the artist's share only.
         """
-        results = []
-        unrecouped = self.total_deal_cost  # Advance to recoup
-
-        for year, multiplier, gross_rev in self.compute_yearly_revenues():
-            # Label always keeps their share
-            label_base = gross_rev * self.label_share  # 80%
-            artist_royalty = gross_rev * self.artist_share  # 20%
-
-            if unrecouped <= 0:
-                # Fully recouped: Normal split
-                label_cash_in = label_base
-                artist_pay = artist_royalty
-            elif artist_royalty <= unrecouped:
-                # Full year's artist royalty goes to recoup
-                unrecouped -= artist_royalty
-                label_cash_in = label_base + artist_royalty  # Label gets 100%
-                artist_pay = 0.0
-            else:
-                # Mid-year recoup: Label takes what's needed, artist gets remainder
-                recoup_portion = unrecouped
-                artist_remainder = artist_royalty - unrecouped
-                unrecouped = 0.0
-
-                label_cash_in = label_base + recoup_portion
-                artist_pay = artist_remainder
-
-            results.append((year, multiplier, gross_rev, label_cash_in, artist_pay))
-
-        return results
+        return self._waterfall_rows(royalty_waterfall, self.total_deal_cost)
 
     def _compute_funded_distribution_cash_flows(
         self, total_cost: float
@@ -380,32 +397,7 @@ class CashFlowEngine:
         This is NOT a profit split! The label gets 100% during recoup,
         not "their share + withheld".
         """
-        results = []
-        unrecouped = total_cost
-
-        for year, multiplier, gross_rev in self.compute_yearly_revenues():
-            if unrecouped <= 0:
-                # Already fully recouped: Normal split applies
-                label_cash_in = gross_rev * self.label_share
-                artist_pay = gross_rev * self.artist_share
-            elif gross_rev <= unrecouped:
-                # Full year goes to recoupment
-                unrecouped -= gross_rev
-                label_cash_in = gross_rev
-                artist_pay = 0.0
-            else:
-                # MID-YEAR recoupment: Label takes what's needed, then splits remainder
-                recoup_portion = unrecouped
-                remainder = gross_rev - unrecouped
-                unrecouped = 0.0
-
-                # Label gets: recoup amount + their share of remainder
-                label_cash_in = recoup_portion + (remainder * self.label_share)
-                artist_pay = remainder * self.artist_share
-
-            results.append((year, multiplier, gross_rev, label_cash_in, artist_pay))
-
-        return results
+        return self._waterfall_rows(funded_distribution_waterfall, total_cost)
 
     def _compute_profit_split_cash_flows(
         self, total_cost: float
@@ -425,44 +417,22 @@ class CashFlowEngine:
 
         Expenses are allocated proportionally across years based on revenue share.
         """
-        results = []
-        yearly_revenues = self.compute_yearly_revenues()
-        total_revenue = sum(gross for _, _, gross in yearly_revenues)
-
-        unrecouped = total_cost
-
-        for year, multiplier, gross_rev in yearly_revenues:
-            # Step 1: Allocate expenses proportionally to this year's revenue
-            if total_revenue > 0:
-                year_expense = (gross_rev / total_revenue) * total_cost
-            else:
-                year_expense = total_cost / 10.0
-
-            # Step 2: Net revenue after expense deduction
-            net_revenue = max(0, gross_rev - year_expense)
-
-            # Step 3: Recoupment from net revenue
-            if unrecouped <= 0:
-                # Already recouped: Split net revenue
-                label_cash_in = net_revenue * self.label_share
-                artist_pay = net_revenue * self.artist_share
-            elif net_revenue <= unrecouped:
-                # Full year's net goes to recoupment
-                unrecouped -= net_revenue
-                label_cash_in = net_revenue
-                artist_pay = 0.0
-            else:
-                # MID-YEAR recoupment: Label takes what's needed, then splits remainder
-                recoup_portion = unrecouped
-                remainder = net_revenue - unrecouped
-                unrecouped = 0.0
-
-                label_cash_in = recoup_portion + (remainder * self.label_share)
-                artist_pay = remainder * self.artist_share
-
-            results.append((year, multiplier, gross_rev, label_cash_in, artist_pay))
+        return self._waterfall_rows(profit_split_waterfall, total_cost)
 
-        return results
+    def _waterfall_rows(
+        self, waterfall, total_cost: float
+    ) -> List[Tuple[int, float, float, float, float]]:
+        """Run a waterfall kernel and shape its output as yearly cash flow tuples."""
+        gross = self.year1_total_rev * self._mult_arr
+        label_cash_in, artist_pay = waterfall(
+            gross, float(self.label_share), float(total_cost)
+        )
+        return [
+            (year, float(multiplier), float(gross_rev), float(label), float(artist))
+            for year, multiplier, gross_rev, label, artist in zip(
+                range(1, 11), self._mult_arr, gross, label_cash_in, artist_pay
+            )
+        ]
 
     def get_label_cash_flows(
         self, total_cost: Optional[float] = None, advance_amount: Optional[float] = None
@@ -481,6 +451,12 @@ class CashFlowEngine:
         Returns:
             List of label cash inflows for years 1-10
         """
+        if self.deal_type == DealType.ROYALTY and self.total_deal_cost <= 0:
+            # Royalty withholding only recoups total_deal_cost, so with nothing
+            # to recoup both paths reduce to the base split
+            _, label_inflows = self.compute_base_arrays()
+            return label_inflows.tolist()
+
         cost = total_cost if total_cost is not None else self.total_deal_cost
         advance = advance_amount if advance_amount is not None else cost  # Default: all is advance
 
@@ -549,11 +525,9 @@ def analyze_deal(
         # Use the new shifted curve engine to prevent double-decay.
         # This anchors at week (1 + k) where k = weeks_post_peak.
         # Year 1..10 are the NEXT 10 years from today (shifted windows).
-        from .decay_curve import build_shifted_curve
-
         shifted_result = build_shifted_curve(
             wow_rates=rate_inputs.weekly_rates,
-            excel_multipliers=rate_inputs.decay_multipliers,
+            excel_multipliers=_multipliers_as_dict(rate_inputs.decay_multipliers),
             weeks_post_peak=inputs.weeks_post_peak,
             current_weekly_audio_streams=eff_weekly_audio,
             current_weekly_video_streams=eff_weekly_video,
@@ -583,7 +557,6 @@ def analyze_deal(
         # =====================================================================
         # Weekly decay: Build a weekly curve that matches the Excel annual multipliers
         # This provides more accurate intra-year cash flow timing
-        from .decay_weekly import build_weekly_curve, build_weekly_curve_with_rates
 
         # Week 0 revenue = user's WEEKLY revenue (streams x rate)
         # NOT the annualized total divided by weeks!
@@ -596,7 +569,7 @@ def analyze_deal(
             weekly_result = build_weekly_curve_with_rates(
                 week0_revenue=week0_revenue,
                 weekly_rates=rate_inputs.weekly_rates,
-                excel_multipliers=rate_inputs.decay_multipliers,
+                excel_multipliers=_multipliers_as_dict(rate_inputs.decay_multipliers),
             )
             # Update year1 values to reflect decay within Year 1
             year1_total_rev = weekly_result.year1_total
@@ -604,7 +577,7 @@ def analyze_deal(
             # Fall back to flat Year 1 (no weekly rates available)
             weekly_result = build_weekly_curve(
                 week1_revenue=week0_revenue,
-                excel_multipliers=rate_inputs.decay_multipliers,
+                excel_multipliers=_multipliers_as_dict(rate_inputs.decay_multipliers),
             )
             year1_total_rev = weekly_result.year1_total
 
@@ -663,23 +636,15 @@ def analyze_deal(
             deal_type=inputs.deal_type,
         )
 
-    # Get base cash flows (steady-state split, no recoupment)
-    base_cash_flows = engine.compute_cash_flows_no_recoup()
-
-    # Get label inflows for PV calculations (base split) - annual
-    label_inflows_base = [f[3] for f in base_cash_flows]
+    # Annual gross and base label inflows (steady-state split, no recoupment)
+    # - gross is needed for Profit Split expense allocation, label inflows
+    #   for PV calculations
+    annual_gross, label_inflows_base = engine.compute_base_arrays()
 
     # Generate weekly gross series for payback calculations
-    from .payback import (
-        generate_weekly_gross_series,
-        compute_payback_recommendation,
-        compute_irr_recommendation,
-        DealType as PaybackDealType,
-    )
-
     weekly_gross_series = generate_weekly_gross_series(
         year1_total_rev=year1_total_rev,
-        decay_multipliers=engine.decay_multipliers,
+        decay_multipliers=engine._mult_arr,
         num_years=10,
     )
 
@@ -695,7 +660,7 @@ def analyze_deal(
     # SECTION 1: PAYBACK-BASED RECOMMENDATION (18 months)
     # =========================================================================
     # Max cost that can be recouped by week 78 (varies by deal type)
-    payback_rec = compute_payback_recommendation(
+    payback_recommendation = compute_payback_recommendation(
         weekly_gross_series=weekly_gross_series,
         annual_cash_flows_base=label_inflows_base,
         deal_pct=label_share,
@@ -705,47 +670,23 @@ def analyze_deal(
         deal_type=payback_deal_type,
     )
 
-    payback_recommendation = PaybackRecommendation(
-        payback_horizon_weeks=payback_rec.payback_horizon_weeks,
-        max_total_cost=payback_rec.max_total_cost,
-        suggested_advance=payback_rec.suggested_advance,
-        suggested_marketing=payback_rec.suggested_marketing,
-        implied_irr=payback_rec.implied_irr,
-        recoup_week=payback_rec.recoup_week,
-    )
-
     # =========================================================================
     # SECTION 2: IRR-BASED RECOMMENDATIONS (10% and 15%)
     # =========================================================================
     # Max cost for target IRR (NO payback constraint)
-    # For Profit Split, need annual gross to properly calculate expense impact
-    annual_gross = [cf[2] for cf in base_cash_flows]  # gross_revenue per year
-
+    # Targets are short GIL-bound solves over the same inputs - run them in order
     target_irrs = [0.10, 0.15]
-    irr_recommendations = []
-
-    for target_irr in target_irrs:
-        irr_rec = compute_irr_recommendation(
-            target_irr=target_irr,
-            weekly_gross_series=weekly_gross_series,
-            annual_cash_flows_base=label_inflows_base,
-            deal_pct=label_share,
-            advance_share_pct=inputs.advance_share,
-            marketing_recoupable=inputs.marketing_recoupable,
-            deal_type=payback_deal_type,
-            annual_gross=annual_gross,
-        )
-
-        irr_recommendations.append(
-            IRRRecommendation(
-                target_irr=irr_rec.target_irr,
-                max_total_cost=irr_rec.max_total_cost,
-                suggested_advance=irr_rec.suggested_advance,
-                suggested_marketing=irr_rec.suggested_marketing,
-                recoup_week=irr_rec.recoup_week,
-                npv_at_10_percent=irr_rec.npv_at_10_percent,
-            )
-        )
+    solve_irr_target = partial(
+        compute_irr_recommendation,
+        weekly_gross_series=weekly_gross_series,
+        annual_cash_flows_base=label_inflows_base,
+        deal_pct=label_share,
+        advance_share_pct=inputs.advance_share,
+        marketing_recoupable=inputs.marketing_recoupable,
+        deal_type=payback_deal_type,
+        annual_gross=annual_gross,
+    )
+    irr_recommendations = [solve_irr_target(target_irr) for target_irr in target_irrs]
 
     # For projections display, use the 15% IRR recommendation as reference
     # Show cash flows WITH recoupment waterfall
@@ -757,34 +698,36 @@ def analyze_deal(
 
     display_cash_flows = engine.compute_cash_flows_with_recoup(display_recoup)
 
-    # Create yearly projections (with recoupment)
-    projections = []
-    for year, multiplier, gross_rev, label_cash_in, artist_pay in display_cash_flows:
-        discounted = label_cash_in / ((1 + 0.075) ** year)
-        projections.append(
-            YearlyProjection(
-                year=year,
-                multiplier=multiplier,
-                gross_revenue=gross_rev,
-                label_cash_in=label_cash_in,
-                artist_pay=artist_pay,
-                discounted_cash_in_7_5=discounted,
-            )
+    # Create yearly projections (with recoupment), discounting all years at once
+    label_cash_in = np.array([cf[3] for cf in display_cash_flows])
+    discounted = label_cash_in * _discount_factors(0.075, len(display_cash_flows))
+    projections = [
+        YearlyProjection(
+            year=year,
+            multiplier=multiplier,
+            gross_revenue=gross_rev,
+            label_cash_in=label_cash_in_y,
+            artist_pay=artist_pay,
+            discounted_cash_in_7_5=float(discounted_y),
         )
+        for (year, multiplier, gross_rev, label_cash_in_y, artist_pay), discounted_y in zip(
+            display_cash_flows, discounted
+        )
+    ]
 
     # Build market breakdown
     market_breakdown = {}
-    rest_share = 1.0 - sum(inputs.market_shares.values())
+    rest_share = 1.0
     rest_rate = 0.0
 
-    if ppu_loader:
-        for country, share in inputs.market_shares.items():
-            try:
-                rate = ppu_loader.get_audio_rate(country)
-                market_breakdown[country] = (share, rate)
-            except ValueError:
-                market_breakdown[country] = (share, 0.0)
+    # Unknown countries get a 0.0 rate
+    rates = ppu_loader.get_audio_rates_bulk(inputs.market_shares) if ppu_loader else {}
+    for country, share in inputs.market_shares.items():
+        rest_share -= share
+        if ppu_loader:
+            market_breakdown[country] = (share, rates[country])
 
+    if ppu_loader:
         if inputs.rest_audio_mode == "us":
             try:
                 rest_rate = ppu_loader.get_audio_rate("USA")
@@ -22,10 +22,16 @@ This varies by deal type based on what portion of revenue is available:
 - Profit Split: 78-week gross (expenses come off top before split)
 """
 
-from dataclasses import dataclass
-from typing import List, Optional
+import math
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple
 from enum import Enum
 
+import numpy as np
+
+from ._kernels import HAS_NUMBA, recoup_waterfall
+
 
 class DealType(Enum):
     """Types of deal structures for payback calculations."""
@@ -34,14 +40,14 @@ class DealType(Enum):
     ROYALTY = "royalty"
 
 
-@dataclass
+@dataclass(slots=True)
 class WeeklyCashFlowResult:
     """Results from weekly cash flow simulation."""
 
-    # Weekly series
-    weekly_label_cash_in: List[float]
-    weekly_artist_pay: List[float]
-    weekly_gross: List[float]
+    # Weekly series (float64 arrays, one entry per week)
+    weekly_label_cash_in: np.ndarray
+    weekly_artist_pay: np.ndarray
+    weekly_gross: np.ndarray
 
     # Cumulative label cash-in at milestones
     cum_label_cash_in_78: float  # C(78)
@@ -53,6 +59,141 @@ class WeeklyCashFlowResult:
     recoupable_amount: float
 
 
+@dataclass
+class _PaybackContext:
+    """
+    Arrays derived once from a weekly gross series.
+
+    Shared by the payback solvers so the cash flow simulation, recoup week
+    and max cost lookups for one series don't each rebuild them.
+    """
+
+    gross: np.ndarray
+    total_gross: float
+    gross_share: Optional[np.ndarray]  # Each week's share of total gross (profit split)
+    _recoup_bases: Dict[Tuple, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)
+
+    @classmethod
+    def from_series(cls, weekly_gross_series: List[float]) -> "_PaybackContext":
+        gross = np.ascontiguousarray(weekly_gross_series, dtype=float)
+        total_gross = float(gross.sum())
+        gross_share = gross / total_gross if total_gross > 0 else None
+        return cls(gross=gross, total_gross=total_gross, gross_share=gross_share)
+
+    def recoup_base(
+        self, deal_type: Optional[DealType], deal_pct: float, total_cost: float
+    ) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Weekly stream the recoupable amount is withheld from.
+
+        Returns:
+            (recoup base, its cumulative sum) - the cumulative sum is cached for
+            deal types whose base doesn't depend on cost, None otherwise
+        """
+        if deal_type == DealType.PROFIT_SPLIT:
+            # PROFIT SPLIT: Expenses reduce gross to net, recoup from net
+            if self.gross_share is None:
+                return np.maximum(0.0, self.gross), None
+            return np.maximum(0.0, self.gross - total_cost * self.gross_share), None
+
+        # DISTRIBUTION: Label gets 100% of gross during recoup
+        # ROYALTY (and default/legacy): withhold the artist's royalty during recoup
+        key = (DealType.DISTRIBUTION, None) if deal_type == DealType.DISTRIBUTION else (None, deal_pct)
+        if key not in self._recoup_bases:
+            base = self.gross if deal_type == DealType.DISTRIBUTION else self.gross * (1.0 - deal_pct)
+            self._recoup_bases[key] = (base, np.cumsum(base))
+        return self._recoup_bases[key]
+
+
+def _recoupable_amount(
+    total_cost: float, advance_share_pct: float, marketing_recoupable: bool
+) -> float:
+    """Advance only, or the full cost when marketing is recoupable."""
+    if marketing_recoupable:
+        return total_cost
+    return total_cost * advance_share_pct
+
+
+def _recoup_waterfall(
+    recoup_base: np.ndarray,
+    recoupable_amount: float,
+    cum_base: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, Optional[int]]:
+    """
+    Withhold from a weekly revenue stream until the recoupable amount is paid off.
+
+    Week t withholds min(base_t, outstanding balance), which in closed form is
+    clip(recoupable - cumulative base before week t, 0, base_t).
+
+    Returns:
+        (weekly amounts withheld, 1-indexed recoup week or None if never)
+    """
+    if recoupable_amount <= 0:
+        return np.zeros_like(recoup_base), None
+
+    if HAS_NUMBA:
+        # Compiled sequential walk: stops at the recoup week, no temporaries
+        withheld, recoup_week = recoup_waterfall(recoup_base, float(recoupable_amount))
+        return withheld, (recoup_week or None)
+
+    if cum_base is None:
+        cum_base = np.cumsum(recoup_base)
+    outstanding = recoupable_amount - np.concatenate(([0.0], cum_base[:-1]))
+    withheld = np.clip(outstanding, 0.0, recoup_base)
+
+    return withheld, _first_week_covering(cum_base, recoupable_amount)
+
+
+def _first_week_covering(cum_base: np.ndarray, amount: float) -> Optional[int]:
+    """1-indexed first week whose cumulative base reaches amount, or None."""
+    idx = int(np.searchsorted(cum_base, amount, side="left"))
+    return idx + 1 if idx < len(cum_base) else None
+
+
+def _weekly_cashflows(
+    ctx: _PaybackContext,
+    deal_pct: float,
+    total_cost: float,
+    advance_share_pct: float,
+    marketing_recoupable: bool,
+    deal_type: Optional[DealType],
+) -> WeeklyCashFlowResult:
+    """compute_weekly_cashflows() over a prepared context."""
+    recoupable_amount = _recoupable_amount(total_cost, advance_share_pct, marketing_recoupable)
+    artist_share = 1.0 - deal_pct
+    gross = ctx.gross
+
+    recoup_base, cum_base = ctx.recoup_base(deal_type, deal_pct, total_cost)
+    withheld, recoup_week = _recoup_waterfall(recoup_base, recoupable_amount, cum_base)
+
+    if deal_type in (DealType.DISTRIBUTION, DealType.PROFIT_SPLIT):
+        # Label takes what's withheld, remainder is split at deal_pct
+        remainder = recoup_base - withheld
+        label_cash_in = withheld + remainder * deal_pct
+        artist_pay = remainder * artist_share
+    else:
+        # Label keeps its share (e.g., 80%) plus the withheld royalty
+        label_cash_in = gross * deal_pct + withheld
+        artist_pay = recoup_base - withheld
+
+    # Cumulative label cash-in at milestones (total if fewer weeks)
+    cum_label = np.cumsum(label_cash_in)
+    cum_label_total = float(cum_label[-1]) if len(cum_label) else 0.0
+    cum_label_78 = float(cum_label[77]) if len(cum_label) >= 78 else cum_label_total
+    cum_label_104 = float(cum_label[103]) if len(cum_label) >= 104 else cum_label_total
+
+    return WeeklyCashFlowResult(
+        weekly_label_cash_in=label_cash_in,
+        weekly_artist_pay=artist_pay,
+        weekly_gross=gross.copy(),
+        cum_label_cash_in_78=cum_label_78,
+        cum_label_cash_in_104=cum_label_104,
+        cum_label_cash_in_total=cum_label_total,
+        recoup_week=recoup_week,
+        recoupable_amount=recoupable_amount,
+    )
+
+
 def compute_weekly_cashflows(
     weekly_gross_series: List[float],
     deal_pct: float,
@@ -75,139 +216,35 @@ def compute_weekly_cashflows(
     Returns:
         WeeklyCashFlowResult with all cash flow data
     """
-    # Calculate recoupable amount
-    advance = total_cost * advance_share_pct
-    marketing = total_cost - advance
-
-    if marketing_recoupable:
-        recoupable_amount = total_cost
-    else:
-        recoupable_amount = advance
+    return _weekly_cashflows(
+        _PaybackContext.from_series(weekly_gross_series),
+        deal_pct=deal_pct,
+        total_cost=total_cost,
+        advance_share_pct=advance_share_pct,
+        marketing_recoupable=marketing_recoupable,
+        deal_type=deal_type,
+    )
 
-    artist_share = 1.0 - deal_pct
-    total_gross = sum(weekly_gross_series)
-
-    weekly_label_cash_in = []
-    weekly_artist_pay = []
-    weekly_gross = []
-
-    remaining_recoup = recoupable_amount
-    recoup_week = None
-    cum_label_78 = 0.0
-    cum_label_104 = 0.0
-    cum_label_total = 0.0
-
-    for week_idx, gross in enumerate(weekly_gross_series):
-        week_num = week_idx + 1
-
-        if deal_type == DealType.ROYALTY:
-            # ROYALTY: Label keeps 80% + withholds 20% during recoup
-            # Recoupment at artist's royalty rate
-            label_base = gross * deal_pct  # Label's share (e.g., 80%)
-            artist_royalty = gross * artist_share  # Artist's royalty (e.g., 20%)
-
-            if remaining_recoup <= 0:
-                label_cash_in = label_base
-                artist_pay = artist_royalty
-            elif artist_royalty <= remaining_recoup:
-                remaining_recoup -= artist_royalty
-                label_cash_in = label_base + artist_royalty  # 100%
-                artist_pay = 0.0
-                if remaining_recoup <= 0 and recoup_week is None:
-                    recoup_week = week_num
-            else:
-                # Mid-week recoup
-                label_cash_in = label_base + remaining_recoup
-                artist_pay = artist_royalty - remaining_recoup
-                remaining_recoup = 0.0
-                recoup_week = week_num
-
-        elif deal_type == DealType.DISTRIBUTION:
-            # DISTRIBUTION: Label gets 100% of gross during recoup
-            # After recoup: label gets deal_pct (e.g., 30%)
-            if remaining_recoup <= 0:
-                label_cash_in = gross * deal_pct
-                artist_pay = gross * artist_share
-            elif gross <= remaining_recoup:
-                remaining_recoup -= gross
-                label_cash_in = gross  # 100%
-                artist_pay = 0.0
-                if remaining_recoup <= 0 and recoup_week is None:
-                    recoup_week = week_num
-            else:
-                # Mid-week recoup: label takes what's needed, splits rest
-                recoup_portion = remaining_recoup
-                remainder = gross - remaining_recoup
-                remaining_recoup = 0.0
-                recoup_week = week_num
-                label_cash_in = recoup_portion + (remainder * deal_pct)
-                artist_pay = remainder * artist_share
-
-        elif deal_type == DealType.PROFIT_SPLIT:
-            # PROFIT SPLIT: Expenses reduce gross to net, recoup from net
-            expense = total_cost * (gross / total_gross) if total_gross > 0 else 0
-            net_revenue = max(0, gross - expense)
-
-            if remaining_recoup <= 0:
-                label_cash_in = net_revenue * deal_pct
-                artist_pay = net_revenue * artist_share
-            elif net_revenue <= remaining_recoup:
-                remaining_recoup -= net_revenue
-                label_cash_in = net_revenue  # 100% of net
-                artist_pay = 0.0
-                if remaining_recoup <= 0 and recoup_week is None:
-                    recoup_week = week_num
-            else:
-                # Mid-week recoup
-                recoup_portion = remaining_recoup
-                remainder = net_revenue - remaining_recoup
-                remaining_recoup = 0.0
-                recoup_week = week_num
-                label_cash_in = recoup_portion + (remainder * deal_pct)
-                artist_pay = remainder * artist_share
 
-        else:
-            # Default/legacy: withhold from artist share (like Royalty)
-            label_base = gross * deal_pct
-            artist_due = gross * artist_share
-
-            if remaining_recoup > 0:
-                withheld = min(artist_due, remaining_recoup)
-                remaining_recoup -= withheld
-                label_cash_in = label_base + withheld
-                artist_pay = artist_due - withheld
-                if remaining_recoup <= 0 and recoup_week is None:
-                    recoup_week = week_num
-            else:
-                label_cash_in = label_base
-                artist_pay = artist_due
-
-        weekly_label_cash_in.append(label_cash_in)
-        weekly_artist_pay.append(artist_pay)
-        weekly_gross.append(gross)
-        cum_label_total += label_cash_in
-
-        if week_num == 78:
-            cum_label_78 = cum_label_total
-        if week_num == 104:
-            cum_label_104 = cum_label_total
-
-    # Handle case where we have fewer than 78/104 weeks
-    if len(weekly_gross_series) < 78:
-        cum_label_78 = cum_label_total
-    if len(weekly_gross_series) < 104:
-        cum_label_104 = cum_label_total
+def _recoup_week(
+    ctx: _PaybackContext,
+    deal_pct: float,
+    total_cost: float,
+    advance_share_pct: float,
+    marketing_recoupable: bool,
+    deal_type: Optional[DealType],
+) -> Optional[int]:
+    """compute_recoup_week() over a prepared context."""
+    recoupable_amount = _recoupable_amount(total_cost, advance_share_pct, marketing_recoupable)
+    if recoupable_amount <= 0:
+        return None
 
-    return WeeklyCashFlowResult(
-        weekly_label_cash_in=weekly_label_cash_in,
-        weekly_artist_pay=weekly_artist_pay,
-        weekly_gross=weekly_gross,
-        cum_label_cash_in_78=cum_label_78,
-        cum_label_cash_in_104=cum_label_104,
-        cum_label_cash_in_total=cum_label_total,
-        recoup_week=recoup_week,
-        recoupable_amount=recoupable_amount,
-    )
+    # Recoup completes in the first week the cumulative recoup base covers the
+    # recoupable amount - a binary search, no need to simulate the cash flows
+    recoup_base, cum_base = ctx.recoup_base(deal_type, deal_pct, total_cost)
+    if cum_base is None:
+        cum_base = np.cumsum(recoup_base)
+    return _first_week_covering(cum_base, recoupable_amount)
 
 
 def compute_recoup_week(
@@ -227,8 +264,8 @@ def compute_recoup_week(
     Returns:
         Week number (1-indexed) when recoup completes, or None if never
     """
-    result = compute_weekly_cashflows(
-        weekly_gross_series=weekly_gross_series,
+    return _recoup_week(
+        _PaybackContext.from_series(weekly_gross_series),
         deal_pct=deal_pct,
         total_cost=total_cost,
         advance_share_pct=advance_share_pct,
@@ -236,9 +273,60 @@ def compute_recoup_week(
         deal_type=deal_type,
     )
 
-    # Return the recoup week calculated by the weekly cashflows
-    # (which tracks when the recoupable amount is fully paid off)
-    return result.recoup_week
+
+def _payback_max_cost(
+    ctx: _PaybackContext,
+    deal_pct: float,
+    advance_share_pct: float,
+    marketing_recoupable: bool,
+    payback_horizon_weeks: int,
+    deal_type: Optional[DealType],
+) -> float:
+    """compute_payback_max_cost() over a prepared context."""
+    horizon_weeks = min(payback_horizon_weeks, len(ctx.gross))
+    recoup_share = 1.0 if marketing_recoupable else advance_share_pct
+
+    if horizon_weeks == 0 or recoup_share <= 0:
+        # Nothing to recoup from, or nothing recoupable to pay back
+        return 0.0
+
+    total_gross_in_horizon = ctx.gross[:horizon_weeks].sum()
+    if total_gross_in_horizon <= 0:
+        return 0.0
+
+    # Recoupment completes by the horizon iff the horizon's cumulative recoup
+    # base covers recoup_share x cost, so the max cost is found in closed form.
+    # The theoretical recoup capacity still caps it, as it capped the search.
+    if deal_type == DealType.PROFIT_SPLIT:
+        # Profit split: expenses reduce gross, so max is ~50% of gross
+        # (at 100% expense, net = 0, so can't recoup anything)
+        # Net in horizon = G_H x (1 - cost / total_gross) must cover recoup_share x cost
+        recoup_capacity = total_gross_in_horizon * 0.5
+        max_cost = total_gross_in_horizon / (
+            recoup_share + total_gross_in_horizon / ctx.total_gross
+        )
+    else:
+        # Distribution: 100% of gross goes to recoup
+        # Royalty (and default): only artist's royalty portion available for recoup
+        _, cum_base = ctx.recoup_base(deal_type, deal_pct, 0.0)
+        recoup_capacity = cum_base[horizon_weeks - 1]
+        max_cost = recoup_capacity / recoup_share
+
+    max_cost = float(min(max_cost, recoup_capacity))
+
+    payback_week = _recoup_week(
+        ctx,
+        deal_pct=deal_pct,
+        total_cost=max_cost,
+        advance_share_pct=advance_share_pct,
+        marketing_recoupable=marketing_recoupable,
+        deal_type=deal_type,
+    )
+    if max_cost > 0 and (payback_week is None or payback_week > payback_horizon_weeks):
+        # Exact in real arithmetic; a cent covers rounding right at the boundary
+        max_cost = max(0.0, max_cost - 0.01)
+
+    return max_cost
 
 
 def compute_payback_max_cost(
@@ -268,56 +356,37 @@ def compute_payback_max_cost(
     Returns:
         Maximum deal cost that can be recouped by horizon
     """
-    horizon_weeks = min(payback_horizon_weeks, len(weekly_gross_series))
-    total_gross_in_horizon = sum(weekly_gross_series[:horizon_weeks])
+    return _payback_max_cost(
+        _PaybackContext.from_series(weekly_gross_series),
+        deal_pct=deal_pct,
+        advance_share_pct=advance_share_pct,
+        marketing_recoupable=marketing_recoupable,
+        payback_horizon_weeks=payback_horizon_weeks,
+        deal_type=deal_type,
+    )
 
-    # Calculate theoretical max recoupment capacity (upper bound for search)
-    if deal_type == DealType.DISTRIBUTION:
-        # Distribution: 100% of gross goes to recoup
-        recoup_capacity = total_gross_in_horizon
-    elif deal_type == DealType.ROYALTY:
-        # Royalty: only artist's royalty portion available for recoup
-        artist_royalty_rate = 1.0 - deal_pct
-        recoup_capacity = total_gross_in_horizon * artist_royalty_rate
-    elif deal_type == DealType.PROFIT_SPLIT:
-        # Profit split: expenses reduce gross, so max is ~50% of gross
-        # (at 100% expense, net = 0, so can't recoup anything)
-        recoup_capacity = total_gross_in_horizon * 0.5
-    else:
-        # Default: artist's share
-        artist_share = 1.0 - deal_pct
-        recoup_capacity = total_gross_in_horizon * artist_share
-
-    # Use binary search to find exact max that pays back by the horizon
-    cost_low = 0.0
-    cost_high = recoup_capacity
-    tolerance = 1.0  # $1 tolerance
-    best_cost = 0.0
-
-    for _ in range(100):  # Max iterations
-        cost_mid = (cost_low + cost_high) / 2
-
-        payback_week = compute_recoup_week(
-            weekly_gross_series=weekly_gross_series,
-            deal_pct=deal_pct,
-            total_cost=cost_mid,
-            advance_share_pct=advance_share_pct,
-            marketing_recoupable=marketing_recoupable,
-            deal_type=deal_type,
-        )
 
-        if payback_week is not None and payback_week <= payback_horizon_weeks:
-            # Feasible - can increase cost
-            best_cost = cost_mid
-            cost_low = cost_mid
-        else:
-            # Not feasible - decrease cost
-            cost_high = cost_mid
+def _discount_vector(num_periods: int, rate: float) -> np.ndarray:
+    """(1 + rate)^-t for t = 1..N, as exp(-t * log1p(rate)) with the log hoisted."""
+    periods = np.arange(1, num_periods + 1, dtype=float)
+    return np.exp(-periods * math.log1p(rate))
 
-        if cost_high - cost_low < tolerance:
-            break
 
-    return best_cost
+@lru_cache(maxsize=256)
+def _npv_factors(rate: float, num_periods: int) -> np.ndarray:
+    """
+    Cached _discount_vector for rates that recur (target IRRs, the 10% NPV rate).
+
+    The returned array is read-only.
+    """
+    factors = _discount_vector(num_periods, rate)
+    factors.flags.writeable = False
+    return factors
+
+
+def _present_value(cash_flows: np.ndarray, rate: float) -> float:
+    """PV of cash flows for periods 1..N at a per-period rate, as one dot product."""
+    return float(np.dot(cash_flows, _npv_factors(rate, len(cash_flows))))
 
 
 def compute_weekly_irr(
@@ -343,33 +412,69 @@ def compute_weekly_irr(
     if total_cost <= 0:
         return None
 
+    cash_flows = np.asarray(weekly_cash_flows, dtype=float)
+
     # Check if total cash flows exceed cost
-    total_cf = sum(weekly_cash_flows)
+    total_cf = cash_flows.sum()
     if total_cf <= total_cost:
         return None  # Negative or zero IRR
 
-    # Binary search for weekly IRR
     # Weekly IRR typically in range [-0.01, 0.05]
     r_low = -0.01
     r_high = 0.10  # 10% weekly = very high
 
+    n_weeks = len(cash_flows)
+    weighted_cash_flows = cash_flows * np.arange(1, n_weeks + 1, dtype=float)
+
     def npv_at_rate(r: float) -> float:
-        if r <= -1:
-            return float('inf')
-        pv = 0.0
-        for t, cf in enumerate(weekly_cash_flows, start=1):
-            pv += cf / ((1 + r) ** t)
-        return pv - total_cost
+        return _present_value(cash_flows, r) - total_cost
 
-    # Check bounds
-    npv_low = npv_at_rate(r_low)
-    npv_high = npv_at_rate(r_high)
+    def npv_and_slope(r: float) -> Tuple[float, float]:
+        # One discount vector serves both: d/dr (1+r)^-t = -t (1+r)^-t / (1+r)
+        discount = _discount_vector(n_weeks, r)
+        npv = float(np.dot(cash_flows, discount)) - total_cost
+        slope = -float(np.dot(weighted_cash_flows, discount)) / (1.0 + r)
+        return npv, slope
 
-    if npv_low < 0:
+    # Check bounds
+    if npv_at_rate(r_low) < 0:
         return None  # Even at very low rate, NPV is negative
-    if npv_high > 0:
+    if npv_at_rate(r_high) > 0:
         r_high = 0.5  # Expand search
 
+    # Newton-Raphson from the low bound. With non-negative inflows NPV is
+    # decreasing and convex in r, so iterates approach the root from below
+    # without overshooting.
+    r = r_low
+    for _ in range(max_iterations):
+        npv, slope = npv_and_slope(r)
+        if abs(npv) < tolerance:
+            break
+
+        if slope >= 0:
+            break
+
+        step = npv / slope
+        r -= step
+        if r >= r_high or abs(step) < tolerance / 100:
+            break
+
+    return min(r, r_high)
+
+
+def _bisect_annual_irr(
+    total_cost: float,
+    cash_flows: np.ndarray,
+    tolerance: float,
+    max_iterations: int,
+    r_low: float,
+    r_high: float,
+) -> float:
+    """Bisection on annual NPV over [r_low, r_high] (fallback for compute_annual_irr)."""
+
+    def npv_at_rate(r: float) -> float:
+        return float(np.dot(cash_flows, _discount_vector(len(cash_flows), r))) - total_cost
+
     for _ in range(max_iterations):
         r_mid = (r_low + r_high) / 2
         npv_mid = npv_at_rate(r_mid)
@@ -388,6 +493,47 @@ def compute_weekly_irr(
     return (r_low + r_high) / 2
 
 
+def _annual_irr_from_roots(total_cost: float, cash_flows: np.ndarray) -> Optional[float]:
+    """Polynomial-root IRR, Newton-polished and verified, or None if it doesn't check out."""
+    # Trailing years that are effectively zero would be near-zero leading
+    # coefficients, which throw off the eigenvalue solve - drop them
+    significant = np.flatnonzero(np.abs(cash_flows) > 1e-12 * np.abs(cash_flows).max())
+    if len(significant) == 0:
+        return None
+    trimmed = cash_flows[: significant[-1] + 1]
+
+    # Coefficients from highest power (year N) down to the constant term
+    roots = np.roots(np.concatenate((trimmed[::-1], [-total_cost])))
+    real_roots = roots[np.abs(roots.imag) < 1e-8].real
+    positive_roots = real_roots[real_roots > 0]
+    if len(positive_roots) == 0:
+        return None
+
+    # Total inflows exceed cost, so NPV(0) > 0: take the root closest to r = 0
+    rates = 1.0 / positive_roots - 1.0
+    r = float(rates[np.argmin(np.abs(rates))])
+
+    years = np.arange(1, len(trimmed) + 1, dtype=float)
+    weighted_cash_flows = trimmed * years
+    for _ in range(5):
+        discount = _discount_vector(len(trimmed), r)
+        npv = float(np.dot(trimmed, discount)) - total_cost
+        slope = -float(np.dot(weighted_cash_flows, discount)) / (1.0 + r)
+        if slope >= 0:
+            break
+        step = npv / slope
+        if r - step <= -1:
+            break
+        r -= step
+        if abs(step) < 1e-12:
+            break
+    npv = float(np.dot(trimmed, _discount_vector(len(trimmed), r))) - total_cost
+
+    if not math.isfinite(r) or abs(npv) > 1e-9 * max(total_cost, 1.0):
+        return None
+    return r
+
+
 def compute_annual_irr(
     total_cost: float,
     annual_cash_flows: List[float],
@@ -397,9 +543,17 @@ def compute_annual_irr(
     """
     Compute IRR on annual cash flows.
 
+    NPV is a polynomial in x = 1/(1+r): -cost + sum(cf_y * x^y). The IRR comes
+    from its positive real root in one eigenvalue solve, polished with a few
+    Newton steps on NPV. If the root doesn't check out (NPV not ~0, e.g. when
+    near-zero coefficients make the eigenvalues unreliable) it falls back to
+    bisection. Results are clamped to the [-50%, 200%] range bisection searches.
+
     Args:
         total_cost: Initial investment (positive number)
         annual_cash_flows: List of annual cash inflows (years 1-10)
+        tolerance: NPV tolerance for the bisection fallback
+        max_iterations: Maximum bisection iterations for the fallback
 
     Returns:
         Annual IRR as decimal (e.g., 0.15 for 15%), or None if no solution
@@ -407,38 +561,19 @@ def compute_annual_irr(
     if total_cost <= 0:
         return None
 
-    total_cf = sum(annual_cash_flows)
+    cash_flows = np.asarray(annual_cash_flows, dtype=float)
+
+    total_cf = cash_flows.sum()
     if total_cf <= total_cost:
         return None
 
-    # Binary search for annual IRR
     r_low = -0.50
     r_high = 2.0  # 200% = very high
 
-    def npv_at_rate(r: float) -> float:
-        if r <= -1:
-            return float('inf')
-        pv = 0.0
-        for year, cf in enumerate(annual_cash_flows, start=1):
-            pv += cf / ((1 + r) ** year)
-        return pv - total_cost
-
-    for _ in range(max_iterations):
-        r_mid = (r_low + r_high) / 2
-        npv_mid = npv_at_rate(r_mid)
-
-        if abs(npv_mid) < tolerance:
-            return r_mid
-
-        if npv_mid > 0:
-            r_low = r_mid
-        else:
-            r_high = r_mid
-
-        if r_high - r_low < tolerance / 100:
-            break
-
-    return (r_low + r_high) / 2
+    irr = _annual_irr_from_roots(total_cost, cash_flows)
+    if irr is None:
+        irr = _bisect_annual_irr(total_cost, cash_flows, tolerance, max_iterations, r_low, r_high)
+    return float(min(max(irr, r_low), r_high))
 
 
 def solve_max_cost_for_irr(
@@ -461,18 +596,16 @@ def solve_max_cost_for_irr(
     if target_irr <= -1:
         return 0.0
 
-    pv = 0.0
-    for year, cf in enumerate(annual_cash_flows, start=1):
-        pv += cf / ((1 + target_irr) ** year)
+    pv = _present_value(np.asarray(annual_cash_flows, dtype=float), target_irr)
 
     return max(0.0, pv)
 
 
 def generate_weekly_gross_series(
     year1_total_rev: float,
-    decay_multipliers: dict,
+    decay_multipliers,
     num_years: int = 10,
-) -> List[float]:
+) -> np.ndarray:
     """
     Generate weekly gross revenue series from annual totals.
 
@@ -480,26 +613,27 @@ def generate_weekly_gross_series(
 
     Args:
         year1_total_rev: Year 1 total gross revenue
-        decay_multipliers: {year: multiplier} dict
+        decay_multipliers: {year: multiplier} dict, or a sequence/array of
+            multipliers for years 1..N (index 0 = Year 1)
         num_years: Number of years
 
     Returns:
-        List of 520 weekly gross revenues
+        Array of 520 weekly gross revenues
     """
-    weekly_series = []
-
-    for year in range(1, num_years + 1):
-        multiplier = decay_multipliers.get(year, 0.0)
-        year_total = year1_total_rev * multiplier
-        weekly_rev = year_total / 52.0
-
-        for _ in range(52):
-            weekly_series.append(weekly_rev)
+    if isinstance(decay_multipliers, dict):
+        multipliers = np.array(
+            [decay_multipliers.get(year, 0.0) for year in range(1, num_years + 1)], dtype=float
+        )
+    else:
+        multipliers = np.zeros(num_years)
+        given = np.asarray(decay_multipliers, dtype=float)[:num_years]
+        multipliers[: len(given)] = given
 
-    return weekly_series
+    weekly_per_year = year1_total_rev * multipliers / 52.0
+    return np.repeat(weekly_per_year, 52)
 
 
-@dataclass
+@dataclass(slots=True)
 class PaybackRecommendation:
     """Payback-based (18-month) recommendation."""
 
@@ -511,15 +645,15 @@ class PaybackRecommendation:
     recoup_week: Optional[int]  # Should be <= horizon if achievable
 
 
-@dataclass
+@dataclass(slots=True)
 class IRRRecommendation:
-    """IRR-based recommendation."""
+    """IRR-based recommendation (no payback constraint)."""
 
     target_irr: float
     max_total_cost: float
     suggested_advance: float
     suggested_marketing: float
-    recoup_week: Optional[int]  # Informational
+    recoup_week: Optional[int]  # Informational - when payback occurs
     npv_at_10_percent: float
 
 
@@ -540,9 +674,11 @@ def compute_payback_recommendation(
 
     The max_cost varies by deal type based on recoupment mechanics.
     """
+    ctx = _PaybackContext.from_series(weekly_gross_series)
+
     # Find max cost for payback (varies by deal type)
-    max_cost = compute_payback_max_cost(
-        weekly_gross_series=weekly_gross_series,
+    max_cost = _payback_max_cost(
+        ctx,
         deal_pct=deal_pct,
         advance_share_pct=advance_share_pct,
         marketing_recoupable=marketing_recoupable,
@@ -550,20 +686,11 @@ def compute_payback_recommendation(
         deal_type=deal_type,
     )
 
-    # Get recoup week at max cost
-    recoup_week = compute_recoup_week(
-        weekly_gross_series=weekly_gross_series,
-        deal_pct=deal_pct,
-        total_cost=max_cost,
-        advance_share_pct=advance_share_pct,
-        marketing_recoupable=marketing_recoupable,
-        deal_type=deal_type,
-    )
-
     # Compute implied IRR using annual cash flows with recoup
-    # Need to generate cash flows AT this cost level
-    cf_result = compute_weekly_cashflows(
-        weekly_gross_series=weekly_gross_series,
+    # Need to generate cash flows AT this cost level (the same pass gives the
+    # recoup week at max cost)
+    cf_result = _weekly_cashflows(
+        ctx,
         deal_pct=deal_pct,
         total_cost=max_cost,
         advance_share_pct=advance_share_pct,
@@ -571,13 +698,11 @@ def compute_payback_recommendation(
         deal_type=deal_type,
     )
 
-    # Convert to annual for IRR calculation
-    annual_cash_flows = []
-    for year in range(10):
-        start_idx = year * 52
-        end_idx = start_idx + 52
-        year_total = sum(cf_result.weekly_label_cash_in[start_idx:end_idx])
-        annual_cash_flows.append(year_total)
+    # Convert to annual for IRR calculation (10 years x 52 weeks, zero-padded)
+    weekly_label = np.zeros(10 * 52)
+    num_weeks = min(len(cf_result.weekly_label_cash_in), len(weekly_label))
+    weekly_label[:num_weeks] = cf_result.weekly_label_cash_in[:num_weeks]
+    annual_cash_flows = weekly_label.reshape(10, 52).sum(axis=1)
 
     implied_irr = compute_annual_irr(max_cost, annual_cash_flows) if max_cost > 0 else None
 
@@ -587,10 +712,185 @@ def compute_payback_recommendation(
         suggested_advance=max_cost * advance_share_pct,
         suggested_marketing=max_cost * (1 - advance_share_pct),
         implied_irr=implied_irr,
-        recoup_week=recoup_week,
+        recoup_week=cf_result.recoup_week,
     )
 
 
+def _recoup_then_split(stream: np.ndarray, deal_pct: float, total_cost: float) -> np.ndarray:
+    """
+    Label takes 100% of an annual stream until total_cost is recouped, then deal_pct.
+
+    Recoup completes in the first year whose cumulative stream covers the
+    cost, so the waterfall is a searchsorted rather than a loop.
+    """
+    actual_cf = stream * deal_pct  # Already recouped: Split
+    if total_cost <= 0:
+        return actual_cf
+
+    cum_stream = np.cumsum(stream)
+    k = int(np.searchsorted(cum_stream, total_cost, side="left"))
+
+    # Full years go to recoup
+    actual_cf[:k] = stream[:k]
+    if k < len(stream):
+        # Mid-year recoup: take what's needed, split remainder
+        recoup_portion = total_cost - (cum_stream[k - 1] if k > 0 else 0.0)
+        actual_cf[k] = recoup_portion + (stream[k] - recoup_portion) * deal_pct
+
+    return actual_cf
+
+
+def _profit_split_annual_cash_flows(
+    annual_gross: np.ndarray, deal_pct: float, total_cost: float
+) -> np.ndarray:
+    """
+    Label's annual cash flows for a PROFIT SPLIT deal at a given cost.
+
+    1. Net = Gross - Expenses (allocated proportionally)
+    2. Label gets 100% of net until recouped
+    3. After recoup: Split net according to deal terms
+    """
+    gross = np.asarray(annual_gross, dtype=float)
+    total_gross = gross.sum()
+    if total_gross > 0:
+        net = np.maximum(0.0, gross - total_cost * (gross / total_gross))
+    else:
+        net = np.maximum(0.0, gross)
+    return _recoup_then_split(net, deal_pct, total_cost)
+
+
+def _royalty_annual_cash_flows(
+    annual_gross: np.ndarray, deal_pct: float, total_cost: float
+) -> List[float]:
+    """
+    Label's annual cash flows for a FUNDED ROYALTY deal at a given cost.
+
+    - Label's share (e.g., 80%) always goes to label
+    - Artist's royalty (e.g., 20%) withheld during recoup
+    - Recoupment happens at artist's royalty rate
+    """
+    artist_royalty_rate = 1.0 - deal_pct  # e.g., 20%
+    actual_cf = []
+    unrecouped = total_cost
+    for gross_y in annual_gross:
+        label_base = gross_y * deal_pct  # Label's share (80%)
+        artist_royalty = gross_y * artist_royalty_rate  # Artist's share (20%)
+
+        if unrecouped <= 0:
+            # Recouped: Label gets their share only
+            label_cf_y = label_base
+        elif artist_royalty <= unrecouped:
+            # Full artist royalty goes to recoup
+            unrecouped -= artist_royalty
+            label_cf_y = label_base + artist_royalty  # 100%
+        else:
+            # Mid-year recoup
+            label_cf_y = label_base + unrecouped
+            unrecouped = 0.0
+
+        actual_cf.append(label_cf_y)
+
+    return actual_cf
+
+
+def _distribution_annual_cash_flows(
+    annual_gross: np.ndarray, deal_pct: float, total_cost: float
+) -> np.ndarray:
+    """
+    Label's annual cash flows for a FUNDED DISTRIBUTION deal at a given cost.
+
+    100% of gross goes to the label during recoup, then split at deal_pct
+    (mid-year recoupment handled properly).
+    """
+    return _recoup_then_split(np.asarray(annual_gross, dtype=float), deal_pct, total_cost)
+
+
+def _cost_at_zero_npv(npv_at_cost: Callable[[float], float], kinks: np.ndarray) -> float:
+    """
+    Cost where a decreasing, piecewise-linear NPV(cost) crosses zero.
+
+    kinks are the ascending costs where the slope can change, starting at 0.
+    NPV is evaluated at each kink until it turns non-positive, and the root is
+    interpolated within that (linear) piece.
+    """
+    prev_cost = kinks[0]
+    prev_npv = npv_at_cost(prev_cost)
+    if prev_npv <= 0:
+        return 0.0
+
+    for cost in kinks[1:]:
+        npv = npv_at_cost(cost)
+        if npv <= 0:
+            return float(prev_cost + prev_npv * (cost - prev_cost) / (prev_npv - npv))
+        prev_cost, prev_npv = cost, npv
+
+    return float(prev_cost)
+
+
+def _profit_split_max_cost_for_irr(
+    annual_gross: List[float], deal_pct: float, target_irr: float
+) -> float:
+    """
+    Max PROFIT SPLIT cost at which the label's annual IRR reaches target_irr.
+
+    Expenses scale every year's net by (1 - cost / total_gross), and the label
+    takes 100% of net until the cost is recouped, so label cash flows are
+    linear in cost except where the recoup year changes. Recoupment lands
+    exactly on the end of year k at cost_k = G_k / (1 + G_k / total_gross)
+    (G_k = cumulative gross), and at cost >= total_gross nothing is left.
+    NPV at the target rate is decreasing and linear between those kinks, so
+    IRR = target (NPV = 0) is solved exactly instead of by search.
+    """
+    gross = np.asarray(annual_gross, dtype=float)
+    total_gross = gross.sum()
+    if total_gross <= 0:
+        return 0.0
+
+    cum_gross = np.cumsum(gross)
+    kinks = np.concatenate(([0.0], cum_gross / (1.0 + cum_gross / total_gross), [total_gross]))
+
+    def npv_at_cost(cost: float) -> float:
+        actual_cf = _profit_split_annual_cash_flows(gross, deal_pct, cost)
+        return _present_value(np.asarray(actual_cf), target_irr) - cost
+
+    return _cost_at_zero_npv(npv_at_cost, kinks)
+
+
+def _recoup_max_cost_for_irr(
+    annual_gross: List[float], deal_pct: float, target_irr: float, deal_type: DealType
+) -> float:
+    """
+    Max ROYALTY / DISTRIBUTION cost at which the label's annual IRR reaches target_irr.
+
+    The cost is withheld from a fixed annual stream (the artist's royalty, or
+    all of gross for distribution), so label cash flows are linear in cost
+    except where the recoup year changes: at the cumulative recoup base at
+    the end of each year. Past the total base the cash flows stop changing.
+    NPV at the target rate is decreasing and linear between those kinks, so
+    IRR = target (NPV = 0) is solved exactly, searching costs up to total gross.
+    """
+    gross = np.asarray(annual_gross, dtype=float)
+    total_gross = gross.sum()
+    if total_gross <= 0:
+        return 0.0
+
+    if deal_type == DealType.ROYALTY:
+        cash_flows_at = _royalty_annual_cash_flows
+        recoup_base = gross * (1.0 - deal_pct)
+    else:  # DISTRIBUTION
+        cash_flows_at = _distribution_annual_cash_flows
+        recoup_base = gross
+
+    kinks = np.concatenate(([0.0], np.cumsum(recoup_base), [total_gross]))
+    kinks = kinks[kinks <= total_gross]
+
+    def npv_at_cost(cost: float) -> float:
+        actual_cf = cash_flows_at(gross, deal_pct, cost)
+        return _present_value(np.asarray(actual_cf), target_irr) - cost
+
+    return _cost_at_zero_npv(npv_at_cost, kinks)
+
+
 def compute_irr_recommendation(
     target_irr: float,
     weekly_gross_series: List[float],
@@ -609,7 +909,7 @@ def compute_irr_recommendation(
         (Conservative estimate - actual IRR will be higher due to recoupment)
 
     For Profit Split deals:
-        max_cost = Iteratively solved so that actual IRR = target
+        max_cost = Solved exactly so that actual IRR = target
         (Accounts for expense deduction reducing net profit)
 
     recoup_week = informational payback timing.
@@ -617,119 +917,19 @@ def compute_irr_recommendation(
     # For ALL deal types, find the investment where actual IRR = target IRR
     # Each deal type has different cash flow mechanics
 
-    if annual_gross is not None and deal_type is not None:
-        total_gross = sum(annual_gross)
-
-        # Binary search for the investment that gives exactly target IRR
-        cost_low = 0.0
-        cost_high = total_gross  # Safe upper limit
-        tolerance = 100.0  # $100 tolerance
-        max_cost = 0.0
-
-        for _ in range(100):
-            cost_mid = (cost_low + cost_high) / 2
-
-            if deal_type == DealType.ROYALTY:
-                # FUNDED ROYALTY: Label keeps 100% during recoup, then their share
-                # - Label's share (e.g., 80%) always goes to label
-                # - Artist's royalty (e.g., 20%) withheld during recoup
-                # - Recoupment happens at artist's royalty rate
-                artist_royalty_rate = 1.0 - deal_pct  # e.g., 20%
-                actual_cf = []
-                unrecouped = cost_mid
-                for gross_y in annual_gross:
-                    label_base = gross_y * deal_pct  # Label's share (80%)
-                    artist_royalty = gross_y * artist_royalty_rate  # Artist's share (20%)
-
-                    if unrecouped <= 0:
-                        # Recouped: Label gets their share only
-                        label_cf_y = label_base
-                    elif artist_royalty <= unrecouped:
-                        # Full artist royalty goes to recoup
-                        unrecouped -= artist_royalty
-                        label_cf_y = label_base + artist_royalty  # 100%
-                    else:
-                        # Mid-year recoup
-                        label_cf_y = label_base + unrecouped
-                        unrecouped = 0.0
-
-                    actual_cf.append(label_cf_y)
-
-            elif deal_type == DealType.PROFIT_SPLIT:
-                # PROFIT SPLIT: Expenses reduce gross to net, THEN recoup from net
-                # 1. Net = Gross - Expenses (allocated proportionally)
-                # 2. Label gets 100% of net until recouped
-                # 3. After recoup: Split net according to deal terms
-                actual_cf = []
-                unrecouped = cost_mid
-                for gross_y in annual_gross:
-                    expense_y = cost_mid * (gross_y / total_gross) if total_gross > 0 else 0
-                    net_y = max(0, gross_y - expense_y)
-
-                    if unrecouped <= 0:
-                        # Already recouped: Split net
-                        label_cf_y = net_y * deal_pct
-                    elif net_y <= unrecouped:
-                        # Full year's net goes to recoup
-                        unrecouped -= net_y
-                        label_cf_y = net_y
-                    else:
-                        # Mid-year recoup: take what's needed, split remainder
-                        recoup_portion = unrecouped
-                        remainder = net_y - unrecouped
-                        unrecouped = 0.0
-                        label_cf_y = recoup_portion + (remainder * deal_pct)
-
-                    actual_cf.append(label_cf_y)
-
-            else:  # DISTRIBUTION (Funded Distribution)
-                # FUNDED DISTRIBUTION: 100% of gross during recoup, then split%
-                # Handles mid-year recoupment properly
-                actual_cf = []
-                unrecouped = cost_mid
-                for gross_y in annual_gross:
-                    if unrecouped <= 0:
-                        # Already recouped: Split gross
-                        label_cf_y = gross_y * deal_pct
-                    elif gross_y <= unrecouped:
-                        # Full year goes to recoup
-                        unrecouped -= gross_y
-                        label_cf_y = gross_y
-                    else:
-                        # Mid-year recoup: take what's needed, split remainder
-                        recoup_portion = unrecouped
-                        remainder = gross_y - unrecouped
-                        unrecouped = 0.0
-                        label_cf_y = recoup_portion + (remainder * deal_pct)
-
-                    actual_cf.append(label_cf_y)
-
-            # Calculate IRR at this cost
-            test_irr = compute_annual_irr(cost_mid, actual_cf) if cost_mid > 0 else None
-
-            if test_irr is None:
-                # Can't achieve positive IRR, reduce cost
-                cost_high = cost_mid
-            elif test_irr > target_irr:
-                # IRR too high, can increase cost
-                cost_low = cost_mid
-                max_cost = cost_mid
-            else:
-                # IRR too low, reduce cost
-                cost_high = cost_mid
-
-            if cost_high - cost_low < tolerance:
-                break
-
-        # Use the found max_cost
-        max_cost = max_cost if max_cost > 0 else cost_low
+    if deal_type == DealType.PROFIT_SPLIT and annual_gross is not None:
+        # Cash flows are piecewise-linear in cost - solve exactly
+        max_cost = _profit_split_max_cost_for_irr(annual_gross, deal_pct, target_irr)
+    elif annual_gross is not None and deal_type is not None:
+        # Recoup waterfalls are piecewise-linear in cost too - solve exactly
+        max_cost = _recoup_max_cost_for_irr(annual_gross, deal_pct, target_irr, deal_type)
     else:
         # Fallback: use base cash flows (if no deal type info provided)
         max_cost = solve_max_cost_for_irr(target_irr, annual_cash_flows_base)
 
     # Recoup week at this cost (informational)
-    recoup_week = compute_recoup_week(
-        weekly_gross_series=weekly_gross_series,
+    recoup_week = _recoup_week(
+        _PaybackContext.from_series(weekly_gross_series),
         deal_pct=deal_pct,
         total_cost=max_cost,
         advance_share_pct=advance_share_pct,
@@ -738,10 +938,7 @@ def compute_irr_recommendation(
     )
 
     # NPV at 10% discount rate
-    npv_10 = 0.0
-    for year, cf in enumerate(annual_cash_flows_base, start=1):
-        npv_10 += cf / ((1 + 0.10) ** year)
-    npv_10 -= max_cost
+    npv_10 = _present_value(np.asarray(annual_cash_flows_base, dtype=float), 0.10) - max_cost
 
     return IRRRecommendation(
         target_irr=target_irr,
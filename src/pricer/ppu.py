@@ -4,11 +4,14 @@ PPU (Pay Per Unit) rates loader for country-level audio and video payouts.
 Parses the PPU Streams By Country Excel workbook to extract streaming rates.
 """
 
+import math
 import re
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Union
+from typing import Dict, Iterable, List, Optional, Union
 
+import numpy as np
 import pandas as pd
 
 
@@ -45,6 +48,9 @@ EXCLUDED_COUNTRIES = {
     "OTHERS",
 }
 
+# Currency symbols, thousands separators and whitespace stripped before parsing
+_CURRENCY_RE = re.compile(r"[$,\s]")
+
 
 @dataclass
 class CountryRate:
@@ -65,14 +71,15 @@ def parse_currency(value: str) -> float:
     Returns:
         Parsed float value
     """
+    # Numeric cells are the common case from read_excel
+    if isinstance(value, (int, float)):
+        return 0.0 if math.isnan(value) else float(value)
+
     if pd.isna(value):
         return 0.0
 
-    if isinstance(value, (int, float)):
-        return float(value)
-
     # Remove $ and whitespace, then parse
-    cleaned = re.sub(r"[$,\s]", "", str(value).strip())
+    cleaned = _CURRENCY_RE.sub("", str(value))
     if not cleaned:
         return 0.0
 
@@ -82,6 +89,20 @@ def parse_currency(value: str) -> float:
         return 0.0
 
 
+def _parse_currency_column(values: pd.Series) -> np.ndarray:
+    """Vectorized parse_currency over a column; unparseable cells become 0.0."""
+    cleaned = values.astype(str).str.replace(_CURRENCY_RE, "", regex=True)
+    parsed = pd.to_numeric(cleaned, errors="coerce")
+    return parsed.fillna(0.0).to_numpy(dtype=float)
+
+
+def _positive_mean(rates: List[float]) -> float:
+    """Mean of the strictly positive rates, or 0.0 if there are none."""
+    values = np.asarray(rates, dtype=float)
+    values = values[values > 0]
+    return float(values.mean()) if values.size else 0.0
+
+
 class PPULoader:
     """Loads and parses country streaming rates from PPU Excel workbook."""
 
@@ -89,16 +110,29 @@ class PPULoader:
         self.filepath = Path(filepath)
         self._df: Optional[pd.DataFrame] = None
         self._country_rates: Dict[str, CountryRate] = {}
+        self._aliases: Dict[str, str] = {}
+        self._avg_audio = 0.0
+        self._avg_video = 0.0
+        # Bounded per-instance memo of name -> canonical country (or None)
+        self._resolve_country = lru_cache(maxsize=512)(self._match_country)
         self._load()
 
     def _load(self) -> None:
         """Load the Excel file and parse country rates."""
         self._df = pd.read_excel(self.filepath, sheet_name=0, header=None)
         self._parse_rates()
-
-    def _is_valid_country_row(self, row_idx: int) -> bool:
+        self._aliases = {
+            alias: canonical
+            for alias, canonical in COUNTRY_ALIASES.items()
+            if canonical in self._country_rates
+        }
+        # Rates are fixed once loaded, so the fallback averages are too
+        self._avg_audio = _positive_mean([r.audio_rate for r in self._country_rates.values()])
+        self._avg_video = _positive_mean([r.video_rate for r in self._country_rates.values()])
+
+    def _valid_country_mask(self, regions: pd.Series, countries: pd.Series) -> np.ndarray:
         """
-        Check if a row represents a valid country (not a region total).
+        Flag rows that represent a valid country (not a region total).
 
         Filtering rules:
         - Skip header row (row 0)
@@ -106,54 +140,52 @@ class PPULoader:
         - Skip rows where Region contains "Total" and Country is nan
         - Skip rows in EXCLUDED_COUNTRIES set
         """
-        if row_idx == 0:
-            return False
-
-        region = self._df.iloc[row_idx, 0]
-        country = self._df.iloc[row_idx, 2]
-
-        # Skip if country is missing
-        if pd.isna(country) or str(country).strip() == "":
-            return False
-
-        country_str = str(country).strip().upper()
+        country_str = countries.astype(str).str.strip().str.upper()
+        valid = countries.notna() & (country_str != "")
 
         # Skip excluded countries (region names used as countries)
-        if country_str in EXCLUDED_COUNTRIES:
-            return False
+        valid &= ~country_str.isin(EXCLUDED_COUNTRIES)
 
-        # Skip region total rows
-        if pd.notna(region) and "Total" in str(region):
-            # But keep if it's the only entry for that country (like CANADA, UK, USA)
-            # Check if this row's country is meaningful
-            if country_str in {"CANADA", "UK", "USA", "ISRAEL"}:
-                return True
-            return False
+        # Skip region total rows, but keep the ones that are the only entry
+        # for that country (like CANADA, UK, USA)
+        is_total = regions.notna() & regions.astype(str).str.contains("Total", regex=False)
+        valid &= ~is_total | country_str.isin({"CANADA", "UK", "USA", "ISRAEL"})
 
-        return True
+        mask = valid.to_numpy(dtype=bool)
+        mask[:1] = False
+        return mask
 
     def _parse_rates(self) -> None:
         """Parse country rates from the dataframe."""
-        for row_idx in range(len(self._df)):
-            if not self._is_valid_country_row(row_idx):
-                continue
-
-            country = str(self._df.iloc[row_idx, 2]).strip().upper()
-            audio_rate = parse_currency(self._df.iloc[row_idx, 3])
-            video_rate = parse_currency(self._df.iloc[row_idx, 4])
-
-            # Skip rows with zero rates
-            if audio_rate > 0 or video_rate > 0:
-                self._country_rates[country] = CountryRate(
-                    country=country, audio_rate=audio_rate, video_rate=video_rate
-                )
+        df = self._df
+        if df.shape[1] < 5:
+            return
+
+        countries = df.iloc[:, 2]
+        mask = self._valid_country_mask(df.iloc[:, 0], countries)
+        names = countries.astype(str).str.strip().str.upper().to_numpy()
+        audio_rates = _parse_currency_column(df.iloc[:, 3])
+        video_rates = _parse_currency_column(df.iloc[:, 4])
+
+        # Skip rows with zero rates
+        keep = mask & ((audio_rates > 0) | (video_rates > 0))
+        for country, audio_rate, video_rate in zip(
+            names[keep], audio_rates[keep].tolist(), video_rates[keep].tolist()
+        ):
+            self._country_rates[country] = CountryRate(
+                country=country, audio_rate=audio_rate, video_rate=video_rate
+            )
 
     def list_countries(self) -> List[str]:
         """Return list of available countries."""
         return sorted(self._country_rates.keys())
 
-    def _normalize_country(self, country: str) -> str:
-        """Normalize country name using fuzzy matching."""
+    def _match_country(self, country: str) -> Optional[str]:
+        """
+        Resolve a country name using fuzzy matching, or None if unknown.
+
+        Called through the memoized self._resolve_country.
+        """
         country_upper = country.strip().upper()
         country_lower = country.strip().lower()
 
@@ -162,10 +194,9 @@ class PPULoader:
             return country_upper
 
         # Try alias match
-        if country_lower in COUNTRY_ALIASES:
-            alias = COUNTRY_ALIASES[country_lower]
-            if alias in self._country_rates:
-                return alias
+        alias = self._aliases.get(country_lower)
+        if alias is not None:
+            return alias
 
         # Try partial match
         for known_country in self._country_rates.keys():
@@ -177,9 +208,16 @@ class PPULoader:
             ):
                 return known_country
 
-        raise ValueError(
-            f"Unknown country: '{country}'. Use list_countries() to see available options."
-        )
+        return None
+
+    def _normalize_country(self, country: str) -> str:
+        """Normalize country name using fuzzy matching."""
+        normalized = self._resolve_country(country)
+        if normalized is None:
+            raise ValueError(
+                f"Unknown country: '{country}'. Use list_countries() to see available options."
+            )
+        return normalized
 
     def get_rate(self, country: str) -> CountryRate:
         """
@@ -198,6 +236,26 @@ class PPULoader:
         """Get audio rate for a country."""
         return self.get_rate(country).audio_rate
 
+    def get_audio_rates_bulk(self, countries: Iterable[str]) -> Dict[str, float]:
+        """
+        Get audio rates for several countries at once.
+
+        Unknown countries map to 0.0 instead of raising.
+
+        Args:
+            countries: Country names (supports fuzzy matching)
+
+        Returns:
+            {country: audio_rate} keyed by the names as given
+        """
+        rates = {}
+        for country in countries:
+            normalized = self._resolve_country(country)
+            rates[country] = (
+                self._country_rates[normalized].audio_rate if normalized is not None else 0.0
+            )
+        return rates
+
     def get_video_rate(self, country: str) -> float:
         """Get video rate for a country."""
         return self.get_rate(country).video_rate
@@ -207,20 +265,14 @@ class PPULoader:
         Calculate average audio rate across all valid countries.
         Used as fallback for 'rest of world' rate.
         """
-        rates = [r.audio_rate for r in self._country_rates.values() if r.audio_rate > 0]
-        if not rates:
-            return 0.0
-        return sum(rates) / len(rates)
+        return self._avg_audio
 
     def get_average_video_rate(self) -> float:
         """
         Calculate average video rate across all valid countries.
         Used as global video rate (no top-market split for video).
         """
-        rates = [r.video_rate for r in self._country_rates.values() if r.video_rate > 0]
-        if not rates:
-            return 0.0
-        return sum(rates) / len(rates)
+        return self._avg_video
 
     def compute_blended_audio_rate(
         self,
@@ -243,11 +295,13 @@ class PPULoader:
             raise ValueError(f"Market shares sum to {total_share}, must be <= 1.0")
 
         # Calculate weighted rate for specified markets
-        blended_rate = 0.0
-        for country, share in market_shares.items():
-            normalized = self._normalize_country(country)
-            rate = self._country_rates[normalized].audio_rate
-            blended_rate += share * rate
+        shares = np.fromiter(market_shares.values(), dtype=float, count=len(market_shares))
+        rates = np.fromiter(
+            (self.get_audio_rate(country) for country in market_shares),
+            dtype=float,
+            count=len(market_shares),
+        )
+        blended_rate = float(np.dot(shares, rates))
 
         # Add rest-of-world component
         rest_share = 1.0 - total_share
@@ -21,6 +21,7 @@ from .revenue_model import (
     RevenueModel,
     create_revenue_model,
 )
+from ._kernels import discount
 
 __version__ = "1.0.0"
 
@@ -39,4 +40,6 @@ __all__ = [
     # revenue_model.py
     "RevenueModel",
     "create_revenue_model",
+    # _kernels.py
+    "discount",
 ]
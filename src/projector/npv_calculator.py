@@ -5,6 +5,7 @@ This module calculates the present value of projected cash flows
 using time value of money principles.
 """
 
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Union
 
 import pandas as pd
@@ -16,6 +17,19 @@ except ImportError:
     npf = None
 
 
+def _geometric_factors(discount_rate: float, n: int) -> np.ndarray:
+    """1 / (1 + r)^t for t = 0..n-1 as a running product (one multiply per year, no pow)."""
+    factors = np.empty(n)
+    factors[:1] = 1.0
+    factors[1:] = 1.0 / (1.0 + discount_rate)
+    return np.cumprod(factors, out=factors)
+
+
+def _npv_kernel(rates: np.ndarray, cash_flows: np.ndarray, years: np.ndarray) -> np.ndarray:
+    """NPV of one cash flow series at each of several rates, via a (rates x years) discount grid."""
+    return np.power(1.0 + rates[:, None], -years[None, :]) @ cash_flows
+
+
 class NPVCalculator:
     """Calculator for Net Present Value of cash flows."""
 
@@ -27,6 +41,28 @@ class NPVCalculator:
             discount_rate: Annual discount rate (e.g., 0.10 for 10%)
         """
         self.discount_rate = discount_rate
+        # (1 + r)^-t for t = 0, 1, ..., grown on demand by _factors_for
+        self._factors = np.empty(0)
+        self._factors_rate = discount_rate
+
+    def _factors_for(self, n: int) -> np.ndarray:
+        """
+        Discount factors 1 / (1 + r)^t for t = 0..n-1 at this calculator's rate.
+
+        Sliced from a cached, read-only vector that is rebuilt only when a
+        longer horizon is requested or discount_rate has been changed.
+        """
+        if self._factors.size < n or self._factors_rate != self.discount_rate:
+            factors = _geometric_factors(self.discount_rate, max(n, 64))
+            factors.flags.writeable = False
+            self._factors, self._factors_rate = factors, self.discount_rate
+        return self._factors[:n]
+
+    def _discount_years(self, years: np.ndarray) -> np.ndarray:
+        """Discount factors for year numbers, from the cached vector when they're whole years."""
+        if years.size and np.issubdtype(years.dtype, np.integer) and years.min() >= 0:
+            return self._factors_for(int(years.max()) + 1)[years]
+        return np.power(1.0 + self.discount_rate, -years.astype(np.float64))
 
     def calculate_npv(self, cash_flows: Union[List[float], pd.Series]) -> float:
         """
@@ -38,16 +74,35 @@ class NPVCalculator:
         Returns:
             Net present value
         """
-        if isinstance(cash_flows, pd.Series):
-            cash_flows = cash_flows.tolist()
+        return calculate_npv(cash_flows, self.discount_rate)
 
-        npv = 0.0
-        for year, cash_flow in enumerate(cash_flows):
-            # Year 0 is not discounted, year 1 is discounted once, etc.
-            discount_factor = 1 / ((1 + self.discount_rate) ** year)
-            npv += cash_flow * discount_factor
+    def npv_batch(
+        self,
+        cash_flows: np.ndarray,
+        year_numbers: Optional[np.ndarray] = None,
+        dtype: Any = np.float64,
+    ) -> np.ndarray:
+        """
+        Calculate NPVs of many cash flow series sharing one horizon.
+
+        Args:
+            cash_flows: (K, N) array, one scenario per row
+            year_numbers: Year number of each of the N columns; defaults to
+                0..N-1 (year 0 is immediate), as in calculate_npv
+            dtype: Compute dtype. np.float32 halves memory traffic for large
+                Monte-Carlo sweeps at ~7 significant digits, which is plenty
+                for cent-rounded NPVs. The scalar methods (and IRR, whose
+                root-finding needs the extra precision) stay float64.
 
-        return npv
+        Returns:
+            (K,) array of NPVs, computed as one matrix-vector product
+        """
+        cf = np.asarray(cash_flows).astype(dtype, copy=False)
+        if year_numbers is None:
+            factors = self._factors_for(cf.shape[-1])
+        else:
+            factors = self._discount_years(np.asarray(year_numbers))
+        return cf @ factors.astype(dtype, copy=False)
 
     def calculate_discounted_cash_flows(
         self, cash_flow_df: pd.DataFrame, cash_flow_column: str = "net_artist_cash_flow"
@@ -62,16 +117,13 @@ class NPVCalculator:
         Returns:
             DataFrame with added discounted_cash_flow column
         """
-        df = cash_flow_df.copy()
-
-        # Calculate discount factor for each year (end-of-year convention)
+        # Discount each year (end-of-year convention)
         # Year 1 cash flow is discounted by (1+r)^1, Year 2 by (1+r)^2, etc.
-        df["discount_factor"] = 1 / ((1 + self.discount_rate) ** df["year_number"])
+        years = cash_flow_df["year_number"].to_numpy()
+        cf = cash_flow_df[cash_flow_column].to_numpy(dtype=np.float64)
+        discounted = cf * self._discount_years(years)
 
-        # Calculate discounted cash flow
-        df["discounted_cash_flow"] = df[cash_flow_column] * df["discount_factor"]
-
-        return df
+        return cash_flow_df.assign(discounted_cash_flow=discounted)
 
     def calculate_deal_npv(
         self, cash_flow_df: pd.DataFrame, artist_advance: float = 0.0
@@ -86,37 +138,35 @@ class NPVCalculator:
         Returns:
             Dictionary with NPV metrics including both royalties-only and incl-advance views
         """
-        # Add discounted cash flows
-        df = self.calculate_discounted_cash_flows(cash_flow_df)
+        # Discounted cash flows, as arrays (no intermediate frame)
+        years = cash_flow_df["year_number"].to_numpy()
+        artist_royalty_values = cash_flow_df["net_artist_cash_flow"].to_numpy(dtype=np.float64)
+        discounted = artist_royalty_values * self._discount_years(years)
 
         # ---- ROYALTIES ONLY (post-recoupment cash flow) ----
         # This is the existing logic: net_artist_cash_flow is $0 until recouped
-        total_undiscounted_royalties = df["net_artist_cash_flow"].sum()
-        total_npv_royalties = df["discounted_cash_flow"].sum()
-
-        # Calculate cumulative values for royalties
-        df["cumulative_undiscounted"] = df["net_artist_cash_flow"].cumsum()
-        df["cumulative_npv"] = df["discounted_cash_flow"].cumsum()
+        total_undiscounted_royalties = artist_royalty_values.sum()
+        total_npv_royalties = discounted.sum()
 
         # Find break-even year (first year with positive cumulative cash flow)
-        breakeven_years = df[df["cumulative_undiscounted"] > 0]
-        breakeven_year = breakeven_years["year_number"].min() if not breakeven_years.empty else None
+        positive = np.cumsum(artist_royalty_values) > 0
+        breakeven_year = years[positive].min() if positive.any() else None
 
         # ---- INCLUDING ADVANCE (actual cash to artist) ----
         # Artist cash flow series: Year 0 = +advance, Years 1-10 = net_artist_cash_flow
         # Note: recording + marketing costs are NOT paid to artist, only advance
-        artist_royalty_values = df["net_artist_cash_flow"].tolist()
-        artist_cashflows_incl_advance = [artist_advance] + artist_royalty_values
+        artist_cashflows_incl_advance = np.empty(artist_royalty_values.size + 1)
+        artist_cashflows_incl_advance[0] = artist_advance
+        artist_cashflows_incl_advance[1:] = artist_royalty_values
 
         # Calculate NPV including advance
         # Year 0 is not discounted, Year 1 discounted by (1+r)^1, etc.
-        artist_npv_incl_advance = 0.0
-        for t, cf in enumerate(artist_cashflows_incl_advance):
-            discount_factor = 1 / ((1 + self.discount_rate) ** t)
-            artist_npv_incl_advance += cf * discount_factor
+        artist_npv_incl_advance = float(
+            artist_cashflows_incl_advance @ self._factors_for(artist_cashflows_incl_advance.size)
+        )
 
         # Total undiscounted cash to artist including advance
-        artist_total_incl_advance = sum(artist_cashflows_incl_advance)
+        artist_total_incl_advance = float(artist_cashflows_incl_advance.sum())
 
         return {
             # Royalties only (post-recoupment)
@@ -129,10 +179,8 @@ class NPVCalculator:
             # Common metrics
             "discount_rate": self.discount_rate,
             "breakeven_year": int(breakeven_year) if breakeven_year else None,
-            "year_1_npv": df[df["year_number"] == 1]["discounted_cash_flow"].iloc[0]
-            if len(df) >= 1
-            else 0,
-            "years_projected": len(df),
+            "year_1_npv": discounted[np.flatnonzero(years == 1)[0]] if len(years) >= 1 else 0,
+            "years_projected": len(years),
         }
 
     def calculate_irr(self, cash_flows: List[float]) -> Optional[float]:
@@ -150,8 +198,8 @@ class NPVCalculator:
                 # Use numpy_financial's IRR function
                 irr = npf.irr(cash_flows)
             else:
-                # Fallback: use binary search for IRR
-                irr = self._irr_binary_search(cash_flows)
+                # Fallback: bracketed secant search for IRR
+                irr = self._irr_secant(cash_flows)
 
             # Check if IRR is valid
             if irr is None or np.isnan(irr) or np.isinf(irr):
@@ -160,31 +208,57 @@ class NPVCalculator:
         except Exception:
             return None
 
-    def _irr_binary_search(self, cash_flows: List[float], tolerance: float = 1e-6, max_iter: int = 100) -> Optional[float]:
-        """Binary search IRR implementation as fallback."""
+    def _irr_secant(
+        self, cash_flows: List[float], tolerance: float = 1e-6, max_iter: int = 100
+    ) -> Optional[float]:
+        """Bracketed secant (Illinois) IRR implementation as fallback."""
+        cf = np.asarray(cash_flows, dtype=np.float64)
+
         # Check if total is positive (possible positive IRR)
-        if sum(cash_flows) <= 0:
+        if cf.sum() <= 0:
             return None
 
-        r_low, r_high = -0.99, 5.0
+        periods = np.arange(cf.size, dtype=np.float64)
 
         def npv_at_rate(r: float) -> float:
-            total = 0.0
-            for t, cf in enumerate(cash_flows):
-                total += cf / ((1 + r) ** t)
-            return total
+            return float(cf @ np.power(1.0 + r, -periods))
+
+        # Coarse scan of [-0.99, 5.0] for the first rate where NPV turns non-positive
+        rates = np.linspace(-0.99, 5.0, 32)
+        npvs = np.power(1.0 + rates[:, None], -periods) @ cf
+        crossed = npvs <= 0
+        if not crossed.any():
+            return float(rates[-1])
+        i = int(np.argmax(crossed))
+        if i == 0:
+            return float(rates[0])
+
+        r_low, r_high = float(rates[i - 1]), float(rates[i])
+        npv_low, npv_high = float(npvs[i - 1]), float(npvs[i])
+        side = 0
 
         for _ in range(max_iter):
-            r_mid = (r_low + r_high) / 2
+            # Secant step between the bracket ends (npv_low > 0 >= npv_high)
+            r_mid = r_low - npv_low * (r_high - r_low) / (npv_high - npv_low)
             npv = npv_at_rate(r_mid)
 
             if abs(npv) < tolerance:
                 return r_mid
 
+            # Illinois: halve the stale end's NPV so the bracket keeps shrinking
             if npv > 0:
-                r_low = r_mid
+                r_low, npv_low = r_mid, npv
+                if side == 1:
+                    npv_high /= 2
+                side = 1
             else:
-                r_high = r_mid
+                r_high, npv_high = r_mid, npv
+                if side == -1:
+                    npv_low /= 2
+                side = -1
+
+            if r_high - r_low < 1e-12:
+                break
 
         return (r_low + r_high) / 2
 
@@ -210,33 +284,26 @@ class NPVCalculator:
             - label_irr: Internal Rate of Return on the investment
             - label_moic: Multiple on Invested Capital (total inflows / investment)
         """
-        df = cash_flow_df.copy()
-
         # Build cash flow series: Year 0 = -investment, Years 1-10 = label_share
         # This represents: label pays investment upfront, receives share each year
-        label_share_values = df["label_share"].tolist()
+        label_share_values = cash_flow_df["label_share"].to_numpy(dtype=np.float64)
 
         # Full cash flow series starting from Year 0
-        label_cashflows = [-label_investment] + label_share_values
+        label_cashflows = np.empty(label_share_values.size + 1)
+        label_cashflows[0] = -label_investment
+        label_cashflows[1:] = label_share_values
 
         # Calculate Label NPV: sum(cf_t / (1+r)^t) for t = 0, 1, ..., 10
-        label_npv = 0.0
-        for t, cf in enumerate(label_cashflows):
-            discount_factor = 1 / ((1 + self.discount_rate) ** t)
-            label_npv += cf * discount_factor
+        label_npv = float(label_cashflows @ self._factors_for(label_cashflows.size))
 
-        # Total undiscounted label cash flow (including Year 0 investment)
-        label_total_undiscounted = sum(label_cashflows)
+        # Cumulative starts from Year 0 investment; its last entry is the total
+        # undiscounted label cash flow (including Year 0 investment)
+        cumulative = np.cumsum(label_cashflows)
+        label_total_undiscounted = float(cumulative[-1])
 
         # Label Payback Year: first year t >= 1 where cumulative sum >= 0
-        # Cumulative starts from Year 0 investment
-        payback_year = None
-        cumulative = 0.0
-        for t, cf in enumerate(label_cashflows):
-            cumulative += cf
-            if t >= 1 and cumulative >= 0:
-                payback_year = t
-                break
+        paid_back = cumulative[1:] >= 0
+        payback_year = int(np.argmax(paid_back)) + 1 if paid_back.any() else None
 
         # Label IRR: calculate from the full cash flow series (Year 0 through Year 10)
         label_irr = self.calculate_irr(label_cashflows)
@@ -244,7 +311,7 @@ class NPVCalculator:
         # Label MOIC: total positive inflows / investment
         # Investment is the Year 0 outflow (label_investment)
         # Inflows are Years 1-10 label_share values
-        total_inflows = sum(max(0, cf) for cf in label_cashflows[1:])
+        total_inflows = float(label_share_values.clip(min=0).sum())
         label_moic = (total_inflows / label_investment) if label_investment > 0 else None
 
         return {
@@ -273,16 +340,14 @@ class NPVCalculator:
         Returns:
             DataFrame with NPV for each discount rate
         """
-        results = []
-
-        for rate in discount_rates:
-            calc = NPVCalculator(rate)
-            df_with_discount = calc.calculate_discounted_cash_flows(cash_flow_df, cash_flow_column)
-            npv = df_with_discount["discounted_cash_flow"].sum()
-
-            results.append({"discount_rate": rate, "npv": npv})
+        # One call over all rates - no calculator or discounted frame per rate
+        npvs = _npv_kernel(
+            np.asarray(discount_rates, dtype=np.float64),
+            cash_flow_df[cash_flow_column].to_numpy(dtype=np.float64),
+            cash_flow_df["year_number"].to_numpy(dtype=np.float64),
+        )
 
-        return pd.DataFrame(results)
+        return pd.DataFrame({"discount_rate": list(discount_rates), "npv": npvs})
 
     def compare_scenarios(
         self,
@@ -299,24 +364,27 @@ class NPVCalculator:
         Returns:
             DataFrame comparing NPV across scenarios
         """
-        results = []
-
-        for scenario_name, df in scenario_cash_flows.items():
-            df_with_discount = self.calculate_discounted_cash_flows(df, cash_flow_column)
-
-            total_npv = df_with_discount["discounted_cash_flow"].sum()
-            total_undiscounted = df[cash_flow_column].sum()
-
-            results.append(
-                {
-                    "scenario": scenario_name,
-                    "npv": total_npv,
-                    "total_undiscounted": total_undiscounted,
-                    "discount_applied": total_undiscounted - total_npv,
-                }
+        frames = list(scenario_cash_flows.values())
+        year_numbers = [df["year_number"].to_numpy() for df in frames]
+        cash_flows = [df[cash_flow_column].to_numpy(dtype=np.float64) for df in frames]
+
+        if year_numbers and all(np.array_equal(y, year_numbers[0]) for y in year_numbers[1:]):
+            # Same horizon everywhere: one (scenarios x years) matrix-vector product
+            npvs = self.npv_batch(np.stack(cash_flows), year_numbers[0])
+        else:
+            npvs = np.array(
+                [float(cf @ self._discount_years(y)) for cf, y in zip(cash_flows, year_numbers)]
             )
+        total_undiscounted = np.array([cf.sum() for cf in cash_flows])
 
-        return pd.DataFrame(results)
+        return pd.DataFrame(
+            {
+                "scenario": list(scenario_cash_flows.keys()),
+                "npv": npvs,
+                "total_undiscounted": total_undiscounted,
+                "discount_applied": total_undiscounted - npvs,
+            }
+        )
 
     def calculate_payback_period(
         self, cash_flow_df: pd.DataFrame, initial_investment: float
@@ -331,26 +399,22 @@ class NPVCalculator:
         Returns:
             Payback period in years, or None if never pays back
         """
-        df = cash_flow_df.copy()
-
         # Calculate cumulative cash flow
-        df["cumulative"] = df["net_artist_cash_flow"].cumsum()
+        cumulative = np.cumsum(cash_flow_df["net_artist_cash_flow"].to_numpy(dtype=np.float64))
 
         # Find where cumulative exceeds investment
-        payback_rows = df[df["cumulative"] >= initial_investment]
-
-        if payback_rows.empty:
+        paid_back = cumulative >= initial_investment
+        if not paid_back.any():
             return None
 
         # Get the first year where payback occurs
-        payback_year_idx = payback_rows.index[0]
-        payback_year = df.loc[payback_year_idx, "year_number"]
+        idx = int(np.argmax(paid_back))
+        payback_year = cash_flow_df["year_number"].iat[idx]
 
         # Interpolate for more precise payback period
-        if payback_year_idx > 0:
-            prev_cumulative = df.loc[payback_year_idx - 1, "cumulative"]
-            current_cumulative = df.loc[payback_year_idx, "cumulative"]
-            year_cash_flow = current_cumulative - prev_cumulative
+        if idx > 0:
+            prev_cumulative = cumulative[idx - 1]
+            year_cash_flow = cumulative[idx] - prev_cumulative
 
             # How much of the year's cash flow is needed?
             remaining = initial_investment - prev_cumulative
@@ -395,16 +459,26 @@ def create_npv_calculator(discount_rate: float) -> NPVCalculator:
     return NPVCalculator(discount_rate)
 
 
-def calculate_npv(cash_flows: List[float], discount_rate: float) -> float:
+@lru_cache(maxsize=128)
+def _npv_factors(discount_rate: float, n: int) -> np.ndarray:
+    """Read-only discount factors 1 / (1 + r)^t for t = 0..n-1, cached per (rate, n)."""
+    factors = _geometric_factors(discount_rate, n)
+    factors.flags.writeable = False
+    return factors
+
+
+def calculate_npv(cash_flows: Union[List[float], pd.Series], discount_rate: float) -> float:
     """
     Calculate NPV (convenience function).
 
     Args:
-        cash_flows: List of annual cash flows
+        cash_flows: List of annual cash flows (year 0 is immediate)
         discount_rate: Discount rate
 
     Returns:
         Net present value
     """
-    calculator = create_npv_calculator(discount_rate)
-    return calculator.calculate_npv(cash_flows)
+    cf = np.asarray(cash_flows, dtype=np.float64)
+
+    # Year 0 is not discounted, year 1 is discounted once, etc.
+    return float(cf @ _npv_factors(float(discount_rate), cf.size))
@@ -11,6 +11,8 @@ from enum import Enum
 import pandas as pd
 import numpy as np
 
+from ._kernels import recoup_waterfall
+
 
 class DealType(Enum):
     """Deal type enumeration."""
@@ -19,6 +21,27 @@ class DealType(Enum):
     DISTRIBUTION = "distribution"
 
 
+def _with_waterfall_columns(
+    annual_revenue_df: pd.DataFrame,
+    gross_revenue: np.ndarray,
+    copy: bool,
+    **columns: np.ndarray,
+) -> pd.DataFrame:
+    """Attach computed waterfall columns to the revenue frame in one step."""
+    if copy:
+        return annual_revenue_df.assign(**columns)
+
+    return pd.DataFrame(
+        {
+            "year_number": annual_revenue_df["year_number"].to_numpy(),
+            "gross_revenue": gross_revenue,
+            **columns,
+        },
+        index=annual_revenue_df.index,
+        copy=False,
+    )
+
+
 class RoyaltyDealModel:
     """
     Model for traditional royalty deal economics.
@@ -54,56 +77,49 @@ class RoyaltyDealModel:
         self.marketing_costs = marketing_costs
         self.total_recoupable = advance + recording_costs + marketing_costs
 
-    def calculate_cash_flow(self, annual_revenue_df: pd.DataFrame) -> pd.DataFrame:
+    def calculate_cash_flow(
+        self, annual_revenue_df: pd.DataFrame, copy: bool = True
+    ) -> pd.DataFrame:
         """
         Calculate year-by-year cash flow waterfall.
 
         Args:
             annual_revenue_df: DataFrame with 'year_number' and 'gross_revenue' columns
+            copy: Return the input's columns plus the waterfall. When False, return
+                only year_number, gross_revenue and the waterfall, sharing the
+                input's column buffers instead of copying the whole frame.
 
         Returns:
             DataFrame with complete cash flow waterfall including label metrics
         """
-        df = annual_revenue_df.copy()
+        gross_revenue = annual_revenue_df["gross_revenue"].to_numpy(dtype=np.float64)
 
         # Artist's royalty share
-        df["artist_royalty"] = df["gross_revenue"] * self.royalty_rate
+        artist_royalty = gross_revenue * self.royalty_rate
 
         # Label's share (revenue side)
-        df["label_share"] = df["gross_revenue"] - df["artist_royalty"]
-
-        # Label costs: paid at Year 0 (deal signing), so Years 1-10 have zero costs
-        # The Year 0 row with the investment is added in the display layer
-        df["label_costs"] = 0.0
-
-        # Label net cash flow for Years 1-10 = label_share (pure inflows)
-        df["label_net_cash_flow"] = df["label_share"]
-
-        # Calculate recoupment waterfall
-        recoupment_balance = self.total_recoupable
-        recoupment_balances = []
-        artist_cash_flows = []
-
-        for _, row in df.iterrows():
-            artist_royalty = row["artist_royalty"]
-
-            # Apply royalty to recoupment
-            if recoupment_balance > 0:
-                # Still recouping - pay any over-recoup in the same year
-                recoupment_payment = min(artist_royalty, recoupment_balance)
-                recoupment_balance -= recoupment_payment
-                artist_cash_flow = artist_royalty - recoupment_payment
-            else:
-                # Fully recouped - artist receives royalty
-                artist_cash_flow = artist_royalty
-
-            recoupment_balances.append(recoupment_balance)
-            artist_cash_flows.append(artist_cash_flow)
+        label_share = gross_revenue - artist_royalty
 
-        df["recoupment_balance"] = recoupment_balances
-        df["net_artist_cash_flow"] = artist_cash_flows
+        # Calculate recoupment waterfall - royalty is applied to recoupment,
+        # and any over-recoup is paid to the artist in the same year
+        recoupment_balances, artist_cash_flows = recoup_waterfall(
+            artist_royalty, float(self.total_recoupable)
+        )
 
-        return df
+        return _with_waterfall_columns(
+            annual_revenue_df,
+            gross_revenue,
+            copy,
+            artist_royalty=artist_royalty,
+            label_share=label_share,
+            # Label costs: paid at Year 0 (deal signing), so Years 1-10 have zero costs
+            # The Year 0 row with the investment is added in the display layer
+            label_costs=np.zeros_like(gross_revenue),
+            # Label net cash flow for Years 1-10 = label_share (pure inflows)
+            label_net_cash_flow=label_share.copy(),
+            recoupment_balance=recoupment_balances,
+            net_artist_cash_flow=artist_cash_flows,
+        )
 
     def get_summary(self, cash_flow_df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -164,59 +180,51 @@ class DistributionDealModel:
         self.marketing_funded = marketing_funded
         self.total_recoupable = advance + marketing_funded
 
-    def calculate_cash_flow(self, annual_revenue_df: pd.DataFrame) -> pd.DataFrame:
+    def calculate_cash_flow(
+        self, annual_revenue_df: pd.DataFrame, copy: bool = True
+    ) -> pd.DataFrame:
         """
         Calculate year-by-year cash flow waterfall.
 
         Args:
             annual_revenue_df: DataFrame with 'year_number' and 'gross_revenue' columns
+            copy: Return the input's columns plus the waterfall. When False, return
+                only year_number, gross_revenue and the waterfall, sharing the
+                input's column buffers instead of copying the whole frame.
 
         Returns:
             DataFrame with complete cash flow waterfall including label/distributor metrics
         """
-        df = annual_revenue_df.copy()
+        gross_revenue = annual_revenue_df["gross_revenue"].to_numpy(dtype=np.float64)
 
         # Distributor takes fee off the top
-        df["distributor_share"] = df["gross_revenue"] * self.distribution_fee
+        distributor_share = gross_revenue * self.distribution_fee
 
         # Artist's gross share (before recoupment)
-        df["artist_gross_share"] = df["gross_revenue"] - df["distributor_share"]
-
-        # For distribution deals, use distributor_share as the "label_share" equivalent
-        df["label_share"] = df["distributor_share"]
-
-        # Label/Distributor costs: paid at Year 0 (deal signing), so Years 1-10 have zero costs
-        # The Year 0 row with the investment is added in the display layer
-        df["label_costs"] = 0.0
-
-        # Label net cash flow for Years 1-10 = distributor_share (pure inflows)
-        df["label_net_cash_flow"] = df["label_share"]
-
-        # Calculate recoupment waterfall
-        recoupment_balance = self.total_recoupable
-        recoupment_balances = []
-        artist_cash_flows = []
+        artist_gross_share = gross_revenue - distributor_share
 
-        for _, row in df.iterrows():
-            artist_gross = row["artist_gross_share"]
-
-            # Apply to recoupment
-            if recoupment_balance > 0:
-                # Still recouping
-                recoupment_payment = min(artist_gross, recoupment_balance)
-                recoupment_balance -= recoupment_payment
-                artist_cash_flow = artist_gross - recoupment_payment
-            else:
-                # Fully recouped - artist receives full net share
-                artist_cash_flow = artist_gross
-
-            recoupment_balances.append(recoupment_balance)
-            artist_cash_flows.append(artist_cash_flow)
-
-        df["recoupment_balance"] = recoupment_balances
-        df["net_artist_cash_flow"] = artist_cash_flows
+        # Calculate recoupment waterfall - artist's gross share is applied to
+        # recoupment, then the artist receives the full net share
+        recoupment_balances, artist_cash_flows = recoup_waterfall(
+            artist_gross_share, float(self.total_recoupable)
+        )
 
-        return df
+        return _with_waterfall_columns(
+            annual_revenue_df,
+            gross_revenue,
+            copy,
+            distributor_share=distributor_share,
+            artist_gross_share=artist_gross_share,
+            # For distribution deals, use distributor_share as the "label_share" equivalent
+            label_share=distributor_share.copy(),
+            # Label/Distributor costs: paid at Year 0 (deal signing), so Years 1-10 have zero costs
+            # The Year 0 row with the investment is added in the display layer
+            label_costs=np.zeros_like(gross_revenue),
+            # Label net cash flow for Years 1-10 = distributor_share (pure inflows)
+            label_net_cash_flow=distributor_share.copy(),
+            recoupment_balance=recoupment_balances,
+            net_artist_cash_flow=artist_cash_flows,
+        )
 
     def get_summary(self, cash_flow_df: pd.DataFrame) -> Dict[str, Any]:
         """
@@ -290,6 +298,7 @@ def create_distribution_deal(
 def calculate_deal_cash_flow(
     deal_type: DealType,
     annual_revenue_df: pd.DataFrame,
+    copy: bool = True,
     **deal_params: Any,
 ) -> pd.DataFrame:
     """
@@ -298,6 +307,7 @@ def calculate_deal_cash_flow(
     Args:
         deal_type: Type of deal (ROYALTY or DISTRIBUTION)
         annual_revenue_df: Annual revenue projections
+        copy: Passed to calculate_cash_flow (False skips copying the input frame)
         **deal_params: Deal-specific parameters
 
     Returns:
@@ -317,4 +327,4 @@ def calculate_deal_cash_flow(
             marketing_funded=deal_params.get("marketing_funded", 0),
         )
 
-    return model.calculate_cash_flow(annual_revenue_df)
+    return model.calculate_cash_flow(annual_revenue_df, copy=copy)
@@ -10,6 +10,22 @@ from typing import Dict, Any, Optional
 import pandas as pd
 import numpy as np
 
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+from ._kernels import year_totals
+
+
+def _revenue_by_year(revenue_df: pd.DataFrame, column: str) -> pd.DataFrame:
+    """First gross_revenue per year_number, renamed to column."""
+    return (
+        revenue_df[["year_number", "gross_revenue"]]
+        .drop_duplicates("year_number")
+        .rename(columns={"gross_revenue": column})
+    )
+
 
 class RevenueModel:
     """Model for calculating revenue from streaming data."""
@@ -27,6 +43,15 @@ class RevenueModel:
         self.us_ppu_rate = us_ppu_rate if us_ppu_rate is not None else ppu_rate
         self.row_ppu_rate = row_ppu_rate if row_ppu_rate is not None else ppu_rate
 
+    def _region_rates(self, regions: pd.Series) -> np.ndarray:
+        """Per-row PPU rate: US rate for "US", ROW rate for any other region."""
+        return (
+            regions.map({"US": self.us_ppu_rate})
+            .astype(np.float64)
+            .fillna(self.row_ppu_rate)
+            .to_numpy()
+        )
+
     def calculate_revenue_from_streams(self, streams: float) -> float:
         """
         Calculate gross revenue from stream count.
@@ -39,86 +64,142 @@ class RevenueModel:
         """
         return streams * self.ppu_rate
 
-    def calculate_weekly_revenue(self, weekly_streams_df: pd.DataFrame) -> pd.DataFrame:
+    def calculate_weekly_revenue(
+        self, weekly_streams_df: pd.DataFrame, dtype: Any = np.float64
+    ) -> pd.DataFrame:
         """
         Calculate revenue for weekly streaming data.
 
         Args:
             weekly_streams_df: DataFrame with 'projected_streams' column, optionally 'region'
+            dtype: dtype of the gross_revenue column. np.float32 halves the
+                memory moved on large catalogs at ~7 significant digits;
+                deal pricing keeps the float64 default.
 
         Returns:
             DataFrame with added 'gross_revenue' column
         """
-        df = weekly_streams_df.copy()
+        streams = weekly_streams_df["projected_streams"].to_numpy(dtype=dtype)
 
         # Apply market-specific rates if region column exists
-        if 'region' in df.columns:
-            df["gross_revenue"] = df.apply(
-                lambda row: (
-                    row["projected_streams"] * self.us_ppu_rate if row["region"] == "US"
-                    else row["projected_streams"] * self.row_ppu_rate
-                ),
-                axis=1
-            )
+        if 'region' in weekly_streams_df.columns:
+            rates = self._region_rates(weekly_streams_df["region"]).astype(dtype, copy=False)
         else:
             # Fallback to blended rate
-            df["gross_revenue"] = df["projected_streams"] * self.ppu_rate
+            rates = np.dtype(dtype).type(self.ppu_rate)
 
-        return df
+        return weekly_streams_df.assign(gross_revenue=streams * rates)
 
-    def calculate_annual_revenue(self, annual_streams_df: pd.DataFrame) -> pd.DataFrame:
+    def calculate_annual_revenue(
+        self, annual_streams_df: pd.DataFrame, dtype: Any = np.float64
+    ) -> pd.DataFrame:
         """
         Calculate revenue for annual streaming data.
 
         Args:
             annual_streams_df: DataFrame with 'annual_streams' column
+            dtype: dtype of the gross_revenue column (see calculate_weekly_revenue)
 
         Returns:
             DataFrame with added 'gross_revenue' column
         """
-        df = annual_streams_df.copy()
-        df["gross_revenue"] = df["annual_streams"] * self.ppu_rate
-        return df
+        streams = annual_streams_df["annual_streams"].to_numpy(dtype=dtype)
+        return annual_streams_df.assign(gross_revenue=streams * np.dtype(dtype).type(self.ppu_rate))
+
+    def _aggregate_by_year(self, combined: pd.DataFrame) -> pd.DataFrame:
+        """Year totals of the combined track rows in one compiled pass (see _kernels.year_totals)."""
+        if 'region' in combined.columns:
+            # Rows without a region drop out, as they would from a groupby
+            combined = combined[combined["region"].notna()]
+            rates = self._region_rates(combined["region"])
+        else:
+            rates = np.full(len(combined), self.ppu_rate)
+
+        years = combined["year"].to_numpy()
+        if years.size == 0:
+            return pd.DataFrame(columns=["year", "total_streams", "gross_revenue"])
+
+        first_year = years.min()
+        stream_totals, revenue_totals, row_counts = year_totals(
+            (years - first_year).astype(np.int64),
+            combined["projected_streams"].to_numpy(dtype=np.float64),
+            rates,
+            int(years.max() - first_year) + 1,
+        )
+
+        # Only years that actually have rows
+        present = np.flatnonzero(row_counts)
+        return pd.DataFrame({
+            "year": (present + first_year).astype(years.dtype),
+            "total_streams": stream_totals[present],
+            "gross_revenue": revenue_totals[present],
+        })
+
+    def _aggregate_with_polars(self, combined: pd.DataFrame) -> pd.DataFrame:
+        """Year (and region) aggregation of the combined track rows on Polars' lazy engine."""
+        has_region = 'region' in combined.columns
+        columns = ["year", "projected_streams"] + (["region"] if has_region else [])
+        streams = pl.col("projected_streams")
+        lf = pl.from_pandas(combined[columns]).lazy()
+
+        if has_region:
+            lf = (
+                # pandas groupby drops rows without a region - match it
+                lf.filter(pl.col("region").is_not_null())
+                .group_by(["year", "region"])
+                .agg(streams.sum())
+                .with_columns(
+                    gross_revenue=pl.when(pl.col("region") == "US")
+                    .then(streams * self.us_ppu_rate)
+                    .otherwise(streams * self.row_ppu_rate)
+                )
+                .group_by("year")
+                .agg(total_streams=streams.sum(), gross_revenue=pl.col("gross_revenue").sum())
+            )
+        else:
+            lf = (
+                lf.group_by("year")
+                .agg(total_streams=streams.sum())
+                .with_columns(gross_revenue=pl.col("total_streams") * self.ppu_rate)
+            )
+
+        return lf.sort("year").collect().to_pandas()
 
     def aggregate_catalog_revenue(
-        self, track_projections: Dict[str, pd.DataFrame]
+        self, track_projections: Dict[str, pd.DataFrame], engine: str = "pandas"
     ) -> pd.DataFrame:
         """
         Aggregate revenue projections across multiple tracks.
 
         Args:
             track_projections: Dictionary mapping ISRC to DataFrame with projections
+            engine: "pandas", or "polars" to run the groupby on Polars' lazy
+                engine (requires the optional polars package)
 
         Returns:
             DataFrame with aggregated annual revenue by year
         """
+        if engine not in ("pandas", "polars"):
+            raise ValueError(f"Unknown aggregation engine: {engine}")
+        if engine == "polars" and pl is None:
+            raise ImportError("polars is required for engine='polars'")
+
+        weekly_frames = []
         all_annual = []
 
         for isrc, proj_df in track_projections.items():
             if "date" in proj_df.columns:
-                # Weekly data - aggregate to annual
-                df = proj_df.copy()
-                df["year"] = df["date"].dt.year
-
-                # Handle region-specific aggregation
-                if 'region' in df.columns:
-                    annual = (
-                        df.groupby(["year", "region"])
-                        .agg({"projected_streams": "sum"})
-                        .reset_index()
-                    )
-                else:
-                    annual = (
-                        df.groupby("year")
-                        .agg({"projected_streams": "sum"})
-                        .reset_index()
-                    )
-                annual["isrc"] = isrc
-                all_annual.append(annual)
+                # Weekly data - aggregated to annual below
+                weekly_frames.append(proj_df.assign(isrc=isrc))
             elif "year" in proj_df.columns:
                 # Already annual data
-                proj_df["isrc"] = isrc
-                all_annual.append(proj_df)
+                all_annual.append(proj_df.assign(isrc=isrc))
+
+        if weekly_frames:
+            # One vectorized year extraction over every weekly row
+            weekly = pd.concat(weekly_frames, ignore_index=True)
+            weekly["year"] = weekly["date"].dt.year
+            all_annual.insert(0, weekly)
 
         if not all_annual:
             return pd.DataFrame(columns=["year", "total_streams", "gross_revenue"])
@@ -126,37 +207,12 @@ class RevenueModel:
         # Combine all tracks
         combined = pd.concat(all_annual, ignore_index=True)
 
-        # Aggregate across all tracks by year (and region if present)
-        if 'region' in combined.columns:
-            aggregated = (
-                combined.groupby(["year", "region"])["projected_streams"]
-                .sum()
-                .reset_index()
-                .rename(columns={"projected_streams": "total_streams"})
-            )
-            # Calculate revenue with market-specific rates
-            aggregated["gross_revenue"] = aggregated.apply(
-                lambda row: (
-                    row["total_streams"] * self.us_ppu_rate if row["region"] == "US"
-                    else row["total_streams"] * self.row_ppu_rate
-                ),
-                axis=1
-            )
-            # Sum across regions for final aggregation
-            final_aggregated = (
-                aggregated.groupby("year")
-                .agg({"total_streams": "sum", "gross_revenue": "sum"})
-                .reset_index()
-            )
+        # Aggregate across all tracks (weekly rows included) by year, pricing
+        # each row by region if present
+        if engine == "polars":
+            final_aggregated = self._aggregate_with_polars(combined)
         else:
-            aggregated = (
-                combined.groupby("year")["projected_streams"]
-                .sum()
-                .reset_index()
-                .rename(columns={"projected_streams": "total_streams"})
-            )
-            aggregated["gross_revenue"] = aggregated["total_streams"] * self.ppu_rate
-            final_aggregated = aggregated
+            final_aggregated = self._aggregate_by_year(combined)
 
         # Add year number
         final_aggregated = final_aggregated.sort_values("year").reset_index(drop=True)
@@ -177,37 +233,20 @@ class RevenueModel:
         Returns:
             DataFrame with revenue broken down by source
         """
-        # Align years
-        all_years = sorted(
-            set(catalog_revenue["year_number"].tolist())
-            | set(new_release_revenue["year_number"].tolist())
-        )
-
-        breakdown = []
-        for year_num in all_years:
-            catalog_rev = 0
-            new_release_rev = 0
-
-            # Get catalog revenue for this year
-            catalog_row = catalog_revenue[catalog_revenue["year_number"] == year_num]
-            if not catalog_row.empty:
-                catalog_rev = catalog_row.iloc[0]["gross_revenue"]
-
-            # Get new release revenue for this year
-            new_release_row = new_release_revenue[new_release_revenue["year_number"] == year_num]
-            if not new_release_row.empty:
-                new_release_rev = new_release_row.iloc[0]["gross_revenue"]
-
-            breakdown.append(
-                {
-                    "year_number": year_num,
-                    "catalog_revenue": catalog_rev,
-                    "new_release_revenue": new_release_rev,
-                    "total_revenue": catalog_rev + new_release_rev,
-                }
+        # Align years (0 where a source has no row for that year)
+        breakdown = (
+            _revenue_by_year(catalog_revenue, "catalog_revenue")
+            .merge(
+                _revenue_by_year(new_release_revenue, "new_release_revenue"),
+                on="year_number",
+                how="outer",
             )
+            .fillna(0)
+            .sort_values("year_number", ignore_index=True)
+        )
+        breakdown["total_revenue"] = breakdown["catalog_revenue"] + breakdown["new_release_revenue"]
 
-        return pd.DataFrame(breakdown)
+        return breakdown
 
     def calculate_revenue_time_series(
         self, streams_time_series: pd.Series, annual: bool = True
@@ -244,26 +283,20 @@ class RevenueModel:
                 "peak_revenue": 0,
             }
 
-        total_revenue = annual_revenue_df["gross_revenue"].sum()
-        avg_annual = annual_revenue_df["gross_revenue"].mean()
+        revenue = annual_revenue_df.set_index("year_number")["gross_revenue"]
+        # The revenue column is dense - reduce the array directly
+        values = revenue.to_numpy()
+        total_revenue = float(values.sum())
+        avg_annual = float(values.mean())
 
         # Get specific years
-        year_1 = (
-            annual_revenue_df[annual_revenue_df["year_number"] == 1]["gross_revenue"].iloc[0]
-            if len(annual_revenue_df) >= 1
-            else 0
-        )
-
-        year_10 = (
-            annual_revenue_df[annual_revenue_df["year_number"] == 10]["gross_revenue"].iloc[0]
-            if len(annual_revenue_df) >= 10
-            else 0
-        )
+        year_1 = revenue.at[1] if 1 in revenue.index else 0
+        year_10 = revenue.at[10] if 10 in revenue.index else 0
 
         # Find peak
-        peak_idx = annual_revenue_df["gross_revenue"].idxmax()
-        peak_year = annual_revenue_df.loc[peak_idx, "year_number"]
-        peak_revenue = annual_revenue_df.loc[peak_idx, "gross_revenue"]
+        peak_pos = int(values.argmax())
+        peak_year = revenue.index[peak_pos]
+        peak_revenue = values[peak_pos]
 
         return {
             "total_revenue": total_revenue,
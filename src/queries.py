@@ -1,14 +1,40 @@
-"""SQL queries for Stock App."""
+"""SQL queries for Stock App.
 
-# Simple/fast query for summary view - includes all needed fields with calculated percentages
-ARTIST_SUMMARY_QUERY = """
-WITH spotify_current AS (
+Every query is a constant string, composed from the shared fragments below
+once at import. Per-call values (IDs, dates, lookbacks, search terms) are
+bound as :N parameters rather than formatted in, so nothing is rendered per
+call.
+"""
+
+# Artist IDs are bound as one JSON array parameter (:1, numeric style) rather
+# than interpolated, so the query text is identical across calls and Snowflake
+# reuses the compiled plan (and the result cache for repeated ID sets)
+ARTIST_ID_BIND = "SELECT value::NUMBER FROM TABLE(FLATTEN(INPUT => PARSE_JSON(:1)))"
+
+# The as-of date is computed by the caller and bound as :2 instead of calling
+# CURRENT_DATE/CURRENT_TIMESTAMP, which keeps same-day runs eligible for the
+# result cache and gives the date filters a constant to prune on
+AS_OF_DATE = "TO_DATE(:2)"
+
+# Time series lookback in months, bound as :3
+LOOKBACK_START = f"DATEADD('month', -:3, {AS_OF_DATE})"
+
+# Spotify IDs are bound like artist IDs, as one JSON array of strings (:1)
+SPOTIFY_ID_BIND = "SELECT value::STRING FROM TABLE(FLATTEN(INPUT => PARSE_JSON(:1)))"
+
+# 7-day growth of a social count: delta over the count a week ago
+INSTAGRAM_CHANGE = "DIV0(iam.follower_count_7_day_delta, NULLIF(iam.follower_count - iam.follower_count_7_day_delta, 0))"
+TIKTOK_CHANGE = "DIV0(tum.follower_count_7_day_delta, NULLIF(tum.follower_count - tum.follower_count_7_day_delta, 0))"
+
+# Latest and week-ago Spotify follower counts, shared by the summary and
+# metrics queries so both carry byte-identical CTE text
+SPOTIFY_FOLLOWER_CTES = f"""spotify_current AS (
     SELECT
         spotify_account_id,
         follower_count,
         date
     FROM sodatone.spotify_account_follower_count_interpolations
-    WHERE date >= CURRENT_DATE - 1
+    WHERE date >= {AS_OF_DATE} - 1
     QUALIFY ROW_NUMBER() OVER (PARTITION BY spotify_account_id ORDER BY date DESC) = 1
 ),
 spotify_week_ago AS (
@@ -17,9 +43,13 @@ spotify_week_ago AS (
         follower_count,
         date
     FROM sodatone.spotify_account_follower_count_interpolations
-    WHERE date BETWEEN CURRENT_DATE - 8 AND CURRENT_DATE - 6
+    WHERE date BETWEEN {AS_OF_DATE} - 8 AND {AS_OF_DATE} - 6
     QUALIFY ROW_NUMBER() OVER (PARTITION BY spotify_account_id ORDER BY date DESC) = 1
-)
+)"""
+
+# Simple/fast query for summary view - includes all needed fields with calculated percentages
+ARTIST_SUMMARY_QUERY = f"""
+WITH {SPOTIFY_FOLLOWER_CTES}
 SELECT
     a.id AS SODATONE_ID,
     a.name AS ARTIST_NAME,
@@ -31,9 +61,9 @@ SELECT
     COALESCE(sc.follower_count, sac.follower_count) AS SPOTIFY_FOLLOWERS,
     DIV0((sc.follower_count - sw.follower_count), NULLIF(sw.follower_count, 0)) AS SPOTIFY_CHANGE,
     iam.follower_count AS INSTAGRAM_FOLLOWERS,
-    DIV0(iam.follower_count_7_day_delta, NULLIF(iam.follower_count - iam.follower_count_7_day_delta, 0)) AS INSTAGRAM_CHANGE,
+    {INSTAGRAM_CHANGE} AS INSTAGRAM_CHANGE,
     tum.follower_count AS TIKTOK_FOLLOWERS,
-    DIV0(tum.follower_count_7_day_delta, NULLIF(tum.follower_count - tum.follower_count_7_day_delta, 0)) AS TIKTOK_CHANGE
+    {TIKTOK_CHANGE} AS TIKTOK_CHANGE
 FROM sodatone.artists a
 LEFT JOIN sodatone.spotify_accounts sac ON sac.artist_id = a.id
 LEFT JOIN spotify_current sc ON sc.spotify_account_id = sac.id
@@ -43,10 +73,10 @@ LEFT JOIN sodatone.tiktok_users tu ON tu.artist_id = a.id
 LEFT JOIN sodatone.tiktok_user_growth_metrics tum ON tum.tiktok_user_id = tu.id
 LEFT JOIN sodatone.instagram_accounts ia ON ia.artist_id = a.id
 LEFT JOIN sodatone.instagram_account_growth_metrics iam ON iam.instagram_account_id = ia.id
-WHERE a.id IN ({id_filter})
+WHERE a.id IN ({ARTIST_ID_BIND})
 """
 
-# Search for artists by name
+# Search for artists by name (substring match; the term is bound as :1, not interpolated)
 ARTIST_SEARCH_QUERY = """
 SELECT DISTINCT
     a.id AS SODATONE_ID,
@@ -56,42 +86,28 @@ SELECT DISTINCT
     a.cached_country AS LOCATION
 FROM sodatone.artists a
 LEFT JOIN sodatone.spotify_accounts sac ON sac.artist_id = a.id
-WHERE LOWER(a.name) LIKE LOWER('%{search_term}%')
+WHERE a.name ILIKE '%' || :1 || '%'
 LIMIT 20
 """
 
 # Get current metrics for tracked artists (simplified - matches Gregg Daily Update structure)
-ARTIST_METRICS_QUERY = """
+ARTIST_METRICS_QUERY = f"""
 WITH artist_subset AS (
-    SELECT * FROM sodatone.artists WHERE id IN ({id_filter})
-),
-spotify_current AS (
-    SELECT
-        spotify_account_id,
-        follower_count,
-        date
-    FROM sodatone.spotify_account_follower_count_interpolations
-    WHERE date >= CURRENT_DATE - 1
-    QUALIFY ROW_NUMBER() OVER (PARTITION BY spotify_account_id ORDER BY date DESC) = 1
-),
-spotify_week_ago AS (
-    SELECT
-        spotify_account_id,
-        follower_count,
-        date
-    FROM sodatone.spotify_account_follower_count_interpolations
-    WHERE date BETWEEN CURRENT_DATE - 8 AND CURRENT_DATE - 6
-    QUALIFY ROW_NUMBER() OVER (PARTITION BY spotify_account_id ORDER BY date DESC) = 1
+    SELECT * FROM sodatone.artists WHERE id IN ({ARTIST_ID_BIND})
 ),
+{SPOTIFY_FOLLOWER_CTES},
 main_luminate_data AS (
-    SELECT DISTINCT
-        spotify_accounts.id AS spotify_account_id,
+    SELECT
+        spotify_tracks.primary_spotify_account_id AS spotify_account_id,
         luminate_unified_song_spotify_tracks.unified_song_id
     FROM sodatone.luminate_unified_song_spotify_tracks
     INNER JOIN sodatone.spotify_tracks ON spotify_tracks.id = luminate_unified_song_spotify_tracks.spotify_track_id
-    INNER JOIN sodatone.spotify_albums ON spotify_albums.id = spotify_tracks.spotify_album_id
-    INNER JOIN sodatone.spotify_accounts ON spotify_accounts.id = spotify_tracks.primary_spotify_account_id
-    INNER JOIN artist_subset ON artist_subset.id = spotify_accounts.artist_id
+    WHERE spotify_tracks.primary_spotify_account_id IN (
+        SELECT spotify_accounts.id
+        FROM sodatone.spotify_accounts
+        INNER JOIN artist_subset ON artist_subset.id = spotify_accounts.artist_id
+    )
+    GROUP BY 1, 2
 ),
 complete_daily_luminate_data AS (
     SELECT
@@ -104,29 +120,18 @@ complete_daily_luminate_data AS (
         ON main_luminate_data.unified_song_id = history.unified_song_id
     GROUP BY spotify_account_id, date
 ),
-complete_last_day_luminate_data AS (
-    SELECT spotify_account_id, date, us_audio_streams, global_audio_streams
-    FROM complete_daily_luminate_data
-    WHERE date >= DATE_TRUNC('day', CURRENT_TIMESTAMP) - INTERVAL '3 day'
-    QUALIFY ROW_NUMBER() OVER (PARTITION BY spotify_account_id ORDER BY date DESC) = 1
-),
-complete_last_week_luminate_data AS (
-    SELECT
-        spotify_account_id,
-        COALESCE(SUM(us_audio_streams), 0) AS us_audio_streams,
-        COALESCE(SUM(global_audio_streams), 0) AS global_audio_streams
-    FROM complete_daily_luminate_data
-    WHERE date >= DATE_TRUNC('day', CURRENT_TIMESTAMP) - INTERVAL '9 days'
-    GROUP BY 1
-),
-complete_last_last_week_luminate_data AS (
+luminate_rollup AS (
+    -- Latest day (within 3 days), last week and the week before, in one pass
     SELECT
         spotify_account_id,
-        COALESCE(SUM(us_audio_streams), 0) AS us_audio_streams,
-        COALESCE(SUM(global_audio_streams), 0) AS global_audio_streams
+        MAX_BY(us_audio_streams, IFF(date >= {AS_OF_DATE} - 3, date, NULL)) AS day_us,
+        MAX_BY(global_audio_streams, IFF(date >= {AS_OF_DATE} - 3, date, NULL)) AS day_global,
+        SUM(IFF(date >= {AS_OF_DATE} - 9, us_audio_streams, NULL)) AS week_us,
+        SUM(IFF(date >= {AS_OF_DATE} - 9, global_audio_streams, NULL)) AS week_global,
+        SUM(IFF(date BETWEEN {AS_OF_DATE} - 16 AND {AS_OF_DATE} - 9, us_audio_streams, NULL)) AS last_week_us,
+        SUM(IFF(date BETWEEN {AS_OF_DATE} - 16 AND {AS_OF_DATE} - 9, global_audio_streams, NULL)) AS last_week_global
     FROM complete_daily_luminate_data
-    WHERE date BETWEEN DATE_TRUNC('day', CURRENT_TIMESTAMP) - INTERVAL '16 days'
-        AND DATE_TRUNC('day', CURRENT_TIMESTAMP) - INTERVAL '9 days'
+    WHERE date >= {AS_OF_DATE} - 16
     GROUP BY 1
 )
 SELECT
@@ -136,18 +141,18 @@ SELECT
     a.cached_country AS LOCATION,
     st.name AS TOP_TRACK_NAME,
     sac.spotify_id AS SPOTIFY_ID,
-    clwld.us_audio_streams AS WEEKLY_US_STREAMS,
-    DIV0((clwld.us_audio_streams - cllwld.us_audio_streams), cllwld.us_audio_streams) AS US_WOW_CHANGE,
-    cldld.us_audio_streams AS DAILY_US_STREAMS,
-    clwld.global_audio_streams AS WEEKLY_GLOBAL_STREAMS,
-    DIV0((clwld.global_audio_streams - cllwld.global_audio_streams), cllwld.global_audio_streams) AS GLOBAL_WOW_CHANGE,
-    cldld.global_audio_streams AS DAILY_GLOBAL_STREAMS,
+    lr.week_us AS WEEKLY_US_STREAMS,
+    DIV0((lr.week_us - lr.last_week_us), lr.last_week_us) AS US_WOW_CHANGE,
+    lr.day_us AS DAILY_US_STREAMS,
+    lr.week_global AS WEEKLY_GLOBAL_STREAMS,
+    DIV0((lr.week_global - lr.last_week_global), lr.last_week_global) AS GLOBAL_WOW_CHANGE,
+    lr.day_global AS DAILY_GLOBAL_STREAMS,
     COALESCE(sc.follower_count, sac.follower_count) AS SPOTIFY_FOLLOWERS,
     DIV0((sc.follower_count - sw.follower_count), NULLIF(sw.follower_count, 0)) AS SPOTIFY_CHANGE,
     iam.follower_count AS INSTAGRAM_FOLLOWERS,
-    DIV0(iam.follower_count_7_day_delta, NULLIF(iam.follower_count - iam.follower_count_7_day_delta, 0)) AS INSTAGRAM_CHANGE,
+    {INSTAGRAM_CHANGE} AS INSTAGRAM_CHANGE,
     tum.follower_count AS TIKTOK_FOLLOWERS,
-    DIV0(tum.follower_count_7_day_delta, NULLIF(tum.follower_count - tum.follower_count_7_day_delta, 0)) AS TIKTOK_CHANGE,
+    {TIKTOK_CHANGE} AS TIKTOK_CHANGE,
     tts.post_count AS TIKTOK_SOUND_CREATES,
     DIV0(ttsm.post_count_7_day_delta, NULLIF(tts.post_count - ttsm.post_count_7_day_delta, 0)) AS TIKTOK_SOUND_CHANGE
 FROM artist_subset a
@@ -156,9 +161,7 @@ LEFT JOIN spotify_current sc ON sc.spotify_account_id = sac.id
 LEFT JOIN spotify_week_ago sw ON sw.spotify_account_id = sac.id
 LEFT JOIN sodatone.spotify_tracks st ON st.primary_spotify_account_id = sac.id
 LEFT JOIN sodatone.spotify_albums sal ON sal.id = st.spotify_album_id
-LEFT JOIN complete_last_day_luminate_data cldld ON cldld.spotify_account_id = sac.id
-LEFT JOIN complete_last_week_luminate_data clwld ON clwld.spotify_account_id = sac.id
-LEFT JOIN complete_last_last_week_luminate_data cllwld ON cllwld.spotify_account_id = sac.id
+LEFT JOIN luminate_rollup lr ON lr.spotify_account_id = sac.id
 LEFT JOIN sodatone.tiktok_users tu ON tu.artist_id = a.id
 LEFT JOIN sodatone.tiktok_user_growth_metrics tum ON tum.tiktok_user_id = tu.id
 LEFT JOIN sodatone.instagram_accounts ia ON ia.artist_id = a.id
@@ -174,12 +177,12 @@ QUALIFY ROW_NUMBER() OVER (PARTITION BY a.id ORDER BY st.popularity DESC NULLS L
 """
 
 # Time series query for streaming data - DAILY granularity
-STREAMING_TIME_SERIES_QUERY = """
+STREAMING_TIME_SERIES_QUERY = f"""
 WITH artist_spotify AS (
     SELECT sac.id AS spotify_account_id
     FROM sodatone.artists a
     JOIN sodatone.spotify_accounts sac ON sac.artist_id = a.id
-    WHERE a.id IN ({id_filter})
+    WHERE a.id IN ({ARTIST_ID_BIND})
 ),
 main_luminate_data AS (
     SELECT DISTINCT
@@ -196,21 +199,23 @@ SELECT
     COALESCE(SUM(history.us_video_stream_count), 0) AS US_VIDEO_STREAMS
 FROM main_luminate_data mld
 JOIN sodatone.LUMINATE_DAILY_SONG_METRICS_HISTORY history ON mld.unified_song_id = history.unified_song_id
-WHERE history.date >= DATEADD('month', -{lookback_months}, CURRENT_DATE())
+WHERE history.date >= {LOOKBACK_START}
+    -- Repeat the song filter on history itself so micro-partitions are pruned before the join
+    AND history.unified_song_id IN (SELECT unified_song_id FROM main_luminate_data)
 GROUP BY 1
 ORDER BY 1
 """
 
 # Time series for social followers - DAILY granularity
-SOCIAL_TIME_SERIES_QUERY = """
+SOCIAL_TIME_SERIES_QUERY = f"""
 SELECT
     interp.date AS DATE,
     'spotify' AS PLATFORM,
     interp.follower_count AS FOLLOWERS
 FROM sodatone.spotify_account_follower_count_interpolations interp
 JOIN sodatone.spotify_accounts sac ON sac.id = interp.spotify_account_id
-WHERE sac.artist_id IN ({id_filter})
-    AND interp.date >= DATEADD('month', -{lookback_months}, CURRENT_DATE())
+WHERE sac.artist_id IN ({ARTIST_ID_BIND})
+    AND interp.date >= {LOOKBACK_START}
 
 UNION ALL
 
@@ -220,8 +225,8 @@ SELECT
     interp.follower_count AS FOLLOWERS
 FROM sodatone.instagram_account_follower_count_interpolations interp
 JOIN sodatone.instagram_accounts ia ON ia.id = interp.instagram_account_id
-WHERE ia.artist_id IN ({id_filter})
-    AND interp.date >= DATEADD('month', -{lookback_months}, CURRENT_DATE())
+WHERE ia.artist_id IN ({ARTIST_ID_BIND})
+    AND interp.date >= {LOOKBACK_START}
 
 UNION ALL
 
@@ -231,35 +236,35 @@ SELECT
     interp.follower_count AS FOLLOWERS
 FROM sodatone.tiktok_user_follower_count_interpolations interp
 JOIN sodatone.tiktok_users tu ON tu.id = interp.tiktok_user_id
-WHERE tu.artist_id IN ({id_filter})
-    AND interp.date >= DATEADD('month', -{lookback_months}, CURRENT_DATE())
+WHERE tu.artist_id IN ({ARTIST_ID_BIND})
+    AND interp.date >= {LOOKBACK_START}
 ORDER BY 1, 2
 """
 
 # Lookup Sodatone ID from Spotify ID
-SPOTIFY_TO_SODATONE_QUERY = """
+SPOTIFY_TO_SODATONE_QUERY = f"""
 SELECT
     a.id AS SODATONE_ID,
     a.name AS ARTIST_NAME,
     sac.spotify_id AS SPOTIFY_ID
 FROM sodatone.artists a
 JOIN sodatone.spotify_accounts sac ON sac.artist_id = a.id
-WHERE sac.spotify_id IN ({spotify_ids})
+WHERE sac.spotify_id IN ({SPOTIFY_ID_BIND})
 """
 
 # Get catalog track count for an artist
-CATALOG_TRACK_COUNT_QUERY = """
+CATALOG_TRACK_COUNT_QUERY = f"""
 SELECT
     COUNT(DISTINCT st.id) AS TRACK_COUNT
 FROM sodatone.artists a
 JOIN sodatone.spotify_accounts sac ON sac.artist_id = a.id
 JOIN sodatone.spotify_tracks st ON st.primary_spotify_account_id = sac.id
-WHERE a.id IN ({id_filter})
+WHERE a.id IN ({ARTIST_ID_BIND})
 """
 
 # Get track-level catalog data with release dates and current weekly streams
 # Used for individual track decay calculations in deal analysis
-TRACK_CATALOG_WITH_STREAMS_QUERY = """
+TRACK_CATALOG_WITH_STREAMS_QUERY = f"""
 WITH track_weekly_streams AS (
     SELECT
         st.id AS track_id,
@@ -270,9 +275,9 @@ WITH track_weekly_streams AS (
     INNER JOIN sodatone.luminate_unified_song_spotify_tracks lust ON lust.spotify_track_id = st.id
     INNER JOIN sodatone.LUMINATE_DAILY_SONG_METRICS_HISTORY h ON h.unified_song_id = lust.unified_song_id
     WHERE st.primary_spotify_account_id IN (
-        SELECT id FROM sodatone.spotify_accounts WHERE artist_id IN ({id_filter})
+        SELECT id FROM sodatone.spotify_accounts WHERE artist_id IN ({ARTIST_ID_BIND})
     )
-    AND h.date >= DATEADD('day', -7, CURRENT_DATE())
+    AND h.date >= {AS_OF_DATE} - 7
     GROUP BY st.id
 )
 SELECT
@@ -284,12 +289,12 @@ SELECT
     COALESCE(tws.weekly_us_audio_streams, 0) AS WEEKLY_US_AUDIO_STREAMS,
     COALESCE(tws.weekly_global_audio_streams, 0) AS WEEKLY_GLOBAL_AUDIO_STREAMS,
     COALESCE(tws.weekly_us_video_streams, 0) AS WEEKLY_US_VIDEO_STREAMS,
-    DATEDIFF('week', sa.release_date, CURRENT_DATE()) AS WEEKS_SINCE_RELEASE
+    DATEDIFF('week', sa.release_date, {AS_OF_DATE}) AS WEEKS_SINCE_RELEASE
 FROM sodatone.spotify_tracks st
 INNER JOIN sodatone.spotify_albums sa ON sa.id = st.spotify_album_id
 LEFT JOIN track_weekly_streams tws ON tws.track_id = st.id
 WHERE st.primary_spotify_account_id IN (
-    SELECT id FROM sodatone.spotify_accounts WHERE artist_id IN ({id_filter})
+    SELECT id FROM sodatone.spotify_accounts WHERE artist_id IN ({ARTIST_ID_BIND})
 )
 ORDER BY tws.weekly_us_audio_streams DESC NULLS LAST
 """
@@ -4,20 +4,34 @@ from __future__ import annotations
 
 import base64
 import hashlib
+import json
 import logging
+import math
+import numbers
 import os
+import threading
 import time
+from contextlib import contextmanager
+from datetime import date
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar, Union
 
 import jwt
+import numpy as np
+import pandas as pd
 import requests
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_exponential
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .config import settings
-from .models import ArtistMetrics, SocialStats, StreamingStats, TimeSeriesPoint, TrackedArtist, TrackData
+from .models import ArtistMetrics, SocialStats, StreamingStats, TimeSeriesPoint, TrackedArtist, TrackData, as_points
 from .queries import (
     ARTIST_METRICS_QUERY,
     ARTIST_SEARCH_QUERY,
@@ -33,9 +47,28 @@ logger = logging.getLogger(__name__)
 
 _DEFAULT_API_TIMEOUT_SECONDS = 60
 _DEFAULT_POLL_TIMEOUT_SECONDS = 120
-_DEFAULT_POLL_INTERVAL_SECONDS = 1.0
+# Poll quickly at first (most dashboard queries finish well under a second),
+# backing off geometrically to the old fixed 1s interval
+_INITIAL_POLL_INTERVAL_SECONDS = 0.05
+_MAX_POLL_INTERVAL_SECONDS = 1.0
+_POLL_BACKOFF_FACTOR = 1.5
 _JWT_LIFETIME_SECONDS = 55 * 60
 
+# (upper-cased column names, row tuples) for one statement's result set
+_ResultSet = Tuple[List[str], List[Tuple[Any, ...]]]
+
+_T = TypeVar("_T")
+
+# Sodatone artist IDs as ints or digit strings
+_ArtistIds = Iterable[Union[int, str]]
+
+# Streaming time series query columns -> DataFrame columns
+_STREAMING_COLUMNS = {
+    "US_STREAMS": "us_streams",
+    "GLOBAL_STREAMS": "global_streams",
+    "US_VIDEO_STREAMS": "us_video_streams",
+}
+
 
 class SnowflakeSqlApiError(RuntimeError):
     """Raised when Snowflake SQL API requests fail."""
@@ -46,249 +79,184 @@ class SnowflakeClient:
 
     def __init__(self) -> None:
         self._config = settings.snowflake
+        # Parsed key material, loaded lazily and reused
+        self._key_material: Optional[_KeyMaterial] = None
+        # One connector session (and SQL API HTTP session) per thread - Streamlit
+        # runs sessions on worker threads
+        self._local = threading.local()
 
     def search_artists(self, search_term: str) -> List[Dict[str, Any]]:
         """Search for artists by name."""
         if not search_term or len(search_term) < 2:
             return []
 
-        # Escape single quotes for SQL
-        safe_term = search_term.replace("'", "''")
-        sql = ARTIST_SEARCH_QUERY.format(search_term=safe_term)
-
         try:
-            rows = self._execute_statement(sql)
-            return rows
+            columns, rows = self._execute_statement(ARTIST_SEARCH_QUERY, (search_term,))
+            return [dict(zip(columns, row)) for row in rows]
         except Exception as e:
             logger.error("Artist search failed: %s", e)
             import traceback
             traceback.print_exc()
             raise  # Re-raise so UI can show the error
 
-    def get_artist_metrics(self, artist_ids: List[str], fast: bool = True) -> Dict[str, ArtistMetrics]:
+    def get_artist_metrics(self, artist_ids: _ArtistIds, fast: bool = True) -> Dict[str, ArtistMetrics]:
         """Fetch current metrics for the provided Sodatone artist IDs.
 
         Args:
             artist_ids: List of Sodatone artist IDs
             fast: If True, use simplified query for faster results (default)
         """
-        if not artist_ids:
-            return {}
-
         # Sanitize IDs (must be numeric)
-        safe_ids = [aid for aid in artist_ids if str(aid).isdigit()]
+        safe_ids = _normalize_ids(artist_ids)
         if not safe_ids:
             return {}
 
-        id_filter = ", ".join(safe_ids)
         # Use fast summary query by default, full query for detailed view
-        sql = ARTIST_SUMMARY_QUERY.format(id_filter=id_filter) if fast else ARTIST_METRICS_QUERY.format(id_filter=id_filter)
+        sql = ARTIST_SUMMARY_QUERY if fast else ARTIST_METRICS_QUERY
 
         try:
-            rows = self._execute_statement(sql)
+            result = self._execute_statement(sql, (_id_param(safe_ids), date.today().isoformat()))
         except Exception as e:
             logger.error("Failed to fetch artist metrics: %s", e)
             return {}
 
-        results: Dict[str, ArtistMetrics] = {}
-        for row in rows:
-            record = {k.upper(): v for k, v in row.items()}
-            sodatone_id = str(record.get("SODATONE_ID", ""))
-            if not sodatone_id:
-                continue
-
-            results[sodatone_id] = ArtistMetrics(
-                sodatone_id=sodatone_id,
-                name=record.get("ARTIST_NAME") or "",
-                artist_url=record.get("ARTIST_URL"),
-                top_track_name=record.get("TOP_TRACK_NAME"),
-                location=record.get("LOCATION"),
-                streaming=StreamingStats(
-                    weekly_us_streams=_safe_int(record.get("WEEKLY_US_STREAMS")),
-                    weekly_global_streams=_safe_int(record.get("WEEKLY_GLOBAL_STREAMS")),
-                    daily_us_streams=_safe_int(record.get("DAILY_US_STREAMS")),
-                    daily_global_streams=_safe_int(record.get("DAILY_GLOBAL_STREAMS")),
-                    us_wow_change=_safe_float(record.get("US_WOW_CHANGE")),
-                    global_wow_change=_safe_float(record.get("GLOBAL_WOW_CHANGE")),
-                ),
-                social=SocialStats(
-                    spotify_followers=_safe_int(record.get("SPOTIFY_FOLLOWERS")),
-                    spotify_followers_change=_safe_float(record.get("SPOTIFY_CHANGE")),
-                    instagram_followers=_safe_int(record.get("INSTAGRAM_FOLLOWERS")),
-                    instagram_followers_change=_safe_float(record.get("INSTAGRAM_CHANGE")),
-                    tiktok_followers=_safe_int(record.get("TIKTOK_FOLLOWERS")),
-                    tiktok_followers_change=_safe_float(record.get("TIKTOK_CHANGE")),
-                    tiktok_sound_creates=_safe_int(record.get("TIKTOK_SOUND_CREATES")),
-                    tiktok_sound_creates_change=_safe_float(record.get("TIKTOK_SOUND_CHANGE")),
-                ),
-            )
-
-        return results
+        return _parse_artist_metrics(result)
 
     def get_streaming_time_series(
-        self, artist_ids: List[str], lookback_months: int = 24
+        self, artist_ids: _ArtistIds, lookback_months: int = 24
     ) -> Dict[str, List[TimeSeriesPoint]]:
         """Fetch daily streaming time series for artists."""
-        if not artist_ids:
-            return {}
-
-        safe_ids = [aid for aid in artist_ids if str(aid).isdigit()]
+        safe_ids = _normalize_ids(artist_ids)
         if not safe_ids:
             return {}
 
-        id_filter = ", ".join(safe_ids)
-        sql = STREAMING_TIME_SERIES_QUERY.format(id_filter=id_filter, lookback_months=lookback_months)
-
         try:
-            rows = self._execute_statement(sql)
+            frame = self._fetch_streaming_frame(safe_ids, lookback_months)
         except Exception as e:
             logger.error("Failed to fetch streaming time series: %s", e)
             return {}
 
-        us_streams: List[TimeSeriesPoint] = []
-        global_streams: List[TimeSeriesPoint] = []
-        us_video_streams: List[TimeSeriesPoint] = []
+        return {name: as_points(dates, values) for name, (dates, values) in _streaming_arrays(frame).items()}
 
-        for row in rows:
-            record = {k.upper(): v for k, v in row.items()}
-            date_val = record.get("DATE")
-            if date_val:
-                from datetime import datetime
-                if isinstance(date_val, str):
-                    date_val = datetime.strptime(date_val[:10], "%Y-%m-%d").date()
-                us_streams.append(TimeSeriesPoint(date=date_val, value=_safe_float(record.get("US_STREAMS"))))
-                global_streams.append(TimeSeriesPoint(date=date_val, value=_safe_float(record.get("GLOBAL_STREAMS"))))
-                us_video_streams.append(TimeSeriesPoint(date=date_val, value=_safe_float(record.get("US_VIDEO_STREAMS"))))
-
-        return {
-            "us_streams": us_streams,
-            "global_streams": global_streams,
-            "us_video_streams": us_video_streams,
-        }
+    def get_streaming_time_series_arrays(
+        self, artist_ids: _ArtistIds, lookback_months: int = 24
+    ) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+        """Fetch daily streaming time series for artists as (dates, values) arrays.
+
+        Keys match get_streaming_time_series; dates are datetime64[D] (shared
+        by all series) and values float64. Empty arrays on failure.
+        """
+        return _streaming_arrays(self.get_streaming_time_series_df(artist_ids, lookback_months))
+
+    def get_streaming_time_series_df(self, artist_ids: _ArtistIds, lookback_months: int = 24) -> pd.DataFrame:
+        """Fetch daily streaming time series for artists as a DataFrame.
+
+        Columns: date (datetime64), us_streams, global_streams and
+        us_video_streams (float64, missing values as 0). Empty on failure.
+        """
+        safe_ids = _normalize_ids(artist_ids)
+        if safe_ids:
+            try:
+                return self._fetch_streaming_frame(safe_ids, lookback_months)
+            except Exception as e:
+                logger.error("Failed to fetch streaming time series: %s", e)
+
+        return _streaming_frame(pd.DataFrame())
+
+    def _fetch_streaming_frame(self, safe_ids: Tuple[str, ...], lookback_months: int) -> pd.DataFrame:
+        """Run the streaming time series query through Arrow and normalize it with pandas."""
+        params = _time_series_params(safe_ids, lookback_months)
+        return _streaming_frame(self._execute_frame(STREAMING_TIME_SERIES_QUERY, params))
 
     def get_social_time_series(
-        self, artist_ids: List[str], lookback_months: int = 24
+        self, artist_ids: _ArtistIds, lookback_months: int = 24
     ) -> Dict[str, List[TimeSeriesPoint]]:
         """Fetch daily social follower time series for artists."""
-        if not artist_ids:
-            return {}
-
-        safe_ids = [aid for aid in artist_ids if str(aid).isdigit()]
+        safe_ids = _normalize_ids(artist_ids)
         if not safe_ids:
             return {}
 
-        id_filter = ", ".join(safe_ids)
-        sql = SOCIAL_TIME_SERIES_QUERY.format(id_filter=id_filter, lookback_months=lookback_months)
-
         try:
-            rows = self._execute_statement(sql)
+            params = _time_series_params(safe_ids, lookback_months)
+            return self._execute_batches(SOCIAL_TIME_SERIES_QUERY, params, _social_time_series_from_batches)
         except Exception as e:
             logger.error("Failed to fetch social time series: %s", e)
             return {}
 
-        spotify: List[TimeSeriesPoint] = []
-        instagram: List[TimeSeriesPoint] = []
-        tiktok: List[TimeSeriesPoint] = []
-
-        for row in rows:
-            record = {k.upper(): v for k, v in row.items()}
-            date_val = record.get("DATE")
-            platform = (record.get("PLATFORM") or "").lower()
-            followers = _safe_float(record.get("FOLLOWERS"))
-
-            if date_val:
-                from datetime import datetime
-                if isinstance(date_val, str):
-                    date_val = datetime.strptime(date_val[:10], "%Y-%m-%d").date()
-                point = TimeSeriesPoint(date=date_val, value=followers)
-
-                if platform == "spotify":
-                    spotify.append(point)
-                elif platform == "instagram":
-                    instagram.append(point)
-                elif platform == "tiktok":
-                    tiktok.append(point)
-
-        return {
-            "spotify": spotify,
-            "instagram": instagram,
-            "tiktok": tiktok,
-        }
-
     def lookup_sodatone_ids(self, spotify_ids: List[str]) -> Dict[str, str]:
         """Lookup Sodatone IDs from Spotify IDs."""
         if not spotify_ids:
             return {}
 
-        # Quote and join Spotify IDs
-        quoted_ids = ", ".join(f"'{sid}'" for sid in spotify_ids if sid)
-        if not quoted_ids:
+        # Bound as a JSON array, so IDs need no quoting or escaping
+        safe_ids = [sid for sid in spotify_ids if sid]
+        if not safe_ids:
             return {}
 
-        sql = SPOTIFY_TO_SODATONE_QUERY.format(spotify_ids=quoted_ids)
-
         try:
-            rows = self._execute_statement(sql)
+            columns, rows = self._execute_statement(SPOTIFY_TO_SODATONE_QUERY, (_json_dumps(safe_ids),))
         except Exception as e:
             logger.error("Failed to lookup Sodatone IDs: %s", e)
             return {}
 
+        i_spotify, i_sodatone = columns.index("SPOTIFY_ID"), columns.index("SODATONE_ID")
         result: Dict[str, str] = {}
         for row in rows:
-            record = {k.upper(): v for k, v in row.items()}
-            spotify_id = record.get("SPOTIFY_ID")
-            sodatone_id = record.get("SODATONE_ID")
+            spotify_id = row[i_spotify]
+            sodatone_id = row[i_sodatone]
             if spotify_id and sodatone_id:
                 result[spotify_id] = str(sodatone_id)
 
         return result
 
-    def get_catalog_track_count(self, artist_id: str) -> int:
+    def get_catalog_track_count(self, artist_id: Union[int, str]) -> int:
         """Get the number of tracks in an artist's catalog."""
-        if not artist_id or not str(artist_id).isdigit():
+        safe_ids = _normalize_ids((artist_id,))
+        if not safe_ids:
             return 0
 
-        sql = CATALOG_TRACK_COUNT_QUERY.format(id_filter=artist_id)
-
         try:
-            rows = self._execute_statement(sql)
-            if rows:
-                record = {k.upper(): v for k, v in rows[0].items()}
-                return _safe_int(record.get("TRACK_COUNT"))
+            return _parse_track_count(self._execute_statement(CATALOG_TRACK_COUNT_QUERY, (_id_param(safe_ids),)))
         except Exception as e:
             logger.error("Failed to get catalog track count: %s", e)
 
         return 0
 
-    def get_track_catalog(self, artist_id: str) -> List[TrackData]:
+    def get_track_catalog(self, artist_id: Union[int, str]) -> List[TrackData]:
         """Get track-level catalog data with release dates and current streams.
 
         Returns list of TrackData objects with per-track streaming and age info
         for use in individual track decay calculations.
         """
-        if not artist_id or not str(artist_id).isdigit():
+        safe_ids = _normalize_ids((artist_id,))
+        if not safe_ids:
             return []
 
-        sql = TRACK_CATALOG_WITH_STREAMS_QUERY.format(id_filter=artist_id)
-
         try:
-            rows = self._execute_statement(sql)
+            params = (_id_param(safe_ids), date.today().isoformat())
+            columns, rows = self._execute_statement(TRACK_CATALOG_WITH_STREAMS_QUERY, params)
         except Exception as e:
             logger.error("Failed to get track catalog: %s", e)
             return []
 
+        (
+            i_track_id, i_track_name, i_album_name, i_release_date, i_popularity,
+            i_us_audio, i_global_audio, i_us_video, i_weeks,
+        ) = (columns.index(name) for name in (
+            "TRACK_ID", "TRACK_NAME", "ALBUM_NAME", "RELEASE_DATE", "SPOTIFY_POPULARITY",
+            "WEEKLY_US_AUDIO_STREAMS", "WEEKLY_GLOBAL_AUDIO_STREAMS", "WEEKLY_US_VIDEO_STREAMS",
+            "WEEKS_SINCE_RELEASE",
+        ))
+
         tracks: List[TrackData] = []
         for row in rows:
-            record = {k.upper(): v for k, v in row.items()}
-
             # Parse release date
             release_date = None
-            release_date_val = record.get("RELEASE_DATE")
+            release_date_val = row[i_release_date]
             if release_date_val:
-                from datetime import datetime
                 if isinstance(release_date_val, str):
                     try:
-                        release_date = datetime.strptime(release_date_val[:10], "%Y-%m-%d").date()
+                        release_date = date.fromisoformat(release_date_val[:10])
                     except ValueError:
                         pass
                 elif hasattr(release_date_val, 'date'):
@@ -297,15 +265,15 @@ class SnowflakeClient:
                     release_date = release_date_val
 
             tracks.append(TrackData(
-                track_id=str(record.get("TRACK_ID", "")),
-                track_name=record.get("TRACK_NAME") or "",
-                album_name=record.get("ALBUM_NAME"),
+                track_id=str(row[i_track_id]),
+                track_name=row[i_track_name] or "",
+                album_name=row[i_album_name],
                 release_date=release_date,
-                spotify_popularity=_safe_int(record.get("SPOTIFY_POPULARITY")),
-                weekly_us_audio_streams=_safe_int(record.get("WEEKLY_US_AUDIO_STREAMS")),
-                weekly_global_audio_streams=_safe_int(record.get("WEEKLY_GLOBAL_AUDIO_STREAMS")),
-                weekly_us_video_streams=_safe_int(record.get("WEEKLY_US_VIDEO_STREAMS")),
-                weeks_since_release=_safe_int(record.get("WEEKS_SINCE_RELEASE")),
+                spotify_popularity=_safe_int(row[i_popularity]),
+                weekly_us_audio_streams=_safe_int(row[i_us_audio]),
+                weekly_global_audio_streams=_safe_int(row[i_global_audio]),
+                weekly_us_video_streams=_safe_int(row[i_us_video]),
+                weeks_since_release=_safe_int(row[i_weeks]),
             ))
 
         return tracks
@@ -316,26 +284,30 @@ class SnowflakeClient:
         retry=retry_if_exception_type((Exception,)),
         reraise=True,
     )
-    def _execute_statement(self, statement: str) -> List[Dict[str, Any]]:
-        """Execute a SQL statement via Snowflake Python connector with key-pair auth."""
+    def _execute_statement(self, statement: str, params: Optional[Tuple[Any, ...]] = None) -> _ResultSet:
+        """Execute a SQL statement via Snowflake Python connector with key-pair auth.
+
+        params are bound server-side to the statement's :1, :2, ... placeholders.
+        """
         logger.info(
             "Executing Snowflake query (account=%s, user=%s)",
             self._config.connector_account_identifier or self._config.account,
             self._config.user,
         )
-        return self._execute_via_connector(statement)
+        return self._execute_via_connector(statement, params)
 
     def _poll_for_results(self, base_url: str, headers: Dict[str, str], statement_handle: str) -> List[Dict[str, Any]]:
         """Poll for async query results."""
         url = f"{base_url}/api/v2/statements/{statement_handle}"
         deadline = time.time() + _DEFAULT_POLL_TIMEOUT_SECONDS
+        interval = _INITIAL_POLL_INTERVAL_SECONDS
 
         while time.time() < deadline:
-            response = requests.get(url, headers=headers, timeout=_DEFAULT_API_TIMEOUT_SECONDS)
+            response = self._http_session().get(url, headers=headers, timeout=_DEFAULT_API_TIMEOUT_SECONDS)
             if response.status_code >= 400:
                 raise SnowflakeSqlApiError(f"Snowflake poll error ({response.status_code}): {response.text[:500]}")
 
-            body = response.json()
+            body = _json_loads(response.content)
             status = (body.get("statementStatus") or "").upper()
 
             if status in {"SUCCESS", "SUCCEEDED", "COMPLETE"} and "data" in body:
@@ -343,45 +315,142 @@ class SnowflakeClient:
             if status in {"FAILED", "CANCELED", "ABORTED"}:
                 raise SnowflakeSqlApiError(f"Statement failed ({status}): {body}")
 
-            time.sleep(_DEFAULT_POLL_INTERVAL_SECONDS)
+            time.sleep(interval)
+            interval = min(interval * _POLL_BACKOFF_FACTOR, _MAX_POLL_INTERVAL_SECONDS)
 
         raise SnowflakeSqlApiError(f"Timed out waiting for results (handle={statement_handle}).")
 
-    def _execute_via_connector(self, statement: str) -> List[Dict[str, Any]]:
-        """Fallback to Snowflake Python connector."""
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        retry=retry_if_exception_type((Exception,)),
+        reraise=True,
+    )
+    def _execute_frame(self, statement: str, params: Optional[Tuple[Any, ...]] = None) -> pd.DataFrame:
+        """Execute a SQL statement and fetch the result as a DataFrame via Arrow batches."""
+        logger.info(
+            "Executing Snowflake query (account=%s, user=%s)",
+            self._config.connector_account_identifier or self._config.account,
+            self._config.user,
+        )
+        with self._cursor() as cur:
+            cur.execute(statement, params)
+            return cur.fetch_pandas_all()
+
+    @retry(
+        stop=stop_after_attempt(3),
+        wait=wait_exponential(multiplier=1, min=1, max=10),
+        retry=retry_if_exception_type((Exception,)),
+        reraise=True,
+    )
+    def _execute_batches(
+        self,
+        statement: str,
+        params: Optional[Tuple[Any, ...]],
+        consume: Callable[[Iterator[pd.DataFrame]], _T],
+    ) -> _T:
+        """Execute a SQL statement and hand its Arrow result batches to consume.
+
+        Only one batch is materialized at a time. consume runs while the cursor
+        is open, so a retry re-runs the statement and starts consume afresh.
+        """
+        logger.info(
+            "Executing Snowflake query (account=%s, user=%s)",
+            self._config.connector_account_identifier or self._config.account,
+            self._config.user,
+        )
+        with self._cursor() as cur:
+            cur.execute(statement, params)
+            return consume(cur.fetch_pandas_batches())
+
+    def _execute_via_connector(self, statement: str, params: Optional[Tuple[Any, ...]] = None) -> _ResultSet:
+        """Run a statement on the Snowflake Python connector.
+
+        Rows come back as plain tuples; callers index them by column position
+        rather than building a dict per row.
+        """
+        with self._cursor() as cur:
+            cur.execute(statement, params)
+            return _fetch_result_set(cur)
+
+    @contextmanager
+    def _cursor(self) -> Iterator[Any]:
+        """Cursor on the calling thread's session, closed after use."""
         import snowflake.connector
 
-        private_key = self._load_private_key()
-        connector_account = self._config.connector_account_identifier or self._config.account
+        conn = self._get_connection()
+        try:
+            cur = conn.cursor()
+            try:
+                yield cur
+            finally:
+                cur.close()
+        except snowflake.connector.errors.Error:
+            # The session may have expired or dropped - reconnect on the retry
+            self._discard_connection()
+            raise
+
+    def _http_session(self) -> requests.Session:
+        """The calling thread's SQL API session, so polls reuse one keep-alive connection."""
+        session = getattr(self._local, "http_session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=4)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            self._local.http_session = session
+        return session
+
+    def _get_connection(self):
+        """Live connector session for the calling thread, connecting on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or conn.is_closed():
+            conn = self._connect()
+            self._local.conn = conn
+        return conn
+
+    def _discard_connection(self) -> None:
+        """Close and forget the calling thread's session."""
+        conn = getattr(self._local, "conn", None)
+        self._local.conn = None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
 
-        # Convert private key to DER bytes for newer snowflake-connector versions
-        private_key_bytes = private_key.private_bytes(
-            encoding=serialization.Encoding.DER,
-            format=serialization.PrivateFormat.PKCS8,
-            encryption_algorithm=serialization.NoEncryption(),
-        )
+    def _connect(self):
+        """Open a connector session with key-pair auth."""
+        import snowflake.connector
+
+        connector_account = self._config.connector_account_identifier or self._config.account
 
-        conn = snowflake.connector.connect(
+        return snowflake.connector.connect(
             account=connector_account,
             user=self._config.user,
             role=self._config.role,
             warehouse=self._config.warehouse,
             database=self._config.database,
             schema=self._config.schema,
-            private_key=private_key_bytes,
+            private_key=self._load_private_key_der(),
+            paramstyle="numeric",
         )
-        try:
-            cur = conn.cursor(snowflake.connector.DictCursor)
-            try:
-                cur.execute(statement)
-                rows = cur.fetchall()
-                return [dict(row) for row in rows]
-            finally:
-                cur.close()
-        finally:
-            conn.close()
+
+    def _load_private_key_der(self) -> bytes:
+        """Private key as PKCS8 DER bytes (what newer snowflake-connector versions expect)."""
+        return self._load_key_material().der
 
     def _load_private_key(self):
+        """The parsed RSA private key."""
+        return self._load_key_material().private_key
+
+    def _load_key_material(self) -> _KeyMaterial:
+        """Load the key material once and reuse it for the life of the client."""
+        if self._key_material is None:
+            self._key_material = self._read_private_key()
+        return self._key_material
+
+    def _read_private_key(self) -> _KeyMaterial:
         """Load RSA private key from environment variable or file.
 
         Supports (checked in order):
@@ -395,11 +464,7 @@ class SnowflakeClient:
             logger.info("Loading private key from SNOWFLAKE_PRIVATE_KEY_B64")
             try:
                 key_content = base64.b64decode(key_b64).decode("utf-8")
-                return serialization.load_pem_private_key(
-                    key_content.encode(),
-                    password=None,
-                    backend=default_backend(),
-                )
+                return _parse_private_key(key_content.encode())
             except Exception as e:
                 logger.error("Failed to decode base64 key: %s", e)
                 raise RuntimeError(f"Invalid base64 key: {e}")
@@ -410,11 +475,7 @@ class SnowflakeClient:
             logger.info("Loading private key from SNOWFLAKE_PRIVATE_KEY")
             key_content = key_content.replace("\\n", "\n")
             try:
-                return serialization.load_pem_private_key(
-                    key_content.encode(),
-                    password=None,
-                    backend=default_backend(),
-                )
+                return _parse_private_key(key_content.encode())
             except Exception as e:
                 logger.error("Failed to parse key: %s", e)
                 raise RuntimeError(f"Invalid key content: {e}")
@@ -432,22 +493,13 @@ class SnowflakeClient:
             raise RuntimeError(f"Private key file not found: {key_path}")
 
         with key_path.open("rb") as key_file:
-            return serialization.load_pem_private_key(
-                key_file.read(),
-                password=None,
-                backend=default_backend(),
-            )
+            return _parse_private_key(key_file.read())
 
     def _build_keypair_jwt(self) -> Tuple[str, str]:
         """Build a KEYPAIR_JWT for Snowflake SQL API authentication."""
-        private_key = self._load_private_key()
-
-        public_der = private_key.public_key().public_bytes(
-            encoding=serialization.Encoding.DER,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo,
-        )
-        fp = base64.b64encode(hashlib.sha256(public_der).digest()).decode("ascii")
-        fp_label = f"SHA256:{fp}"
+        key_material = self._load_key_material()
+        private_key = key_material.private_key
+        fp_label = key_material.fingerprint
 
         account_raw = (self._config.jwt_account_identifier or self._config.account).strip()
         account = _normalize_account_identifier(account_raw)
@@ -465,9 +517,229 @@ class SnowflakeClient:
         token = jwt.encode(payload, key=private_key, algorithm="RS256", headers={"typ": "JWT"})
         if isinstance(token, bytes):
             token = token.decode("utf-8")
+
         return token, fp_label
 
 
+def _fetch_result_set(cur) -> _ResultSet:
+    """Column names (upper-cased) and all rows of the cursor's current result set."""
+    columns = [col[0].upper() for col in cur.description or ()]
+    return columns, cur.fetchall()
+
+
+# (field, column, converter) for the generated ArtistMetrics factory; a
+# converter of None passes the value through
+_ARTIST_METRICS_FIELDS = (
+    ("artist_url", "ARTIST_URL", None),
+    ("top_track_name", "TOP_TRACK_NAME", None),
+    ("location", "LOCATION", None),
+)
+_STREAMING_STATS_FIELDS = (
+    ("weekly_us_streams", "WEEKLY_US_STREAMS", "_si"),
+    ("weekly_global_streams", "WEEKLY_GLOBAL_STREAMS", "_si"),
+    ("daily_us_streams", "DAILY_US_STREAMS", "_si"),
+    ("daily_global_streams", "DAILY_GLOBAL_STREAMS", "_si"),
+    ("us_wow_change", "US_WOW_CHANGE", "_sf"),
+    ("global_wow_change", "GLOBAL_WOW_CHANGE", "_sf"),
+)
+_SOCIAL_STATS_FIELDS = (
+    ("spotify_followers", "SPOTIFY_FOLLOWERS", "_si"),
+    ("spotify_followers_change", "SPOTIFY_CHANGE", "_sf"),
+    ("instagram_followers", "INSTAGRAM_FOLLOWERS", "_si"),
+    ("instagram_followers_change", "INSTAGRAM_CHANGE", "_sf"),
+    ("tiktok_followers", "TIKTOK_FOLLOWERS", "_si"),
+    ("tiktok_followers_change", "TIKTOK_CHANGE", "_sf"),
+    ("tiktok_sound_creates", "TIKTOK_SOUND_CREATES", "_si"),
+    ("tiktok_sound_creates_change", "TIKTOK_SOUND_CHANGE", "_sf"),
+)
+# What the converters return for a column the query does not select
+_MISSING_COLUMN_VALUES = {None: "None", "_si": "0", "_sf": "0.0"}
+
+
+@lru_cache(maxsize=8)
+def _artist_metrics_factory(columns: Tuple[str, ...]) -> Callable[[Tuple[Any, ...], str], ArtistMetrics]:
+    """Generate make(row, sodatone_id) -> ArtistMetrics for one column layout.
+
+    The summary and full metrics queries select different columns, so the
+    factory is compiled once per layout with every column access resolved to
+    a tuple index and the converters bound as defaults (fast locals).
+    """
+    index = {name: i for i, name in enumerate(columns)}
+
+    def kwargs(fields) -> str:
+        parts = []
+        for field_name, column, convert in fields:
+            if column not in index:
+                value = _MISSING_COLUMN_VALUES[convert]
+            elif convert is None:
+                value = f"row[{index[column]}]"
+            else:
+                value = f"{convert}(row[{index[column]}])"
+            parts.append(f"{field_name}={value}")
+        return ", ".join(parts)
+
+    name = f'row[{index["ARTIST_NAME"]}] or ""' if "ARTIST_NAME" in index else '""'
+    src = (
+        "def make(row, sodatone_id, ArtistMetrics=ArtistMetrics, StreamingStats=StreamingStats,"
+        " SocialStats=SocialStats, _si=_safe_int, _sf=_safe_float):\n"
+        f"    return ArtistMetrics(sodatone_id=sodatone_id, name={name},"
+        f" {kwargs(_ARTIST_METRICS_FIELDS)},"
+        f" streaming=StreamingStats({kwargs(_STREAMING_STATS_FIELDS)}),"
+        f" social=SocialStats({kwargs(_SOCIAL_STATS_FIELDS)}))\n"
+    )
+    namespace = {
+        "ArtistMetrics": ArtistMetrics,
+        "StreamingStats": StreamingStats,
+        "SocialStats": SocialStats,
+        "_safe_int": _safe_int,
+        "_safe_float": _safe_float,
+    }
+    exec(compile(src, "<artist_metrics_factory>", "exec"), namespace)
+    return namespace["make"]
+
+
+def _parse_artist_metrics(result: _ResultSet) -> Dict[str, ArtistMetrics]:
+    """Build ArtistMetrics keyed by Sodatone ID from summary/metrics query rows."""
+    columns, rows = result
+    if "SODATONE_ID" not in columns:
+        return {}
+
+    i_id = columns.index("SODATONE_ID")
+    make = _artist_metrics_factory(tuple(columns))
+    results: Dict[str, ArtistMetrics] = {}
+    for row in rows:
+        sodatone_id = str(row[i_id])
+        if sodatone_id:
+            results[sodatone_id] = make(row, sodatone_id)
+
+    return results
+
+
+def _social_time_series_from_batches(batches: Iterable[pd.DataFrame]) -> Dict[str, List[TimeSeriesPoint]]:
+    """Split social time series batches into per-platform follower series, one batch at a time.
+
+    Rows without a date are skipped, missing follower counts become 0 and
+    row order is kept.
+    """
+    series: Dict[str, List[TimeSeriesPoint]] = {"spotify": [], "instagram": [], "tiktok": []}
+
+    for batch in batches:
+        # An empty result can come back as a frame without columns
+        if batch.empty:
+            continue
+        batch = batch.rename(columns=str.upper)
+        dates = pd.to_datetime(batch["DATE"])
+        platforms = batch["PLATFORM"].fillna("").str.lower()
+        followers = pd.to_numeric(batch["FOLLOWERS"], errors="coerce").fillna(0.0)
+        has_date = dates.notna()
+
+        for platform, points in series.items():
+            mask = (has_date & (platforms == platform)).to_numpy()
+            if mask.any():
+                points.extend(
+                    TimeSeriesPoint(date=d, value=v)
+                    for d, v in zip(dates[mask].dt.date.tolist(), followers[mask].astype("float64").tolist())
+                )
+
+    return series
+
+
+def _streaming_frame(raw: pd.DataFrame) -> pd.DataFrame:
+    """Normalize a raw streaming time series result: parsed dates, numeric streams with 0 for missing."""
+    # fetch_pandas_all can return a frame without columns for an empty result
+    raw = raw.rename(columns=str.upper).reindex(columns=["DATE", *_STREAMING_COLUMNS])
+    dates = pd.to_datetime(raw["DATE"])
+    keep = dates.notna().to_numpy()
+
+    frame = pd.DataFrame({"date": dates.to_numpy()[keep]})
+    for column, name in _STREAMING_COLUMNS.items():
+        values = pd.to_numeric(raw[column], errors="coerce").fillna(0.0)
+        frame[name] = values.to_numpy(dtype="float64")[keep]
+    return frame
+
+
+def _streaming_arrays(frame: pd.DataFrame) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Split a normalized streaming frame into per-series (dates, values) arrays."""
+    dates = frame["date"].to_numpy(dtype="datetime64[D]")
+    return {name: (dates, frame[name].to_numpy()) for name in _STREAMING_COLUMNS.values()}
+
+
+def _parse_track_count(result: _ResultSet) -> int:
+    """TRACK_COUNT from the catalog track count query (0 if no row)."""
+    columns, rows = result
+    if not rows:
+        return 0
+    return _safe_int(rows[0][columns.index("TRACK_COUNT")])
+
+
+class _KeyMaterial(NamedTuple):
+    """A parsed private key plus the encodings derived from it."""
+
+    private_key: Any
+    der: bytes  # PKCS8 DER, for the connector
+    fingerprint: str  # "SHA256:<base64>" of the public key, for the JWT issuer
+
+
+@lru_cache(maxsize=4)
+def _parse_private_key(pem: bytes) -> _KeyMaterial:
+    """Parse a PEM private key and derive its DER bytes and public key fingerprint.
+
+    Cached by PEM content, so every client (and every reload of the same
+    key from the environment or disk) shares one parse.
+    """
+    private_key = serialization.load_pem_private_key(pem, password=None, backend=default_backend())
+    der = private_key.private_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    public_der = private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    )
+    fp = base64.b64encode(hashlib.sha256(public_der).digest()).decode("ascii")
+    return _KeyMaterial(private_key, der, f"SHA256:{fp}")
+
+
+def _is_numeric_id(artist_id: Any) -> bool:
+    """True for a non-negative integer (not bool) or anything whose str() is ASCII digits."""
+    if isinstance(artist_id, numbers.Integral) and not isinstance(artist_id, bool):
+        return artist_id >= 0
+    text = str(artist_id)
+    # isdecimal + isascii rather than isdigit, which also passes e.g. "²" that int() rejects
+    return text.isdecimal() and text.isascii()
+
+
+def _normalize_ids(artist_ids: _ArtistIds) -> Tuple[str, ...]:
+    """Validate artist IDs once, keeping the numeric ones as strings for the SQL text."""
+    return tuple(str(aid) for aid in artist_ids if _is_numeric_id(aid))
+
+
+@lru_cache(maxsize=256)
+def _id_param(safe_ids: Tuple[str, ...]) -> str:
+    """JSON array bind for ARTIST_ID_BIND, cached per ID tuple."""
+    return _json_dumps([int(aid) for aid in safe_ids])
+
+
+def _time_series_params(safe_ids: Tuple[str, ...], lookback_months: int) -> Tuple[str, str, int]:
+    """Binds for the time series queries: ID array (:1), as-of date (:2), lookback months (:3)."""
+    return _id_param(safe_ids), date.today().isoformat(), int(lookback_months)
+
+
+def _json_loads(content: bytes) -> Any:
+    """Decode a JSON response body, with orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _json_dumps(value: Any) -> str:
+    """Encode a JSON bind parameter, with orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value)
+
+
 def _normalize_account_identifier(account: str) -> str:
     """Normalize account identifier for JWT."""
     normalized = account.strip()
@@ -490,20 +762,23 @@ def _parse_sql_api_result(body: Dict[str, Any]) -> List[Dict[str, Any]]:
     """Parse SQL API response into list of dicts."""
     meta = body.get("resultSetMetaData") or {}
     row_types = meta.get("rowType") or []
-    columns = [col.get("name") for col in row_types]
+    # Upper-case the names once; zip pairs them with each row (stopping at the shorter)
+    columns = [str(col.get("name")).upper() for col in row_types]
     data = body.get("data") or []
 
-    results: List[Dict[str, Any]] = []
-    for row in data:
-        record = {str(columns[i]).upper(): row[i] for i in range(min(len(columns), len(row)))}
-        results.append(record)
-    return results
+    return [dict(zip(columns, row)) for row in data]
 
 
 def _safe_int(value: Any) -> int:
     """Safely convert value to int."""
     if value is None:
         return 0
+    # Fast paths for what the connector usually returns
+    value_type = type(value)
+    if value_type is int:
+        return value
+    if value_type is float:
+        return int(value) if math.isfinite(value) else 0
     try:
         return int(float(value))
     except (ValueError, TypeError):
@@ -514,6 +789,8 @@ def _safe_float(value: Any) -> float:
     """Safely convert value to float."""
     if value is None:
         return 0.0
+    if type(value) is float:
+        return value
     try:
         return float(value)
     except (ValueError, TypeError):
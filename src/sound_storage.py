@@ -1,17 +1,22 @@
-"""Storage for tracked TikTok sounds using PostgreSQL with session state cache."""
+"""Storage for tracked TikTok sounds using PostgreSQL with session state cache.
+
+Without a configured database (no DATABASE_URL) sounds live in session
+state only, and the database calls are skipped rather than failed.
+"""
 
 from __future__ import annotations
 
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional, Set
 
 import streamlit as st
 
 from .models import TrackedSound
 from .db import (
+    is_configured as db_is_configured,
     load_tracked_sounds_db,
-    add_tracked_sound_db,
+    add_tracked_sounds_db,
     remove_tracked_sound_db,
 )
 
@@ -20,48 +25,63 @@ logger = logging.getLogger(__name__)
 # Session state keys
 TRACKED_SOUNDS_KEY = "tracked_sounds_list"
 SOUNDS_LOADED_KEY = "tracked_sounds_loaded_from_db"
+TRACKED_SOUND_IDS_KEY = "tracked_sound_ids"
 
 
 def _sync_session_state(sounds: List[TrackedSound]) -> None:
-    """Sync sounds to session state cache."""
-    data = []
-    for sound in sounds:
-        data.append({
-            "sound_id": sound.sound_id,
-            "name": sound.name,
-            "artist_name": sound.artist_name,
-            "tiktok_url": sound.tiktok_url,
-            "added_at": sound.added_at,
-        })
-    st.session_state[TRACKED_SOUNDS_KEY] = data
+    """Replace the session state cache wholesale (after a database load).
 
+    The TrackedSound objects themselves are cached, so reads don't rebuild them.
+    """
+    st.session_state[TRACKED_SOUNDS_KEY] = list(sounds)
+    st.session_state[TRACKED_SOUND_IDS_KEY] = {sound.sound_id for sound in sounds}
 
-def load_tracked_sounds() -> List[TrackedSound]:
-    """Load tracked sounds from database (with session state cache)."""
+
+def _sync_append(new_sounds: List[TrackedSound]) -> None:
+    """Append newly tracked sounds to the session state cache in place."""
+    cached = _cached_sounds()
+    cached.extend(new_sounds)
+    _tracked_sound_ids().update(sound.sound_id for sound in new_sounds)
+
+
+def _sync_remove(sound_id: str) -> None:
+    """Drop one sound from the session state cache in place."""
+    cached = _cached_sounds()
+    index = next((i for i, sound in enumerate(cached) if sound.sound_id == sound_id), None)
+    if index is not None:
+        cached.pop(index)
+    _tracked_sound_ids().discard(sound_id)
+
+
+def _tracked_sound_ids() -> Set[str]:
+    """Set of tracked sound IDs for O(1) membership checks (loads sounds on first use)."""
+    ids = st.session_state.get(TRACKED_SOUND_IDS_KEY)
+    if ids is None:
+        ids = {sound.sound_id for sound in _cached_sounds()}
+        st.session_state[TRACKED_SOUND_IDS_KEY] = ids
+    return ids
+
+
+def _cached_sounds() -> List[TrackedSound]:
+    """The cached sounds list itself (loaded from the database on first use)."""
     # On first load of session, fetch from database
     if not st.session_state.get(SOUNDS_LOADED_KEY, False):
-        db_sounds = load_tracked_sounds_db()
+        db_sounds = load_tracked_sounds_db() if db_is_configured() else []
         if db_sounds:
             _sync_session_state(db_sounds)
-            st.session_state[SOUNDS_LOADED_KEY] = True
-            return db_sounds
         st.session_state[SOUNDS_LOADED_KEY] = True
 
     # Return from session state cache
     if TRACKED_SOUNDS_KEY not in st.session_state:
         st.session_state[TRACKED_SOUNDS_KEY] = []
 
-    data = st.session_state[TRACKED_SOUNDS_KEY]
-    sounds = []
-    for item in data:
-        sounds.append(TrackedSound(
-            sound_id=item.get("sound_id", ""),
-            name=item.get("name", ""),
-            artist_name=item.get("artist_name"),
-            tiktok_url=item.get("tiktok_url"),
-            added_at=item.get("added_at"),
-        ))
-    return sounds
+    return st.session_state[TRACKED_SOUNDS_KEY]
+
+
+def load_tracked_sounds() -> List[TrackedSound]:
+    """Load tracked sounds from database (with session state cache)."""
+    # Shallow copy so callers can't reorder or resize the cached list
+    return list(_cached_sounds())
 
 
 def add_tracked_sound(
@@ -71,52 +91,71 @@ def add_tracked_sound(
     tiktok_url: Optional[str] = None,
 ) -> bool:
     """Add a new tracked sound to database and session cache."""
-    sounds = load_tracked_sounds()
-
-    # Check if already tracked
-    for sound in sounds:
-        if sound.sound_id == sound_id:
+    return add_tracked_sounds_many([{
+        "sound_id": sound_id,
+        "name": name,
+        "artist_name": artist_name,
+        "tiktok_url": tiktok_url,
+    }])
+
+
+def add_tracked_sounds_many(items: Iterable[Dict[str, Optional[str]]]) -> bool:
+    """Add several tracked sounds with one database write and one session cache update.
+
+    Args:
+        items: Dicts with the add_tracked_sound arguments (sound_id, name and
+            optionally artist_name, tiktok_url). Already tracked or repeated
+            sound IDs are skipped.
+    """
+    tracked_ids = _tracked_sound_ids()
+    added_at = datetime.now().isoformat()
+
+    new_sounds: List[TrackedSound] = []
+    new_ids: Set[str] = set()
+    for item in items:
+        sound_id = item["sound_id"]
+        # Check if already tracked
+        if sound_id in tracked_ids or sound_id in new_ids:
             logger.info("Sound %s already tracked.", sound_id)
-            return True
+            continue
+        new_ids.add(sound_id)
+        new_sounds.append(TrackedSound(
+            sound_id=sound_id,
+            name=item["name"],
+            artist_name=item.get("artist_name"),
+            tiktok_url=item.get("tiktok_url") or f"https://www.tiktok.com/music/original-sound-{sound_id}",
+            added_at=added_at,
+        ))
+
+    if not new_sounds:
+        return True
 
     # Add to database first
-    final_url = tiktok_url or f"https://www.tiktok.com/music/original-sound-{sound_id}"
-    db_success = add_tracked_sound_db(sound_id, name, artist_name, final_url)
-    if not db_success:
-        logger.warning("Failed to add sound to database, using session state only")
+    if db_is_configured():
+        db_success = add_tracked_sounds_db([
+            (sound.sound_id, sound.name, sound.artist_name, sound.tiktok_url) for sound in new_sounds
+        ])
+        if not db_success:
+            logger.warning("Failed to add sounds to database, using session state only")
 
     # Add to session state cache
-    new_sound = TrackedSound(
-        sound_id=sound_id,
-        name=name,
-        artist_name=artist_name,
-        tiktok_url=final_url,
-        added_at=datetime.now().isoformat(),
-    )
-    sounds.append(new_sound)
-    _sync_session_state(sounds)
+    _sync_append(new_sounds)
 
     return True
 
 
 def remove_tracked_sound(sound_id: str) -> bool:
     """Remove a tracked sound from database and session cache."""
-    sounds = load_tracked_sounds()
-    original_count = len(sounds)
-
-    sounds = [s for s in sounds if s.sound_id != sound_id]
-
-    if len(sounds) == original_count:
+    if sound_id not in _tracked_sound_ids():
         logger.info("Sound %s not found in tracked list.", sound_id)
         return True
 
     # Remove from database
-    db_success = remove_tracked_sound_db(sound_id)
-    if not db_success:
+    if db_is_configured() and not remove_tracked_sound_db(sound_id):
         logger.warning("Failed to remove sound from database")
 
     # Update session state cache
-    _sync_session_state(sounds)
+    _sync_remove(sound_id)
     return True
 
 
@@ -2,29 +2,126 @@
 
 from __future__ import annotations
 
+import atexit
 import base64
+import json
 import logging
+import os
+import random
+import threading
 import time
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 import httpx
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+except ImportError:
+    h2 = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from .config import settings
 from .models import ArtistSummary
 
 logger = logging.getLogger(__name__)
 
+# Access token persisted across processes, so a cold start can skip the token POST
+TOKEN_CACHE_FILE = Path(__file__).parent.parent / "data" / "spotify_token.json"
+# Refresh this long before the token expires
+_TOKEN_REFRESH_MARGIN_SECONDS = 300
+
+# Concurrent album track requests per similar-artist lookup
+_ALBUM_FETCH_WORKERS = 8
+
+# Only the first 12 collaborators are returned - once this many candidate IDs
+# are collected the remaining album tracks can't change the result
+_ENOUGH_COLLABORATORS = 36
+
+# Non-empty search and similar-artist results are reused for this long
+_RESULT_CACHE_TTL_SECONDS = 3600
+_RESULT_CACHE_MAX_SIZE = 512
+
+# One similar-artist lookup can have ~20 requests in flight (3 strategies,
+# 8 album workers, extra /artists batches) and several Streamlit sessions
+# share the client, so the pool is sized well past that to never queue on
+# PoolTimeout; keep-alive covers the steady state
+_HTTP_LIMITS = httpx.Limits(max_connections=256, max_keepalive_connections=64)
+# Fail fast on connect and pool waits; reads get longer for large pages
+_HTTP_TIMEOUT = httpx.Timeout(connect=5.0, read=15.0, write=10.0, pool=5.0)
+
+# Retries for 429 (honouring Retry-After, capped) and 5xx (exponential backoff)
+_MAX_RETRIES = 3
+_MAX_RETRY_AFTER_SECONDS = 10.0
+_BASE_BACKOFF_SECONDS = 0.25
+_MAX_BACKOFF_SECONDS = 4.0
+
 
 class SpotifyAPIError(RuntimeError):
     """Raised when Spotify API returns an error response."""
 
 
+class _TTLCache:
+    """Small thread-safe TTL cache; the oldest entry is evicted past maxsize."""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self._maxsize = maxsize
+        self._ttl = ttl
+        self._data: Dict[Any, Tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Any) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if time.monotonic() >= expires_at:
+                del self._data[key]
+                return None
+            return value
+
+    def set(self, key: Any, value: Any) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._data[key] = (time.monotonic() + self._ttl, value)
+            while len(self._data) > self._maxsize:
+                del self._data[next(iter(self._data))]
+
+
 class SpotifyClient:
     """Wrapper around Spotify Web API using client credentials."""
 
     def __init__(self) -> None:
         self._token: Optional[str] = None
         self._token_expires_at: float = 0
+        # Serializes dropping a rejected token across the worker threads
+        self._token_lock = threading.Lock()
+        # Results as tuples keyed by normalized query / artist, so repeat
+        # lookups skip every downstream request
+        self._search_cache = _TTLCache(_RESULT_CACHE_MAX_SIZE, _RESULT_CACHE_TTL_SECONDS)
+        self._similar_cache = _TTLCache(_RESULT_CACHE_MAX_SIZE, _RESULT_CACHE_TTL_SECONDS)
+        # One pooled client for every call, so requests reuse keep-alive
+        # connections instead of a fresh TCP+TLS handshake each. With HTTP/2
+        # (httpx[http2]) the concurrent album/artist fetches multiplex over
+        # one connection to api.spotify.com
+        self._client = httpx.Client(
+            base_url=settings.spotify.api_base_url,
+            timeout=_HTTP_TIMEOUT,
+            limits=_HTTP_LIMITS,
+            headers={"Accept": "application/json"},
+            http2=h2 is not None,
+        )
+        atexit.register(self.close)
+
+    def close(self) -> None:
+        """Close the underlying HTTP connection pool."""
+        self._client.close()
 
     @property
     def configured(self) -> bool:
@@ -32,7 +129,7 @@ class SpotifyClient:
 
     def _get_access_token(self) -> str:
         """Get or refresh access token."""
-        if self._token and time.time() < self._token_expires_at - 30:
+        if self._token and time.time() < self._token_expires_at - _TOKEN_REFRESH_MARGIN_SECONDS:
             return self._token
 
         client_id = settings.spotify.client_id
@@ -41,6 +138,13 @@ class SpotifyClient:
         if not client_id or not client_secret:
             raise SpotifyAPIError("Spotify credentials not configured.")
 
+        # Another process (or a previous run) may hold a still-valid token
+        cached = _load_cached_token(client_id)
+        if cached:
+            self._token, self._token_expires_at = cached
+            self._client.headers["Authorization"] = f"Bearer {self._token}"
+            return self._token
+
         credentials = f"{client_id}:{client_secret}"
         auth_header = base64.b64encode(credentials.encode()).decode()
 
@@ -50,13 +154,12 @@ class SpotifyClient:
         }
         data = {"grant_type": "client_credentials"}
 
-        with httpx.Client(timeout=30.0) as client:
-            response = client.post(settings.spotify.token_url, data=data, headers=headers)
+        response = self._request("POST", settings.spotify.token_url, data=data, headers=headers)
 
         if response.status_code >= 400:
             raise SpotifyAPIError(f"Failed to obtain Spotify access token: {response.text}")
 
-        payload = response.json()
+        payload = _json_body(response)
         self._token = payload.get("access_token")
         expires_in = payload.get("expires_in", 3600)
         self._token_expires_at = time.time() + expires_in
@@ -64,8 +167,58 @@ class SpotifyClient:
         if not self._token:
             raise SpotifyAPIError("Spotify token response did not include access_token.")
 
+        _save_cached_token(client_id, self._token, self._token_expires_at)
+        self._client.headers["Authorization"] = f"Bearer {self._token}"
         return self._token
 
+    def _invalidate_token(self, rejected_auth: Optional[str]) -> None:
+        """Forget a token Spotify rejected, in memory and on disk (unless already replaced)."""
+        with self._token_lock:
+            if rejected_auth is None or self._client.headers.get("Authorization") != rejected_auth:
+                return  # Another thread already swapped in a new token
+            self._token = None
+            self._token_expires_at = 0
+            self._client.headers.pop("Authorization", None)
+            _clear_cached_token()
+
+    def _request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request on the shared client, retrying rate limits and server errors.
+
+        A 401 on a bearer-token request (the token was revoked or the secret
+        rotated) drops the token, fetches a new one and retries once. The last
+        response is returned as-is once retries run out, so callers keep their
+        own status handling.
+        """
+        response = self._send(method, url, **kwargs)
+        # Requests with their own headers (the token POST) don't use the bearer token
+        if response.status_code == 401 and "headers" not in kwargs:
+            logger.warning("Spotify rejected the access token, fetching a new one")
+            self._invalidate_token(response.request.headers.get("Authorization"))
+            self._get_access_token()
+            response = self._send(method, url, **kwargs)
+        return response
+
+    def _send(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """Send a request, retrying 429s (per Retry-After) and 5xx errors with backoff."""
+        for attempt in range(_MAX_RETRIES + 1):
+            response = self._client.request(method, url, **kwargs)
+            status = response.status_code
+            if attempt == _MAX_RETRIES or (status != 429 and status < 500):
+                return response
+
+            if status == 429:
+                delay = _retry_after_seconds(response)
+            else:
+                delay = min(_BASE_BACKOFF_SECONDS * 2**attempt, _MAX_BACKOFF_SECONDS)
+                delay += random.uniform(0, delay / 4)
+            logger.warning("Spotify %s %s returned %s, retrying in %.2fs", method, url, status, delay)
+            time.sleep(delay)
+
+        return response
+
+    def _get(self, url: str, **kwargs: Any) -> httpx.Response:
+        return self._request("GET", url, **kwargs)
+
     def search_artist(self, query: str) -> Optional[ArtistSummary]:
         """Search for an artist by name (returns first match)."""
         results = self.search_artists(query, limit=1)
@@ -76,22 +229,23 @@ class SpotifyClient:
         if not self.configured:
             return []
 
-        token = self._get_access_token()
-        headers = {"Authorization": f"Bearer {token}"}
+        key = (" ".join(query.lower().split()), limit)
+        cached = self._search_cache.get(key)
+        if cached is None:
+            cached = tuple(self._search_artists(query, limit))
+            if cached:
+                self._search_cache.set(key, cached)
+        return list(cached)
 
-        with httpx.Client(timeout=30.0) as client:
-            params = {"q": query, "type": "artist", "limit": limit}
-            response = client.get(
-                f"{settings.spotify.api_base_url}/search",
-                params=params,
-                headers=headers,
-            )
+    def _search_artists(self, query: str, limit: int) -> List[ArtistSummary]:
+        self._get_access_token()
+        response = self._get("/search", params={"q": query, "type": "artist", "limit": limit})
 
         if response.status_code >= 400:
             logger.error("Spotify search failed: %s", response.text)
             return []
 
-        data = response.json()
+        data = _json_body(response)
         artists = data.get("artists", {}).get("items", [])
 
         return [self._to_summary(a) for a in artists if a]
@@ -106,183 +260,161 @@ class SpotifyClient:
         if not self.configured or not artist.spotify_id:
             return []
 
-        token = self._get_access_token()
-        headers = {"Authorization": f"Bearer {token}"}
-
-        # Try multiple strategies in order
-        for fetcher in [
-            self._fetch_via_top_tracks_and_albums,
-            self._fetch_via_genre_search,
-            self._fetch_via_collaborations,
-        ]:
-            artists = fetcher(artist, headers)
-            if artists:
-                return artists
+        # The name only feeds the collaborations strategy, but is part of the key
+        key = (artist.spotify_id, artist.name)
+        cached = self._similar_cache.get(key)
+        if cached is None:
+            cached = tuple(self._find_similar_artists(artist))
+            if cached:
+                self._similar_cache.set(key, cached)
+        return list(cached)
+
+    def _find_similar_artists(self, artist: ArtistSummary) -> List[ArtistSummary]:
+        self._get_access_token()
+
+        # Run all strategies at once and take the first non-empty result in
+        # priority order, so a lookup costs the slowest strategy it needs
+        # rather than the sum of them
+        executor = ThreadPoolExecutor(max_workers=3)
+        try:
+            futures = [
+                executor.submit(fetcher, artist)
+                for fetcher in (
+                    self._fetch_via_top_tracks_and_albums,
+                    self._fetch_via_genre_search,
+                    self._fetch_via_collaborations,
+                )
+            ]
+            for future in futures:
+                artists = future.result()
+                if artists:
+                    return artists
+        finally:
+            # Don't wait on lower-priority strategies once a result is chosen
+            executor.shutdown(wait=False, cancel_futures=True)
 
         return []
 
-    def _fetch_via_top_tracks_and_albums(self, artist: ArtistSummary, headers: dict) -> List[ArtistSummary]:
+    def _fetch_via_top_tracks_and_albums(self, artist: ArtistSummary) -> List[ArtistSummary]:
         """Fetch similar artists from top tracks and albums (appears_on)."""
         seen_ids = {artist.spotify_id}
         collaborator_ids: List[str] = []
 
-        with httpx.Client(timeout=30.0) as client:
-            # Get top tracks
-            response = client.get(
-                f"{settings.spotify.api_base_url}/artists/{artist.spotify_id}/top-tracks",
-                params={"market": "US"},
-                headers=headers,
+        # The top tracks and album list requests are independent, and each
+        # album's tracks are a separate request - run them concurrently on the
+        # shared (thread-safe) client, then collect in the original order
+        executor = ThreadPoolExecutor(max_workers=_ALBUM_FETCH_WORKERS)
+        try:
+            top_tracks = executor.submit(
+                self._get, f"/artists/{artist.spotify_id}/top-tracks", params={"market": "US"}
             )
-            if response.status_code == 200:
-                tracks = response.json().get("tracks", []) or []
-                for track in tracks:
-                    for track_artist in track.get("artists", []):
-                        aid = track_artist.get("id")
-                        if aid and aid not in seen_ids:
-                            seen_ids.add(aid)
-                            collaborator_ids.append(aid)
 
             # Get albums including "appears_on" for collaborations
-            response = client.get(
-                f"{settings.spotify.api_base_url}/artists/{artist.spotify_id}/albums",
+            response = self._get(
+                f"/artists/{artist.spotify_id}/albums",
                 params={"include_groups": "single,album,appears_on", "limit": 50, "market": "US"},
-                headers=headers,
             )
+            album_ids: List[str] = []
             if response.status_code == 200:
-                albums = response.json().get("items", []) or []
-                for album in albums[:20]:
-                    album_id = album.get("id")
-                    if not album_id:
-                        continue
-                    # Get album tracks to find more collaborators
-                    resp2 = client.get(
-                        f"{settings.spotify.api_base_url}/albums/{album_id}/tracks",
-                        params={"limit": 50},
-                        headers=headers,
-                    )
-                    if resp2.status_code == 200:
-                        for track in resp2.json().get("items", []):
-                            for track_artist in track.get("artists", []):
-                                aid = track_artist.get("id")
-                                if aid and aid not in seen_ids:
-                                    seen_ids.add(aid)
-                                    collaborator_ids.append(aid)
+                albums = _json_body(response).get("items", []) or []
+                album_ids = [album["id"] for album in albums[:20] if album.get("id")]
+
+            response = top_tracks.result()
+            if response.status_code == 200:
+                _collect_artist_ids(
+                    _json_body(response).get("tracks", []) or [], seen_ids, collaborator_ids, _ENOUGH_COLLABORATORS
+                )
+
+            # Get album tracks to find more collaborators, stopping as soon as
+            # there are enough; requests not started yet are cancelled below
+            if len(collaborator_ids) < _ENOUGH_COLLABORATORS:
+                for tracks in executor.map(self._get_album_tracks, album_ids):
+                    _collect_artist_ids(tracks, seen_ids, collaborator_ids, _ENOUGH_COLLABORATORS)
+                    if len(collaborator_ids) >= _ENOUGH_COLLABORATORS:
+                        break
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
         if not collaborator_ids:
             return []
 
         # Fetch full artist details
-        return self._fetch_artist_details(collaborator_ids, artist.spotify_id, headers)
+        return self._fetch_artist_details(collaborator_ids, artist.spotify_id)
+
+    def _get_album_tracks(self, album_id: str) -> List[Dict[str, Any]]:
+        """Track items of one album (empty on error)."""
+        response = self._get(f"/albums/{album_id}/tracks", params={"limit": 50})
+        if response.status_code != 200:
+            return []
+        return _json_body(response).get("items", [])
 
-    def _fetch_via_genre_search(self, artist: ArtistSummary, headers: dict) -> List[ArtistSummary]:
+    def _fetch_via_genre_search(self, artist: ArtistSummary) -> List[ArtistSummary]:
         """Fetch similar artists by searching the same genre."""
-        with httpx.Client(timeout=30.0) as client:
-            # First get artist's genres
-            response = client.get(
-                f"{settings.spotify.api_base_url}/artists/{artist.spotify_id}",
-                headers=headers,
-            )
-            if response.status_code >= 400:
-                return []
+        # First get artist's genres
+        response = self._get(f"/artists/{artist.spotify_id}")
+        if response.status_code >= 400:
+            return []
 
-            artist_data = response.json()
-            genres = artist_data.get("genres", [])
+        artist_data = _json_body(response)
+        genres = artist_data.get("genres", [])
 
-            if not genres:
-                return []
+        if not genres:
+            return []
 
-            # Search for artists in the same genre
-            genre = genres[0]
-            response = client.get(
-                f"{settings.spotify.api_base_url}/search",
-                params={"q": f'genre:"{genre}"', "type": "artist", "limit": 20},
-                headers=headers,
-            )
-            if response.status_code >= 400:
-                return []
-
-            items = response.json().get("artists", {}).get("items", []) or []
-            summaries = []
-            for item in items:
-                if item and item.get("id") != artist.spotify_id:
-                    summaries.append(self._to_summary(item))
-                if len(summaries) >= 12:
-                    break
-            return summaries
-
-    def _fetch_artist_details(self, artist_ids: List[str], exclude_id: str, headers: dict) -> List[ArtistSummary]:
-        """Fetch full artist details for a list of IDs."""
-        summaries: List[ArtistSummary] = []
-        with httpx.Client(timeout=30.0) as client:
-            for i in range(0, len(artist_ids), 50):
-                chunk = artist_ids[i : i + 50]
-                response = client.get(
-                    f"{settings.spotify.api_base_url}/artists",
-                    params={"ids": ",".join(chunk)},
-                    headers=headers,
-                )
-                if response.status_code >= 400:
-                    continue
-
-                items = response.json().get("artists", []) or []
-                for item in items:
-                    if item and item.get("id") != exclude_id:
-                        summaries.append(self._to_summary(item))
-                    if len(summaries) >= 12:
-                        return summaries
-        return summaries[:12]
-
-    def _fetch_via_collaborations(self, artist: ArtistSummary, headers: dict) -> List[ArtistSummary]:
+        # Search for artists in the same genre
+        genre = genres[0]
+        response = self._get("/search", params={"q": f'genre:"{genre}"', "type": "artist", "limit": 20})
+        if response.status_code >= 400:
+            return []
+
+        items = _json_body(response).get("artists", {}).get("items", []) or []
+        summaries = []
+        for item in items:
+            if item and item.get("id") != artist.spotify_id:
+                summaries.append(self._to_summary(item))
+            if len(summaries) >= 12:
+                break
+        return summaries
+
+    def _fetch_artist_details(self, artist_ids: List[str], exclude_id: str) -> List[ArtistSummary]:
+        """Fetch full artist details for a list of IDs (at most 12 summaries)."""
+        if not artist_ids:
+            return []
+
+        # Callers stop collecting at _ENOUGH_COLLABORATORS IDs, so one /artists
+        # batch (up to 50 IDs) covers them all
+        return self._artist_summaries(artist_ids[:50], exclude_id)[:12]
+
+    def _artist_summaries(self, artist_ids: List[str], exclude_id: str) -> List[ArtistSummary]:
+        """Summaries for one /artists batch (up to 50 IDs), empty on error."""
+        response = self._get("/artists", params={"ids": ",".join(artist_ids)})
+        if response.status_code >= 400:
+            return []
+
+        items = _json_body(response).get("artists", []) or []
+        return [self._to_summary(item) for item in items if item and item.get("id") != exclude_id]
+
+    def _fetch_via_collaborations(self, artist: ArtistSummary) -> List[ArtistSummary]:
         """Fetch similar artists via track collaborations."""
         if not artist.name:
             return []
 
-        with httpx.Client(timeout=30.0) as client:
-            response = client.get(
-                f"{settings.spotify.api_base_url}/search",
-                params={"q": f'artist:"{artist.name}"', "type": "track", "limit": 50},
-                headers=headers,
-            )
+        response = self._get("/search", params={"q": f'artist:"{artist.name}"', "type": "track", "limit": 50})
 
         if response.status_code >= 400:
             logger.warning("Spotify track search failed: %s", response.text)
             return []
 
-        tracks = response.json().get("tracks", {}).get("items", []) or []
+        tracks = _json_body(response).get("tracks", {}).get("items", []) or []
         seen_ids = {artist.spotify_id}
         collaborator_ids: List[str] = []
-
-        for track in tracks:
-            for track_artist in track.get("artists", []):
-                aid = track_artist.get("id")
-                if aid and aid not in seen_ids:
-                    seen_ids.add(aid)
-                    collaborator_ids.append(aid)
+        _collect_artist_ids(tracks, seen_ids, collaborator_ids, _ENOUGH_COLLABORATORS)
 
         if not collaborator_ids:
             return []
 
         # Fetch full artist details
-        summaries: List[ArtistSummary] = []
-        with httpx.Client(timeout=30.0) as client:
-            for i in range(0, len(collaborator_ids), 50):
-                chunk = collaborator_ids[i : i + 50]
-                response = client.get(
-                    f"{settings.spotify.api_base_url}/artists",
-                    params={"ids": ",".join(chunk)},
-                    headers=headers,
-                )
-                if response.status_code >= 400:
-                    continue
-
-                items = response.json().get("artists", []) or []
-                for item in items:
-                    if item and item.get("id") != artist.spotify_id:
-                        summaries.append(self._to_summary(item))
-                    if len(summaries) >= 12:
-                        return summaries
-
-        return summaries[:12]
+        return self._fetch_artist_details(collaborator_ids, artist.spotify_id)
 
     @staticmethod
     def _to_summary(payload: dict) -> ArtistSummary:
@@ -301,5 +433,75 @@ class SpotifyClient:
         )
 
 
+def _load_cached_token(client_id: str) -> Optional[Tuple[str, float]]:
+    """(token, expires_at) from the token cache file if it is for client_id and not near expiry."""
+    try:
+        with TOKEN_CACHE_FILE.open("r") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    token = cached.get("token")
+    expires_at = float(cached.get("expires_at") or 0)
+    if cached.get("client_id") != client_id or not token:
+        return None
+    if time.time() >= expires_at - _TOKEN_REFRESH_MARGIN_SECONDS:
+        return None
+    return token, expires_at
+
+
+def _save_cached_token(client_id: str, token: str, expires_at: float) -> None:
+    """Write the token cache file atomically (best effort)."""
+    try:
+        TOKEN_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = TOKEN_CACHE_FILE.with_suffix(".tmp")
+        with tmp_path.open("w") as f:
+            json.dump({"client_id": client_id, "token": token, "expires_at": expires_at}, f)
+        os.replace(tmp_path, TOKEN_CACHE_FILE)
+    except OSError as e:
+        logger.warning("Failed to save Spotify token cache: %s", e)
+
+
+def _json_body(response: httpx.Response) -> Any:
+    """Decode a JSON response body, with orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return json.loads(response.content)
+
+
+def _clear_cached_token() -> None:
+    """Delete the token cache file (best effort)."""
+    try:
+        TOKEN_CACHE_FILE.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning("Failed to clear Spotify token cache: %s", e)
+
+
+def _retry_after_seconds(response: httpx.Response) -> float:
+    """Delay requested by a 429's Retry-After header (seconds), capped."""
+    try:
+        delay = float(response.headers.get("Retry-After", "1"))
+    except ValueError:
+        delay = 1.0
+    return min(max(delay, 0.0), _MAX_RETRY_AFTER_SECONDS)
+
+
+def _collect_artist_ids(
+    tracks: Iterable[Dict[str, Any]],
+    seen_ids: Set[str],
+    collaborator_ids: List[str],
+    limit: Optional[int] = None,
+) -> None:
+    """Append the IDs of track artists not seen yet, in order, up to limit in total."""
+    for track in tracks:
+        if limit is not None and len(collaborator_ids) >= limit:
+            return
+        for track_artist in track.get("artists", []):
+            aid = track_artist.get("id")
+            if aid and aid not in seen_ids:
+                seen_ids.add(aid)
+                collaborator_ids.append(aid)
+
+
 # Global client instance
 spotify_client = SpotifyClient()
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import logging
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Set
 
 import streamlit as st
 
@@ -24,48 +24,63 @@ logger = logging.getLogger(__name__)
 # Session state key for tracked artists cache
 TRACKED_ARTISTS_KEY = "tracked_artists_list"
 ARTISTS_LOADED_KEY = "tracked_artists_loaded_from_db"
+TRACKED_ARTIST_IDS_KEY = "tracked_artist_ids"
 
 
 def _sync_session_state(artists: List[TrackedArtist]) -> None:
-    """Sync artists to session state cache."""
-    data = []
-    for artist in artists:
-        data.append({
-            "sodatone_id": artist.sodatone_id,
-            "name": artist.name,
-            "spotify_id": artist.spotify_id,
-            "image_url": artist.image_url,
-            "added_at": artist.added_at,
-        })
-    st.session_state[TRACKED_ARTISTS_KEY] = data
+    """Replace the session state cache wholesale (after a database load).
 
+    The TrackedArtist objects themselves are cached, so reads don't rebuild them.
+    """
+    st.session_state[TRACKED_ARTISTS_KEY] = list(artists)
+    st.session_state[TRACKED_ARTIST_IDS_KEY] = {artist.sodatone_id for artist in artists}
 
-def load_tracked_artists() -> List[TrackedArtist]:
-    """Load tracked artists from database (with session state cache)."""
+
+def _sync_append(new_artists: List[TrackedArtist]) -> None:
+    """Append newly tracked artists to the session state cache in place."""
+    cached = _cached_artists()
+    cached.extend(new_artists)
+    _tracked_artist_ids().update(artist.sodatone_id for artist in new_artists)
+
+
+def _sync_remove(sodatone_id: str) -> None:
+    """Drop one artist from the session state cache in place."""
+    cached = _cached_artists()
+    index = next((i for i, artist in enumerate(cached) if artist.sodatone_id == sodatone_id), None)
+    if index is not None:
+        cached.pop(index)
+    _tracked_artist_ids().discard(sodatone_id)
+
+
+def _tracked_artist_ids() -> Set[str]:
+    """Set of tracked Sodatone IDs for O(1) membership checks (loads artists on first use)."""
+    ids = st.session_state.get(TRACKED_ARTIST_IDS_KEY)
+    if ids is None:
+        ids = {artist.sodatone_id for artist in _cached_artists()}
+        st.session_state[TRACKED_ARTIST_IDS_KEY] = ids
+    return ids
+
+
+def _cached_artists() -> List[TrackedArtist]:
+    """The cached artists list itself (loaded from the database on first use)."""
     # On first load of session, fetch from database
     if not st.session_state.get(ARTISTS_LOADED_KEY, False):
         db_artists = load_tracked_artists_db()
         if db_artists:
             _sync_session_state(db_artists)
-            st.session_state[ARTISTS_LOADED_KEY] = True
-            return db_artists
         st.session_state[ARTISTS_LOADED_KEY] = True
 
     # Return from session state cache
     if TRACKED_ARTISTS_KEY not in st.session_state:
         st.session_state[TRACKED_ARTISTS_KEY] = []
 
-    data = st.session_state[TRACKED_ARTISTS_KEY]
-    artists = []
-    for item in data:
-        artists.append(TrackedArtist(
-            sodatone_id=item.get("sodatone_id", ""),
-            name=item.get("name", ""),
-            spotify_id=item.get("spotify_id"),
-            image_url=item.get("image_url"),
-            added_at=item.get("added_at"),
-        ))
-    return artists
+    return st.session_state[TRACKED_ARTISTS_KEY]
+
+
+def load_tracked_artists() -> List[TrackedArtist]:
+    """Load tracked artists from database (with session state cache)."""
+    # Shallow copy so callers can't reorder or resize the cached list
+    return list(_cached_artists())
 
 
 def add_tracked_artist(
@@ -73,27 +88,31 @@ def add_tracked_artist(
     name: str,
     spotify_id: Optional[str] = None,
     image_url: Optional[str] = None,
+    refresh: bool = False,
 ) -> bool:
-    """Add a new tracked artist to database and session cache."""
+    """Add a new tracked artist to database and session cache.
+
+    The session cache is updated in place rather than reloaded from the
+    database, so artists another tab added since this session loaded show up
+    on the next session rather than immediately. Pass refresh=True to reload
+    the authoritative list from the database after the insert.
+    """
+    # Check if already tracked
+    if sodatone_id in _tracked_artist_ids():
+        logger.info("Artist %s already tracked.", sodatone_id)
+        return True
+
     # Add to database first (uses ON CONFLICT to handle duplicates)
     db_success = add_tracked_artist_db(sodatone_id, name, spotify_id, image_url)
 
-    if db_success:
-        # Reload from database to get authoritative state and sync to session
-        # This prevents race conditions where multiple tabs could add the same artist
+    if db_success and refresh:
         db_artists = load_tracked_artists_db()
         if db_artists:
             _sync_session_state(db_artists)
             return True
 
-    # Fallback: if DB failed, check session cache and add locally
-    artists = load_tracked_artists()
-    for artist in artists:
-        if artist.sodatone_id == sodatone_id:
-            logger.info("Artist %s already tracked.", sodatone_id)
-            return True
-
-    logger.warning("Failed to add artist to database, using session state only")
+    if not db_success:
+        logger.warning("Failed to add artist to database, using session state only")
     new_artist = TrackedArtist(
         sodatone_id=sodatone_id,
         name=name,
@@ -101,20 +120,14 @@ def add_tracked_artist(
         image_url=image_url,
         added_at=datetime.now().isoformat(),
     )
-    artists.append(new_artist)
-    _sync_session_state(artists)
+    _sync_append([new_artist])
 
     return True
 
 
 def remove_tracked_artist(sodatone_id: str) -> bool:
     """Remove a tracked artist from database and session cache."""
-    artists = load_tracked_artists()
-    original_count = len(artists)
-
-    artists = [a for a in artists if a.sodatone_id != sodatone_id]
-
-    if len(artists) == original_count:
+    if sodatone_id not in _tracked_artist_ids():
         logger.info("Artist %s not found in tracked list.", sodatone_id)
         return True
 
@@ -124,7 +137,7 @@ def remove_tracked_artist(sodatone_id: str) -> bool:
         logger.warning("Failed to remove artist from database")
 
     # Update session state cache
-    _sync_session_state(artists)
+    _sync_remove(sodatone_id)
     return True
 
 
@@ -1,10 +1,17 @@
-"""TikTok scraper using Playwright for full browser automation."""
+"""TikTok scraper: page JSON over plain HTTP, Playwright browser automation as fallback."""
 
 from __future__ import annotations
 
+import atexit
+import json
 import logging
+import queue
 import re
-from typing import Optional
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+import httpx
 
 from .models import TikTokSound
 
@@ -12,31 +19,206 @@ logger = logging.getLogger(__name__)
 
 # Import Playwright
 try:
-    from playwright.sync_api import sync_playwright
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError, sync_playwright
     PLAYWRIGHT_AVAILABLE = True
 except ImportError:
     PLAYWRIGHT_AVAILABLE = False
     logger.error("Playwright not installed!")
 
+_USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
+
+# How long to wait for the video count to render after DOMContentLoaded
+_RENDER_TIMEOUT_MS = 5000
+# True once the sound page's "N videos" text has rendered
+_VIDEO_COUNT_READY_JS = "() => /\\d[\\d,.]*[km]?\\s*videos?/i.test(document.body ? document.body.innerText : '')"
+
+# Playwright's sync API objects are bound to the thread that created them, and
+# Streamlit runs each rerun on a new thread, so one dedicated daemon thread owns
+# the only browser and runs every browser scrape (see _run_on_browser_thread).
+# The driver, browser and context below are only touched from that thread.
+_browser_requests: "queue.Queue[Optional[tuple]]" = queue.Queue()
+_browser_thread: Optional[threading.Thread] = None
+_browser_thread_lock = threading.Lock()
+_playwright = None
+_browser = None
+_context = None
+
+# Shared client for the HTTP fast path (thread-safe, keeps connections alive)
+_http_client = httpx.Client(
+    timeout=15.0,
+    follow_redirects=True,
+    headers={"User-Agent": _USER_AGENT, "Accept-Language": "en-US,en;q=0.9"},
+)
+atexit.register(_http_client.close)
+
+# Rehydration state TikTok embeds in the initial HTML of a music page
+_REHYDRATION_RE = re.compile(
+    r'<script[^>]*id="__UNIVERSAL_DATA_FOR_REHYDRATION__"[^>]*>(.*?)</script>', re.DOTALL
+)
+
+
+# Sound ID from /music/<slug>-<id> or /music/<id> URLs, tried in order
+_SOUND_URL_PATTERNS = (
+    re.compile(r"tiktok\.com/music/[^/]+-(\d+)"),
+    re.compile(r"tiktok\.com/music/(\d+)"),
+)
+# "1.2M videos" on a sound page
+_VIDEO_COUNT_RE = re.compile(r'(\d[\d,\.]*[KkMm]?)\s*videos?', re.IGNORECASE)
+# A normalized count: number plus optional K/M/B suffix
+_COUNT_RE = re.compile(r'(\d+(?:\.\d*)?)([kmb]?)')
+_COUNT_MULTIPLIERS = {'': 1, 'k': 1_000, 'm': 1_000_000, 'b': 1_000_000_000}
+
 
 def _parse_count(count_str: str) -> int:
-    """Parse a count string that may have K/M suffixes."""
-    count_str = count_str.replace(',', '').strip()
-    if 'k' in count_str.lower():
-        return int(float(count_str.lower().replace('k', '')) * 1000)
-    elif 'm' in count_str.lower():
-        return int(float(count_str.lower().replace('m', '')) * 1000000)
-    elif 'b' in count_str.lower():
-        return int(float(count_str.lower().replace('b', '')) * 1000000000)
-    else:
+    """Parse a count string that may have K/M/B suffixes (0 if unparseable)."""
+    # Called once per scraped page, so the page fetch dominates. If sounds are
+    # ever scraped in bulk, parse the collected counts in one vectorized or
+    # Numba-compiled pass instead of tuning this per-string path.
+    match = _COUNT_RE.fullmatch(count_str.replace(',', '').strip().lower())
+    if not match:
+        return 0
+    number, suffix = match.groups()
+    return int(float(number) * _COUNT_MULTIPLIERS[suffix])
+
+
+def _get_context():
+    """The shared browser context, launching Chromium on first use (browser thread only)."""
+    global _playwright, _browser, _context
+    if _context is None:
+        playwright = sync_playwright().start()
+        try:
+            browser = playwright.chromium.launch(headless=True)
+            context = browser.new_context(user_agent=_USER_AGENT)
+        except Exception:
+            playwright.stop()
+            raise
+        _playwright, _browser, _context = playwright, browser, context
+    return _context
+
+
+def _close_browser() -> None:
+    """Close the browser and Playwright driver, if started (browser thread only)."""
+    global _playwright, _browser, _context
+    browser, playwright = _browser, _playwright
+    _playwright = _browser = _context = None
+    for close in (browser and browser.close, playwright and playwright.stop):
+        if close:
+            try:
+                close()
+            except Exception as e:
+                logger.debug("Error closing scraper browser: %s", e)
+
+
+def _browser_worker() -> None:
+    """Run queued browser calls until a None request, then close the browser."""
+    while True:
+        request = _browser_requests.get()
+        if request is None:
+            _close_browser()
+            return
+        future, func, args = request
+        if not future.set_running_or_notify_cancel():
+            continue
         try:
-            return int(count_str)
-        except ValueError:
-            return 0
+            future.set_result(func(*args))
+        except BaseException as e:
+            future.set_exception(e)
+
+
+def _run_on_browser_thread(func: Callable[..., Any], *args: Any) -> Any:
+    """Run func(*args) on the browser thread (starting it if needed) and return its result."""
+    global _browser_thread
+    with _browser_thread_lock:
+        if _browser_thread is None or not _browser_thread.is_alive():
+            _browser_thread = threading.Thread(target=_browser_worker, name="tiktok-browser", daemon=True)
+            _browser_thread.start()
+    future: Future = Future()
+    _browser_requests.put((future, func, args))
+    return future.result()
+
+
+def close_scraper() -> None:
+    """Close the shared browser and stop the browser thread, if started."""
+    global _browser_thread
+    with _browser_thread_lock:
+        thread, _browser_thread = _browser_thread, None
+        if thread is None or not thread.is_alive():
+            return
+        _browser_requests.put(None)
+    thread.join(timeout=10)
+
+
+# The browser thread is a daemon, so it is still running when atexit handlers do
+atexit.register(close_scraper)
+
+
+def _music_info(html: str) -> Optional[Dict[str, Any]]:
+    """musicInfo from a music page's embedded rehydration JSON, if present."""
+    match = _REHYDRATION_RE.search(html)
+    if not match:
+        return None
+    try:
+        data = json.loads(match.group(1))
+    except ValueError:
+        return None
+    # TikTok changes this blob without notice - walk it defensively
+    for key in ("__DEFAULT_SCOPE__", "webapp.music-detail", "musicInfo"):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    if not isinstance(data, dict) or not isinstance(data.get("music"), dict):
+        return None
+    return data
+
+
+def scrape_tiktok_sound_http(sound_id: str) -> Optional[TikTokSound]:
+    """Read TikTok sound data from the page's embedded JSON with a single GET (no browser).
+
+    Returns None when the page can't be fetched or carries no music data;
+    scrape_tiktok_sound then falls back to rendering the page.
+    """
+    url = f"https://www.tiktok.com/music/original-sound-{sound_id}"
+    try:
+        response = _http_client.get(url)
+    except httpx.HTTPError as e:
+        logger.info("TikTok HTTP fetch failed for sound %s: %s", sound_id, e)
+        return None
+    if response.status_code != 200:
+        return None
+
+    music_info = _music_info(response.text)
+    if music_info is None:
+        return None
+
+    music = music_info["music"]
+    title = music.get("title")
+    sound_name = (title.strip() if isinstance(title, str) else "") or f"TikTok Sound {sound_id[-8:]}"
+    author_name = music.get("authorName")
+    stats = music_info.get("stats")
+    # Usually an int, but parse strings like "1.2K" too (0 if unparseable)
+    creates = _parse_count(str(stats.get("videoCount") or 0)) if isinstance(stats, dict) else 0
+    logger.info("Found %d creates for sound %s (embedded JSON)", creates, sound_id)
+
+    return TikTokSound(
+        sound_id=sound_id,
+        name=sound_name,
+        artist_name=author_name if isinstance(author_name, str) and author_name else sound_name,
+        tiktok_url=url,
+        total_creates=creates,
+        creates_7d=0,
+        creates_24h=0,
+        total_views=0,
+        views_7d=0,
+        views_24h=0,
+    )
 
 
 def scrape_tiktok_sound(sound_id: str) -> Optional[TikTokSound]:
-    """Scrape TikTok sound data using Playwright browser automation.
+    """Scrape TikTok sound data, rendering the page with Playwright only when needed.
+
+    The embedded page JSON is tried first (scrape_tiktok_sound_http); the
+    browser is used when that data is missing. Browser scrapes from any thread
+    run one at a time on the shared browser thread.
 
     Args:
         sound_id: The TikTok sound ID (numeric string)
@@ -44,78 +226,90 @@ def scrape_tiktok_sound(sound_id: str) -> Optional[TikTokSound]:
     Returns:
         TikTokSound object if successful, None otherwise
     """
+    sound = scrape_tiktok_sound_http(sound_id)
+    if sound is not None:
+        return sound
+
     if not PLAYWRIGHT_AVAILABLE:
         logger.error("Playwright not available")
         return None
 
+    return _run_on_browser_thread(_render_sound, sound_id)
+
+
+def _render_sound(sound_id: str) -> Optional[TikTokSound]:
+    """Render a sound page in the shared browser and read its data (browser thread only)."""
     url = f"https://www.tiktok.com/music/original-sound-{sound_id}"
 
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/121.0.0.0 Safari/537.36'
-            )
-            page = context.new_page()
-
-            logger.info("Loading TikTok page for sound %s", sound_id)
-            page.goto(url, wait_until='domcontentloaded', timeout=30000)
-            page.wait_for_timeout(5000)  # Wait for JS to load
-
-            title = page.title()
-            logger.info("Page title: %s", title)
-
-            # Check if valid music page
-            if title == "TikTok - Make Your Day" or "| TikTok" not in title:
-                logger.warning("Sound %s not found on TikTok", sound_id)
-                browser.close()
-                return None
-
-            # Extract sound name from title
-            sound_name = title.replace(' | TikTok', '').replace(' - original sound', '').strip()
-            if not sound_name:
-                sound_name = f"TikTok Sound {sound_id[-8:]}"
-
-            # Get page text to find video count
-            body_text = page.locator('body').text_content() or ""
-
-            # Find video count (creates)
-            creates = 0
-            video_match = re.search(r'(\d[\d,\.]*[KkMm]?)\s*videos?', body_text, re.IGNORECASE)
-            if video_match:
-                creates = _parse_count(video_match.group(1))
-                logger.info("Found %d creates for sound %s", creates, sound_id)
-
-            browser.close()
-
-            return TikTokSound(
-                sound_id=sound_id,
-                name=sound_name,
-                artist_name=sound_name,
-                tiktok_url=url,
-                total_creates=creates,
-                creates_7d=0,
-                creates_24h=0,
-                total_views=0,
-                views_7d=0,
-                views_24h=0,
-            )
+        page = _get_context().new_page()
+    except Exception as e:
+        logger.error("Scraping failed for sound %s: %s", sound_id, e)
+        # The browser may have died - relaunch on the next scrape
+        _close_browser()
+        return None
+
+    try:
+        logger.info("Loading TikTok page for sound %s", sound_id)
+        page.goto(url, wait_until='domcontentloaded', timeout=30000)
+        # Wait for JS to render the video count rather than a fixed sleep;
+        # missing pages never render it, so fall through to the title check
+        try:
+            page.wait_for_function(_VIDEO_COUNT_READY_JS, timeout=_RENDER_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            logger.info("Video count not rendered within %dms for sound %s", _RENDER_TIMEOUT_MS, sound_id)
+
+        title = page.title()
+        logger.info("Page title: %s", title)
+
+        # Check if valid music page
+        if title == "TikTok - Make Your Day" or "| TikTok" not in title:
+            logger.warning("Sound %s not found on TikTok", sound_id)
+            return None
+
+        # Extract sound name from title
+        sound_name = title.replace(' | TikTok', '').replace(' - original sound', '').strip()
+        if not sound_name:
+            sound_name = f"TikTok Sound {sound_id[-8:]}"
+
+        # Get page text to find video count
+        body_text = page.locator('body').text_content() or ""
+
+        # Find video count (creates)
+        creates = 0
+        video_match = _VIDEO_COUNT_RE.search(body_text)
+        if video_match:
+            creates = _parse_count(video_match.group(1))
+            logger.info("Found %d creates for sound %s", creates, sound_id)
+
+        return TikTokSound(
+            sound_id=sound_id,
+            name=sound_name,
+            artist_name=sound_name,
+            tiktok_url=url,
+            total_creates=creates,
+            creates_7d=0,
+            creates_24h=0,
+            total_views=0,
+            views_7d=0,
+            views_24h=0,
+        )
 
     except Exception as e:
         logger.error("Scraping failed for sound %s: %s", sound_id, e)
         return None
+    finally:
+        try:
+            page.close()
+        except Exception:
+            pass
 
 
 def scrape_tiktok_sound_from_url(url: str) -> Optional[TikTokSound]:
     """Scrape TikTok sound data from a TikTok URL."""
-    patterns = [
-        r"tiktok\.com/music/[^/]+-(\d+)",
-        r"tiktok\.com/music/(\d+)",
-    ]
-
     sound_id = None
-    for pattern in patterns:
-        match = re.search(pattern, url)
+    for pattern in _SOUND_URL_PATTERNS:
+        match = pattern.search(url)
         if match:
             sound_id = match.group(1)
             break
@@ -128,5 +322,5 @@ def scrape_tiktok_sound_from_url(url: str) -> Optional[TikTokSound]:
 
 
 def is_scraper_available() -> bool:
-    """Check if the TikTok scraper is available."""
+    """Check if the TikTok browser scraper (the fallback path) is available."""
     return PLAYWRIGHT_AVAILABLE